@@ -0,0 +1 @@
+"""Performance benchmarks (run manually, not part of the test suite)."""
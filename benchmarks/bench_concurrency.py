@@ -0,0 +1,157 @@
+"""Measure /health latency while /predict/batch saturates the server.
+
+Starts uvicorn in a subprocess (temporary SQLite database, rate limits raised)
+and drives it over HTTP, so any blocking work on the server's event loop shows
+up directly as /health latency.
+
+Usage:
+    python -m benchmarks.bench_concurrency [--seconds 10] [--batch-clients 16]
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+import numpy as np
+
+HOUSE = {
+    "longitude": -122.64,
+    "latitude": 38.01,
+    "housing_median_age": 36.0,
+    "total_rooms": 1336.0,
+    "total_bedrooms": 258.0,
+    "population": 678.0,
+    "households": 249.0,
+    "median_income": 5.5789,
+    "ocean_proximity": "NEAR OCEAN",
+}
+
+
+def make_batch(seed: int) -> dict:
+    """100 distinct houses so the prediction cache cannot short-circuit."""
+    rng = np.random.default_rng(seed)
+    houses = []
+    for _ in range(100):
+        house = dict(HOUSE)
+        house["median_income"] = float(rng.uniform(0.5, 15))
+        house["total_rooms"] = float(rng.uniform(100, 5000))
+        houses.append(house)
+    return {"houses": houses}
+
+
+def start_server(
+    port: int,
+    workdir: str,
+    database_url: str | None = None,
+    extra_env: dict[str, str] | None = None,
+) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        ENVIRONMENT="development",
+        LOG_LEVEL="WARNING",
+        DATABASE_URL=database_url or f"sqlite:///{workdir}/bench.db",
+        RATE_LIMIT_PER_MINUTE="1000000",
+        QUOTA_ENABLED="false",
+        **(extra_env or {}),
+    )
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(port)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 60) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("Server did not become ready")
+
+
+async def authenticate(client: httpx.AsyncClient) -> dict[str, str]:
+    key = (await client.post("/auth/keys", json={"name": "bench"})).json()["key"]
+    token = (await client.post("/auth/token", json={"api_key": key})).json()
+    return {"Authorization": f"Bearer {token['access_token']}"}
+
+
+async def batch_client(
+    client: httpx.AsyncClient, headers: dict, stop: asyncio.Event, seed: int
+) -> int:
+    count = 0
+    while not stop.is_set():
+        await client.post(
+            "/predict/batch", json=make_batch(seed + count), headers=headers
+        )
+        count += 1
+    return count
+
+
+async def probe_health(client: httpx.AsyncClient, seconds: float) -> list[float]:
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        await client.get("/health")
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.01)
+    return latencies
+
+
+def summarize(label: str, latencies: list[float]) -> None:
+    p50, p99 = np.percentile(latencies, [50, 99])
+    print(f"{label:<26} n={len(latencies):>5} p50={p50:7.2f}ms p99={p99:7.2f}ms")
+
+
+async def run(port: int, seconds: float, batch_clients: int) -> None:
+    base_url = f"http://127.0.0.1:{port}"
+    limits = httpx.Limits(max_connections=batch_clients + 4)
+    async with (
+        httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client,
+        httpx.AsyncClient(base_url=base_url, timeout=60) as probe,
+    ):
+        await wait_ready(probe)
+        headers = await authenticate(client)
+        summarize("/health idle", await probe_health(probe, seconds / 2))
+
+        stop = asyncio.Event()
+        workers = [
+            asyncio.create_task(batch_client(client, headers, stop, seed * 10_000))
+            for seed in range(batch_clients)
+        ]
+        latencies = await probe_health(probe, seconds)
+        stop.set()
+        batches = sum(await asyncio.gather(*workers))
+
+    summarize("/health under batch load", latencies)
+    print(f"/predict/batch throughput: {batches * 100 / seconds:,.0f} rows/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--batch-clients", type=int, default=16)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        server = start_server(args.port, workdir)
+        try:
+            asyncio.run(run(args.port, args.seconds, args.batch_clients))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Load test of the sync (db executor) vs async (aiosqlite/asyncpg) database layer.
+
+Starts uvicorn once per DATABASE_URL and drives /predict (auth lookup + log
+insert) and /logs (auth lookup + two queries) with concurrent clients,
+reporting throughput and latency percentiles.
+
+Usage:
+    python -m benchmarks.bench_db_concurrency [--seconds 10] [--clients 16]
+        [--database-url URL ...]
+
+Without --database-url it compares sqlite:// and sqlite+aiosqlite:// on a
+temporary file; pass e.g. postgresql://... and postgresql+asyncpg://... to
+compare on PostgreSQL.
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+
+import httpx
+import numpy as np
+
+from benchmarks.bench_concurrency import HOUSE, authenticate, start_server, wait_ready
+
+
+async def drive(
+    client: httpx.AsyncClient, request: dict, clients: int, seconds: float
+) -> tuple[float, list[float]]:
+    """Run ``clients`` request loops for ``seconds``; return req/s and latencies."""
+    latencies: list[float] = []
+    deadline = time.perf_counter() + seconds
+
+    async def loop(i: int) -> None:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            response = await client.request(**request)
+            response.raise_for_status()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(loop(i) for i in range(clients)))
+    return len(latencies) / seconds, latencies
+
+
+async def run(port: int, seconds: float, clients: int) -> None:
+    limits = httpx.Limits(max_connections=clients + 2)
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{port}", timeout=60, limits=limits
+    ) as client:
+        await wait_ready(client)
+        headers = await authenticate(client)
+        scenarios = {
+            "POST /predict": {
+                "method": "POST",
+                "url": "/predict",
+                "json": HOUSE,
+                "headers": headers,
+            },
+            "GET /logs": {
+                "method": "GET",
+                "url": "/logs?limit=20",
+                "headers": headers,
+            },
+        }
+        for label, request in scenarios.items():
+            rate, latencies = await drive(client, request, clients, seconds)
+            p50, p99 = np.percentile(latencies, [50, 99])
+            print(
+                f"  {label:<14} {rate:>8,.0f} req/s  p50={p50:7.2f}ms  p99={p99:7.2f}ms"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--database-url", action="append", default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        urls = args.database_url or [
+            f"sqlite:///{workdir}/sync.db",
+            f"sqlite+aiosqlite:///{workdir}/async.db",
+        ]
+        for url in urls:
+            print(f"{url.split('://')[0]} ({args.clients} clients)")
+            server = start_server(args.port, workdir, database_url=url)
+            try:
+                asyncio.run(run(args.port, args.seconds, args.clients))
+            finally:
+                server.terminate()
+                server.wait()
+
+
+if __name__ == "__main__":
+    main()
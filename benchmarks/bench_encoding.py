@@ -0,0 +1,54 @@
+"""Benchmark NumPy feature encoding against the DataFrame preprocessing.
+
+Usage:
+    python -m benchmarks.bench_encoding [--repeat 50]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.ml.preprocessing import encode_features, prepare_batch_features
+from src.predictions.schema import HouseFeatures
+
+
+def load_houses(n_rows: int) -> list[HouseFeatures]:
+    """Build validated HouseFeatures from housing.csv rows."""
+    df = pd.read_csv("housing.csv").dropna().drop(columns=["median_house_value"])
+    df = df.sample(n_rows, replace=True, random_state=0)
+    return [HouseFeatures(**row) for row in df.to_dict(orient="records")]
+
+
+def time_call(fn, houses, repeat: int) -> float:
+    """Return median latency in milliseconds."""
+    fn(houses)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(houses)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'rows':>6} {'pandas ms':>12} {'numpy ms':>12} {'speedup':>8}")
+    for n_rows in (1, 100, 10_000):
+        houses = load_houses(n_rows)
+        repeat = max(3, args.repeat // (1 + n_rows // 1000))
+
+        pandas_ms = time_call(prepare_batch_features, houses, repeat)
+        numpy_ms = time_call(encode_features, houses, repeat)
+        print(
+            f"{n_rows:>6} {pandas_ms:>12.3f} {numpy_ms:>12.3f} "
+            f"{pandas_ms / numpy_ms:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark compiled forest inference against sklearn's RandomForestRegressor.
+
+Usage:
+    python -m benchmarks.bench_forest [--repeat 200]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.constants import ALL_FEATURE_COLUMNS
+from src.ml.forest import CompiledForest
+from src.ml.model import load_model
+
+
+def sample_rows(n_rows: int) -> pd.DataFrame:
+    """Draw rows from housing.csv encoded like the training data."""
+    df = pd.read_csv("housing.csv").dropna().sample(n_rows, random_state=0)
+    df = pd.get_dummies(df.drop(columns=["median_house_value"]))
+    return df.reindex(columns=ALL_FEATURE_COLUMNS, fill_value=0).astype(np.float64)
+
+
+def time_call(fn, X, repeat: int) -> float:
+    """Return median latency in milliseconds."""
+    fn(X)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(X)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    model = load_model()
+    start = time.perf_counter()
+    compiled = CompiledForest.from_estimator(model)
+    print(
+        f"Compiled {compiled.n_trees} trees / {compiled.n_nodes} nodes "
+        f"in {(time.perf_counter() - start) * 1000:.1f}ms"
+    )
+
+    print(f"{'rows':>6} {'sklearn ms':>12} {'compiled ms':>12} {'speedup':>8}")
+    for n_rows in (1, 100):
+        frame = sample_rows(n_rows)
+        X = frame.to_numpy()
+        assert np.array_equal(compiled.predict(X), model.predict(frame))
+
+        sklearn_ms = time_call(model.predict, frame, args.repeat)
+        compiled_ms = time_call(compiled.predict, X, args.repeat)
+        print(
+            f"{n_rows:>6} {sklearn_ms:>12.3f} {compiled_ms:>12.3f} "
+            f"{sklearn_ms / compiled_ms:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
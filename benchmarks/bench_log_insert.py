@@ -0,0 +1,123 @@
+"""Insert throughput of batch prediction logs: ORM create_batch vs Core insert_batch.
+
+Usage:
+    python -m benchmarks.bench_log_insert [--database-url URL] [--repeat 5]
+
+Defaults to a temporary SQLite file. Point --database-url at a scratch
+PostgreSQL database (e.g. postgresql+psycopg2://user:pw@localhost/bench) to
+compare dialects; the benchmark creates the tables if needed and deletes the
+rows and API key it inserted. On SQLite it also reports the bytes a batch
+prediction adds to the file, indexes included.
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+
+from src.core.database import Base
+from src.logs.repository import PredictionLogRepository
+from src.models import APIKey, PredictionBatch, PredictionLog
+
+FEATURES = {
+    "longitude": -122.64,
+    "latitude": 38.01,
+    "housing_median_age": 36.0,
+    "total_rooms": 1336.0,
+    "total_bedrooms": 258.0,
+    "population": 678.0,
+    "households": 249.0,
+    "median_income": 5.5789,
+    "ocean_proximity": "NEAR OCEAN",
+}
+
+
+def rows_per_second(
+    session_factory, method: str, api_key_id: int, n_rows: int, repeat: int
+) -> float:
+    """Median rows/s of one repository method over ``repeat`` batches."""
+    predictions = [(FEATURES, 320201.58 + i) for i in range(n_rows)]
+    timings = []
+    for _ in range(repeat):
+        with session_factory() as session:
+            insert = getattr(PredictionLogRepository(session), method)
+            start = time.perf_counter()
+            insert(api_key_id=api_key_id, predictions=predictions, response_time_ms=5)
+            timings.append(time.perf_counter() - start)
+    return n_rows / float(np.median(timings))
+
+
+def sqlite_bytes_per_row(session_factory, api_key_id: int, n_rows: int) -> float:
+    """Growth of the SQLite file per row over ``n_rows`` rows in 100-row batches."""
+
+    def file_bytes(session) -> int:
+        pragma = session.connection().exec_driver_sql
+        return (
+            pragma("PRAGMA page_count").scalar() * pragma("PRAGMA page_size").scalar()
+        )
+
+    predictions = [(FEATURES, 320201.58 + i) for i in range(100)]
+    with session_factory() as session:
+        repo = PredictionLogRepository(session)
+        before = file_bytes(session)
+        for _ in range(n_rows // 100):
+            repo.insert_batch(api_key_id, predictions, 5, "3f1c2a9d7b10")
+        return (file_bytes(session) - before) / n_rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.TemporaryDirectory()
+    url = args.database_url or f"sqlite:///{Path(tmp_dir.name) / 'bench.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+
+    with session_factory() as session:
+        api_key = APIKey(
+            name="bench", key_hash=f"bench-{time.time_ns()}", key_prefix="bench"
+        )
+        session.add(api_key)
+        session.commit()
+        api_key_id = api_key.id
+
+    print(f"{engine.dialect.name}: rows/s per batch insert (median of {args.repeat})")
+    print(
+        f"{'rows':>6} {'orm create_batch':>17} {'core insert_batch':>18} {'speedup':>8}"
+    )
+    try:
+        for n_rows in (100, 1_000, 10_000):
+            orm = rows_per_second(
+                session_factory, "create_batch", api_key_id, n_rows, args.repeat
+            )
+            core = rows_per_second(
+                session_factory, "insert_batch", api_key_id, n_rows, args.repeat
+            )
+            print(f"{n_rows:>6} {orm:>17,.0f} {core:>18,.0f} {core / orm:>7.1f}x")
+        if engine.dialect.name == "sqlite":
+            per_row = sqlite_bytes_per_row(session_factory, api_key_id, 10_000)
+            print(f"bytes per batch prediction: {per_row:.0f}")
+    finally:
+        with session_factory() as session:
+            session.execute(
+                delete(PredictionLog).where(PredictionLog.api_key_id == api_key_id)
+            )
+            session.execute(
+                delete(PredictionBatch).where(PredictionBatch.api_key_id == api_key_id)
+            )
+            session.execute(delete(APIKey).where(APIKey.id == api_key_id))
+            session.commit()
+        engine.dispose()
+        tmp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
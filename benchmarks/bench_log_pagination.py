@@ -0,0 +1,127 @@
+"""Latency of deep GET /logs pages: OFFSET vs keyset cursor, and the exact count.
+
+Usage:
+    python -m benchmarks.bench_log_pagination [--rows 200000] [--page-size 100]
+
+Seeds one API key with ``--rows`` prediction logs in a temporary SQLite file
+(or --database-url, whose tables are created if needed and whose seeded rows
+are deleted afterwards), then times the repository query behind each page.
+With the (api_key_id, created_at, id) index a keyset page costs the same at
+page 1000 as at page 1, while OFFSET grows with the page number.
+"""
+
+import argparse
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import create_engine, delete, insert
+from sqlalchemy.orm import sessionmaker
+
+from src.core.database import Base
+from src.logs.repository import PredictionLogRepository
+from src.models import APIKey, PredictionLog
+
+FEATURES = {"median_income": 5.5789, "ocean_proximity": "NEAR OCEAN"}
+
+
+def seed(session_factory, n_rows: int) -> int:
+    """Insert an API key with ``n_rows`` logs one second apart; return its id."""
+    with session_factory() as session:
+        api_key = APIKey(
+            name="bench", key_hash=f"bench-{time.time_ns()}", key_prefix="bench"
+        )
+        session.add(api_key)
+        session.commit()
+
+        start = datetime.now(UTC) - timedelta(seconds=n_rows)
+        for offset in range(0, n_rows, 10_000):
+            rows = [
+                {
+                    "api_key_id": api_key.id,
+                    **FEATURES,
+                    "predicted_price": float(i),
+                    "request_type": "single",
+                    "created_at": start + timedelta(seconds=i),
+                    "updated_at": start + timedelta(seconds=i),
+                }
+                for i in range(offset, min(offset + 10_000, n_rows))
+            ]
+            session.execute(insert(PredictionLog), rows)
+        session.commit()
+        return api_key.id
+
+
+def median_ms(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.TemporaryDirectory()
+    url = args.database_url or f"sqlite:///{Path(tmp_dir.name) / 'bench.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    api_key_id = seed(session_factory, args.rows)
+
+    print(
+        f"{engine.dialect.name}: {args.rows:,} logs, {args.page_size} per page "
+        f"(median ms of {args.repeat})"
+    )
+    print(f"{'page':>6} {'offset':>9} {'keyset':>9}")
+    try:
+        with session_factory() as session:
+            repo = PredictionLogRepository(session)
+            for page in (1, 10, 100, 1000):
+                skip = (page - 1) * args.page_size
+                if skip >= args.rows:
+                    break
+                # Position of the last row on the previous page, as a cursor holds
+                after = None
+                if skip:
+                    last = repo.get_by_api_key(api_key_id, skip=skip - 1, limit=1)[0]
+                    after = (last.created_at, last.id)
+
+                offset_ms = median_ms(
+                    lambda skip=skip: repo.get_by_api_key(
+                        api_key_id, skip=skip, limit=args.page_size
+                    ),
+                    args.repeat,
+                )
+                keyset_ms = median_ms(
+                    lambda after=after: repo.get_by_api_key(
+                        api_key_id, limit=args.page_size, after=after
+                    ),
+                    args.repeat,
+                )
+                print(f"{page:>6} {offset_ms:>9.2f} {keyset_ms:>9.2f}")
+
+            count_ms = median_ms(lambda: repo.count_by_api_key(api_key_id), args.repeat)
+            print(f"exact count_by_api_key: {count_ms:.2f} ms")
+    finally:
+        with session_factory() as session:
+            session.execute(
+                delete(PredictionLog).where(PredictionLog.api_key_id == api_key_id)
+            )
+            session.execute(delete(APIKey).where(APIKey.id == api_key_id))
+            session.commit()
+        engine.dispose()
+        tmp_dir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""/predict throughput with and without the authenticated-principal cache.
+
+Starts uvicorn with PRINCIPAL_CACHE_ENABLED=false, then true, and drives
+POST /predict with concurrent clients. Audit logs are written behind the
+request (LOG_WRITE_BEHIND_ENABLED=true) so the API key lookup is the only
+database work left on the request path. Then times get_current_user alone,
+in-process, which isolates the auth cost from HTTP and inference when the
+client and server share few cores.
+
+Usage:
+    python -m benchmarks.bench_principal_cache [--seconds 10] [--clients 16]
+        [--database-url URL]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+
+import httpx
+import numpy as np
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.bench_concurrency import HOUSE, authenticate, start_server, wait_ready
+from benchmarks.bench_db_concurrency import drive
+from src.auth.dependencies import get_current_user
+from src.auth.repository import AuthRepository
+from src.config import settings
+from src.core.database import Base, ThreadedRepository
+from src.core.security import create_access_token
+
+
+async def run(port: int, seconds: float, clients: int) -> None:
+    limits = httpx.Limits(max_connections=clients + 2)
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{port}", timeout=60, limits=limits
+    ) as client:
+        await wait_ready(client)
+        headers = await authenticate(client)
+        request = {"method": "POST", "url": "/predict", "json": HOUSE}
+        rate, latencies = await drive(
+            client, {**request, "headers": headers}, clients, seconds
+        )
+        p50, p99 = np.percentile(latencies, [50, 99])
+        snapshot = (await client.get("/health/metrics")).json()
+        hits = snapshot.get("principal_cache_hits", {}).get("value", 0)
+        misses = snapshot.get("principal_cache_misses", {}).get("value", 0)
+        hit_rate = hits / (hits + misses) if hits + misses else 0.0
+        print(
+            f"  POST /predict {rate:>8,.0f} req/s  p50={p50:7.2f}ms  "
+            f"p99={p99:7.2f}ms  hit rate={hit_rate:.1%}"
+        )
+
+
+async def time_dependency(workdir: str, enabled: bool, calls: int) -> float:
+    """Mean microseconds per get_current_user call on a file SQLite database."""
+    engine = create_engine(f"sqlite:///{workdir}/dependency.db")
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    with session_factory() as session:
+        api_key, _ = AuthRepository(session).create_api_key("bench")
+        token = create_access_token({"sub": str(api_key.id)})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    settings.PRINCIPAL_CACHE_ENABLED = enabled
+    try:
+        start = time.perf_counter()
+        for _ in range(calls):
+            # A session per call, as the get_db dependency provides
+            with session_factory() as session:
+                repo = ThreadedRepository(AuthRepository(session))
+                await get_current_user(credentials, repo)
+        elapsed = time.perf_counter() - start
+    finally:
+        engine.dispose()
+    return elapsed / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--port", type=int, default=8767)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for enabled in ("false", "true"):
+            print(f"PRINCIPAL_CACHE_ENABLED={enabled} ({args.clients} clients)")
+            url = args.database_url or f"sqlite:///{workdir}/cache-{enabled}.db"
+            server = start_server(
+                args.port,
+                workdir,
+                database_url=url,
+                extra_env={
+                    "PRINCIPAL_CACHE_ENABLED": enabled,
+                    "LOG_WRITE_BEHIND_ENABLED": "true",
+                    "LOG_SPILL_PATH": f"{workdir}/spill.ndjson",
+                },
+            )
+            try:
+                asyncio.run(run(args.port, args.seconds, args.clients))
+            finally:
+                server.terminate()
+                server.wait()
+
+        print("get_current_user in-process (mean of 2000 calls)")
+        for enabled in (False, True):
+            micros = asyncio.run(time_dependency(workdir, enabled, 2000))
+            print(f"  {'cache' if enabled else 'no cache':<9} {micros:8.1f} us/call")
+
+
+if __name__ == "__main__":
+    main()
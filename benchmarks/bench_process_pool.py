@@ -0,0 +1,81 @@
+"""Throughput scaling and per-worker memory of the process inference backend.
+
+Usage:
+    python -m benchmarks.bench_process_pool [--seconds 5] [--max-workers N]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.ml.forest import CompiledForest
+from src.ml.inference import ProcessInferencePool, export_forest, process_memory
+from src.ml.model import get_model_version, load_model
+
+
+def _private_copy_memory() -> dict[str, int]:
+    """Memory of a process that loads its own copy of model.joblib."""
+    load_model()
+    return process_memory(os.getpid())
+
+
+async def measure(pool: ProcessInferencePool, artifact: str, seconds: float) -> float:
+    rng = np.random.default_rng(0)
+    batches = [rng.uniform(0, 10, size=(100, 13)) for _ in range(16)]
+    rows = 0
+    deadline = time.perf_counter() + seconds
+
+    async def client(i: int) -> None:
+        nonlocal rows
+        while time.perf_counter() < deadline:
+            await pool.predict(artifact, batches[i % len(batches)])
+            rows += 100
+
+    await asyncio.gather(*(client(i) for i in range(pool.n_workers * 2)))
+    return rows / seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    compiled = CompiledForest.from_estimator(load_model())
+    artifact = export_forest(compiled, get_model_version())
+
+    spawn = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as executor:
+        private = executor.submit(_private_copy_memory).result()
+    print(f"Process with a private joblib copy: RSS {private['rss_kb'] / 1024:.1f} MiB")
+
+    counts = sorted(
+        {1, 2, 4, 8, 16, args.max_workers} & set(range(1, args.max_workers + 1))
+    )
+    baseline = None
+    print(f"{'workers':>7} {'rows/s':>10} {'scaling':>8} {'RSS MiB':>9} {'PSS MiB':>9}")
+    for n_workers in counts:
+        pool = ProcessInferencePool(n_workers, max_queue=1024)
+        try:
+            pool.warm(artifact, compiled.n_features_in_)
+            throughput = asyncio.run(measure(pool, artifact, args.seconds))
+            memory = pool.memory_report()
+        finally:
+            pool.shutdown()
+
+        baseline = baseline or throughput
+        rss = np.mean([m["rss_kb"] for m in memory]) / 1024
+        pss = np.mean([m["pss_kb"] for m in memory]) / 1024
+        print(
+            f"{n_workers:>7} {throughput:>10,.0f} {throughput / baseline:>7.2f}x "
+            f"{rss:>9.1f} {pss:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
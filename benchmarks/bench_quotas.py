@@ -0,0 +1,115 @@
+"""Prediction quota overhead per request and its accuracy across workers.
+
+Times one slot acquire/release plus a bucket charge (what a /predict request
+pays) for memory:// and the shared sqlite:// store, spread over ``--keys``
+API keys; SQLite calls include the hop to the db executor. Then runs ``--workers`` processes that each try to spend 1,000
+units of one key's 500-unit bucket, and to hold 10 of its 4 concurrent
+slots: per-worker memory stores grant ``workers`` times both limits, the
+shared file exactly the limits.
+
+Usage:
+    python -m benchmarks.bench_quotas [--requests 20000] [--keys 1000]
+        [--workers 4]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import tempfile
+import time
+
+from src.core.exceptions import QuotaExceededError
+from src.core.quota_storage import quota_store_from_uri
+from src.core.quotas import QuotaManager
+
+
+def _manager(storage_uri: str, capacity: float, rate: float) -> QuotaManager:
+    return QuotaManager(
+        quota_store_from_uri(storage_uri),
+        capacity=capacity,
+        refill_per_second=rate,
+        max_concurrent=4,
+        lease_seconds=60,
+    )
+
+
+async def time_admission(storage_uri: str, requests: int, keys: int) -> float:
+    """Mean microseconds per admitted request."""
+    manager = _manager(storage_uri, capacity=1e9, rate=1e9)
+    start = time.perf_counter()
+    for i in range(requests):
+        async with manager.slot(i % keys):
+            await manager.take(i % keys, 1)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+async def _spend_units(manager: QuotaManager) -> int:
+    units = 0
+    for _ in range(1000):
+        try:
+            await manager.take(1, 1)
+            units += 1
+        except QuotaExceededError:
+            pass
+    return units
+
+
+def _spend(storage_uri: str, granted) -> None:
+    manager = _manager(storage_uri, capacity=500, rate=0.001)
+    units = asyncio.run(_spend_units(manager))
+    with granted.get_lock():
+        granted.value += units
+
+
+def _hold(storage_uri: str, granted) -> None:
+    manager = _manager(storage_uri, capacity=500, rate=0.001)
+    slots = 0
+    for _ in range(10):
+        # Never released: counts how many can be held at once
+        if manager.store.acquire_slot("api_key:1", 4, 60) is not None:
+            slots += 1
+    with granted.get_lock():
+        granted.value += slots
+
+
+def granted_across_workers(target, storage_uri: str, workers: int) -> int:
+    # Spawned: a forked child would inherit the db executor without its threads
+    context = multiprocessing.get_context("spawn")
+    granted = context.Value("i", 0)
+    procs = [
+        context.Process(target=target, args=(storage_uri, granted))
+        for _ in range(workers)
+    ]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+    return granted.value
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--keys", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        uris = {"memory": "memory://", "sqlite": f"sqlite:///{workdir}/quotas.db"}
+
+        print(f"Slot + charge per request ({args.keys} keys)")
+        for name, uri in uris.items():
+            micros = asyncio.run(time_admission(uri, args.requests, args.keys))
+            print(f"  {name:<7} {micros:8.1f} us/request")
+
+        print(f"Granted across {args.workers} workers")
+        for label, target in [("units of 500", _spend), ("slots of 4", _hold)]:
+            for name, uri in uris.items():
+                if name == "sqlite":
+                    uri = f"sqlite:///{workdir}/{target.__name__}.db"
+                granted = granted_across_workers(target, uri, args.workers)
+                print(f"  {label:<13} {name:<7} {granted:8d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Rate limiter overhead per request and the effective limit across workers.
+
+Times one sliding-window-counter hit per request for memory:// and the
+shared sqlite:// storage (spread over ``--keys`` clients), and the cost of
+keying requests by the bearer token's API key id instead of the client IP
+(decoding the token, or finding it in the principal cache).
+Then runs ``--workers`` processes that each send 1,000 requests for one
+client against a 100/minute limit: per-worker memory storage lets through
+``workers`` times the limit, the shared file exactly the limit.
+
+Usage:
+    python -m benchmarks.bench_rate_limiter [--hits 20000] [--keys 1000]
+        [--workers 4]
+"""
+
+import argparse
+import multiprocessing
+import tempfile
+import time
+
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import SlidingWindowCounterRateLimiter
+from starlette.requests import Request
+
+from src.auth.cache import get_principal_cache
+from src.config import settings
+from src.core.rate_limiter import rate_limit_key
+from src.core.security import create_access_token, decode_access_token
+
+
+def time_hits(storage_uri: str, hits: int, keys: int) -> float:
+    """Mean microseconds per hit."""
+    limiter = SlidingWindowCounterRateLimiter(storage_from_string(storage_uri))
+    item = parse(f"{hits}/minute")
+    start = time.perf_counter()
+    for i in range(hits):
+        limiter.hit(item, f"client-{i % keys}")
+    return (time.perf_counter() - start) / hits * 1e6
+
+
+def time_key_func(mode: str, calls: int, cached: bool = False) -> float:
+    """Mean microseconds per rate_limit_key call for RATE_LIMIT_KEY=mode.
+
+    ``cached``: the token is in the principal cache, as it is once
+    get_current_user has authenticated the request.
+    """
+    settings.RATE_LIMIT_KEY = mode
+    token = create_access_token({"sub": "1"})
+    cache = get_principal_cache()
+    cache.clear()
+    if cached:
+        cache.put({"id": 1}, token, decode_access_token(token)["exp"])
+    headers = [(b"authorization", f"Bearer {token}".encode())]
+    request = Request({"type": "http", "headers": headers, "client": ("10.0.0.1", 1)})
+    start = time.perf_counter()
+    for _ in range(calls):
+        rate_limit_key(request)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def _worker(storage_uri: str, requests: int, allowed) -> None:
+    limiter = SlidingWindowCounterRateLimiter(storage_from_string(storage_uri))
+    item = parse("100/minute")
+    count = sum(limiter.hit(item, "one-client") for _ in range(requests))
+    with allowed.get_lock():
+        allowed.value += count
+
+
+def allowed_across_workers(storage_uri: str, workers: int) -> int:
+    allowed = multiprocessing.Value("i", 0)
+    procs = [
+        multiprocessing.Process(target=_worker, args=(storage_uri, 1000, allowed))
+        for _ in range(workers)
+    ]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+    return allowed.value
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hits", type=int, default=20000)
+    parser.add_argument("--keys", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        uris = {"memory": "memory://", "sqlite": f"sqlite:///{workdir}/limits.db"}
+
+        print(f"Sliding window hit ({args.keys} clients)")
+        for name, uri in uris.items():
+            print(f"  {name:<7} {time_hits(uri, args.hits, args.keys):8.1f} us/hit")
+
+        print("Request key")
+        for label, mode, cached in [
+            ("ip", "ip", False),
+            ("api_key (token decoded)", "api_key", False),
+            ("api_key (token cached)", "api_key", True),
+        ]:
+            micros = time_key_func(mode, args.hits, cached)
+            print(f"  {label:<24} {micros:8.1f} us/request")
+
+        print(f"Requests allowed at 100/minute across {args.workers} workers")
+        for name, uri in uris.items():
+            if name == "sqlite":
+                uri = f"sqlite:///{workdir}/shared.db"
+            print(f"  {name:<7} {allowed_across_workers(uri, args.workers):8d}")
+
+
+if __name__ == "__main__":
+    main()
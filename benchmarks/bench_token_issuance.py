@@ -0,0 +1,107 @@
+"""Token issuance throughput: HMAC digest lookup vs bcrypt-hashed keys.
+
+Seeds a file SQLite database with ``--keys`` API keys, then calls
+AuthService.generate_token in-process (a session per call, as /auth/token
+gets) for:
+
+- digest keys: the indexed ``key_digest`` lookup every key uses today
+- legacy keys, first use: bcrypt rows as the old scheme stored them; each
+  call pays one bcrypt verify plus the upgrade write
+- legacy keys, second use: the same keys, now found by digest
+- unknown keys: the rejection path (no row matches)
+
+then loads the API key filter and repeats the digest and unknown-key runs,
+where unknown keys are rejected before the database is queried.
+
+Usage:
+    python -m benchmarks.bench_token_issuance [--keys 1000] [--calls 200]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from src.auth.key_filter import get_key_filter
+from src.auth.repository import AuthRepository
+from src.auth.service import AuthService
+from src.config import settings
+from src.core.database import Base, ThreadedRepository
+from src.core.security import generate_api_key, hash_password
+from src.models import APIKey
+
+
+def seed_legacy(session_factory: sessionmaker, count: int) -> list[str]:
+    """Insert ``count`` bcrypt-only keys and return their plain keys."""
+    plain_keys = [generate_api_key() for _ in range(count)]
+    with session_factory() as session:
+        session.execute(
+            insert(APIKey),
+            [
+                {"name": "legacy", "key_hash": hash_password(k), "key_prefix": k[:8]}
+                for k in plain_keys
+            ],
+        )
+        session.commit()
+    return plain_keys
+
+
+async def issue(session_factory: sessionmaker, plain_keys: list[str]) -> float:
+    """Tokens per second issued for ``plain_keys``, one call each."""
+    start = time.perf_counter()
+    for plain_key in plain_keys:
+        with session_factory() as session:
+            service = AuthService(ThreadedRepository(AuthRepository(session)))
+            await service.generate_token(plain_key)
+    return len(plain_keys) / (time.perf_counter() - start)
+
+
+def report(label: str, rate: float) -> None:
+    print(f"  {label:<19} {rate:>9,.0f} tokens/s  {1e3 / rate:8.2f} ms/token")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--keys", type=int, default=1000)
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        engine = create_engine(f"sqlite:///{workdir}/tokens.db")
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(bind=engine)
+
+        with session_factory() as session:
+            repo = AuthRepository(session)
+            digest_keys = [repo.create_api_key(f"key-{i}")[1] for i in range(args.keys)]
+        legacy_keys = seed_legacy(session_factory, args.calls)
+        unknown_keys = [generate_api_key() for _ in range(args.calls)]
+
+        print(f"POST /auth/token path, {args.keys + args.calls} keys stored")
+        runs = [
+            ("digest keys", digest_keys[: args.calls]),
+            ("legacy, first use", legacy_keys),
+            ("legacy, second use", legacy_keys),
+            ("unknown keys", unknown_keys),
+        ]
+        settings.API_KEY_FILTER_ENABLED = False
+        for label, plain_keys in runs:
+            report(label, asyncio.run(issue(session_factory, plain_keys)))
+
+        settings.API_KEY_FILTER_ENABLED = True
+        key_filter = get_key_filter()
+        key_filter.session_factory = session_factory
+        key_filter.refresh()
+        print(
+            f"with the API key filter (estimated fpr {key_filter.estimated_fpr():.1e})"
+        )
+        for label, plain_keys in [runs[0], runs[-1]]:
+            report(label, asyncio.run(issue(session_factory, plain_keys)))
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
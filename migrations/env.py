@@ -11,10 +11,15 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from src.config import settings
 from src.core.database import Base
-from src.models import APIKey, PredictionLog  # noqa: F401
+from src.models import (  # noqa: F401
+    APIKey,
+    PredictionBatch,
+    PredictionLog,
+    PredictionStat,
+)
 
 config = context.config
-config.set_main_option("sqlalchemy.url", settings.DATABASE_URL)
+config.set_main_option("sqlalchemy.url", settings.sync_database_url)
 
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
@@ -39,7 +44,7 @@ def run_migrations_offline() -> None:
 def run_migrations_online() -> None:
     """Run migrations in online mode."""
     configuration = config.get_section(config.config_ini_section)
-    configuration["sqlalchemy.url"] = settings.DATABASE_URL
+    configuration["sqlalchemy.url"] = settings.sync_database_url
 
     connectable = engine_from_config(
         configuration,
@@ -0,0 +1,32 @@
+"""add model_version to prediction_logs
+
+Revision ID: 3c7d52e1a9f0
+Revises: 6ea9e521e49c
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c7d52e1a9f0'
+down_revision: Union[str, None] = '6ea9e521e49c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    with op.batch_alter_table('prediction_logs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('model_version', sa.String(length=64), nullable=True))
+        batch_op.create_index(batch_op.f('ix_prediction_logs_model_version'), ['model_version'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    with op.batch_alter_table('prediction_logs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_prediction_logs_model_version'))
+        batch_op.drop_column('model_version')
@@ -0,0 +1,31 @@
+"""add (api_key_id, created_at, id) index to prediction_logs
+
+Replaces the single-column api_key_id index, which it covers as a prefix.
+
+Revision ID: 1523acaedd5e
+Revises: 3c7d52e1a9f0
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1523acaedd5e'
+down_revision: Union[str, None] = '3c7d52e1a9f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    op.create_index('ix_prediction_logs_api_key_created_id', 'prediction_logs', ['api_key_id', 'created_at', 'id'], unique=False)
+    op.drop_index('ix_prediction_logs_api_key_id', table_name='prediction_logs')
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.create_index('ix_prediction_logs_api_key_id', 'prediction_logs', ['api_key_id'], unique=False)
+    op.drop_index('ix_prediction_logs_api_key_created_id', table_name='prediction_logs')
@@ -0,0 +1,41 @@
+"""create prediction_stats table
+
+Revision ID: c825630222c8
+Revises: 1523acaedd5e
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c825630222c8'
+down_revision: Union[str, None] = '1523acaedd5e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    op.create_table('prediction_stats',
+    sa.Column('api_key_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('prediction_count', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), nullable=False),
+    sa.PrimaryKeyConstraint('api_key_id', 'day')
+    )
+
+    # Backfill the counters from the existing logs
+    day = 'date(created_at)' if op.get_bind().dialect.name == 'sqlite' else 'CAST(created_at AS DATE)'
+    op.execute(
+        'INSERT INTO prediction_stats (api_key_id, day, prediction_count) '
+        f'SELECT COALESCE(api_key_id, 0), {day}, COUNT(id) FROM prediction_logs '
+        f'GROUP BY COALESCE(api_key_id, 0), {day}'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.drop_table('prediction_stats')
@@ -0,0 +1,59 @@
+"""add typed search columns to prediction_logs
+
+Revision ID: 6ec2505f8376
+Revises: c825630222c8
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6ec2505f8376'
+down_revision: Union[str, None] = 'c825630222c8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    with op.batch_alter_table('prediction_logs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('ocean_proximity', sa.String(length=20), nullable=True))
+        batch_op.add_column(sa.Column('latitude', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('longitude', sa.Float(), nullable=True))
+
+    # Backfill from the JSON features (JSON_EXTRACT on SQLite, ->> on PostgreSQL)
+    prediction_logs = sa.table(
+        'prediction_logs',
+        sa.column('input_features', sa.JSON()),
+        sa.column('ocean_proximity', sa.String()),
+        sa.column('latitude', sa.Float()),
+        sa.column('longitude', sa.Float()),
+    )
+    features = prediction_logs.c.input_features
+    op.execute(
+        prediction_logs.update().values(
+            ocean_proximity=features['ocean_proximity'].as_string(),
+            latitude=features['latitude'].as_float(),
+            longitude=features['longitude'].as_float(),
+        )
+    )
+
+    with op.batch_alter_table('prediction_logs', schema=None) as batch_op:
+        batch_op.create_index('ix_prediction_logs_api_key_price', ['api_key_id', 'predicted_price'], unique=False)
+        batch_op.create_index('ix_prediction_logs_api_key_ocean_created', ['api_key_id', 'ocean_proximity', 'created_at'], unique=False)
+        batch_op.create_index('ix_prediction_logs_api_key_lat_lon', ['api_key_id', 'latitude', 'longitude'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    with op.batch_alter_table('prediction_logs', schema=None) as batch_op:
+        batch_op.drop_index('ix_prediction_logs_api_key_lat_lon')
+        batch_op.drop_index('ix_prediction_logs_api_key_ocean_created')
+        batch_op.drop_index('ix_prediction_logs_api_key_price')
+        batch_op.drop_column('longitude')
+        batch_op.drop_column('latitude')
+        batch_op.drop_column('ocean_proximity')
@@ -0,0 +1,124 @@
+"""store batches as header rows and input features as typed columns
+
+Revision ID: b38dffaf489f
+Revises: 6ec2505f8376
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import sqlite
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b38dffaf489f'
+down_revision: Union[str, None] = '6ec2505f8376'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NEW_FEATURES = [
+    'housing_median_age',
+    'total_rooms',
+    'total_bedrooms',
+    'population',
+    'households',
+    'median_income',
+]
+ALL_FEATURES = ['longitude', 'latitude', *NEW_FEATURES, 'ocean_proximity']
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    op.create_table('prediction_batches',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('batch_id', sa.String(length=36), nullable=False),
+    sa.Column('api_key_id', sa.Integer(), nullable=True),
+    sa.Column('response_time_ms', sa.Integer(), nullable=True),
+    sa.Column('model_version', sa.String(length=64), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['api_key_id'], ['api_keys.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('batch_id')
+    )
+    with op.batch_alter_table('prediction_batches', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_prediction_batches_created_at'), ['created_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_prediction_batches_id'), ['id'], unique=False)
+
+    with op.batch_alter_table('prediction_logs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('prediction_batch_id', sa.Integer(), nullable=True))
+        for name in NEW_FEATURES:
+            batch_op.add_column(sa.Column(name, sa.Float(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_prediction_logs_prediction_batch_id'), ['prediction_batch_id'], unique=False)
+        batch_op.create_foreign_key('fk_prediction_logs_prediction_batch_id', 'prediction_batches', ['prediction_batch_id'], ['id'], ondelete='CASCADE')
+
+    # Features move out of the JSON column (longitude, latitude and
+    # ocean_proximity were copied by the search columns migration)
+    prediction_logs = sa.table(
+        'prediction_logs',
+        sa.column('input_features', sa.JSON()),
+        *(sa.column(name, sa.Float()) for name in NEW_FEATURES),
+    )
+    features = prediction_logs.c.input_features
+    op.execute(
+        prediction_logs.update().values(
+            {name: features[name].as_float() for name in NEW_FEATURES}
+        )
+    )
+
+    # One header per batch; its rows drop the shared fields
+    op.execute(
+        'INSERT INTO prediction_batches '
+        '(batch_id, api_key_id, response_time_ms, model_version, created_at) '
+        'SELECT batch_id, MAX(api_key_id), MAX(response_time_ms), MAX(model_version), MIN(created_at) '
+        'FROM prediction_logs WHERE batch_id IS NOT NULL GROUP BY batch_id'
+    )
+    op.execute(
+        'UPDATE prediction_logs SET '
+        'prediction_batch_id = (SELECT prediction_batches.id FROM prediction_batches '
+        'WHERE prediction_batches.batch_id = prediction_logs.batch_id), '
+        'response_time_ms = NULL, model_version = NULL '
+        'WHERE batch_id IS NOT NULL'
+    )
+
+    with op.batch_alter_table('prediction_logs', schema=None) as batch_op:
+        batch_op.drop_index('ix_prediction_logs_batch_id')
+        batch_op.drop_column('batch_id')
+        batch_op.drop_column('request_type')
+        batch_op.drop_column('input_features')
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    with op.batch_alter_table('prediction_logs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('input_features', sqlite.JSON(), nullable=True))
+        batch_op.add_column(sa.Column('request_type', sa.String(length=10), nullable=True))
+        batch_op.add_column(sa.Column('batch_id', sa.String(length=36), nullable=True))
+
+    json_object = 'json_object' if op.get_bind().dialect.name == 'sqlite' else 'json_build_object'
+    pairs = ', '.join(f"'{name}', {name}" for name in ALL_FEATURES)
+    batch = 'SELECT prediction_batches.{} FROM prediction_batches WHERE prediction_batches.id = prediction_logs.prediction_batch_id'
+    op.execute(
+        f'UPDATE prediction_logs SET input_features = {json_object}({pairs}), '
+        "request_type = CASE WHEN prediction_batch_id IS NULL THEN 'single' ELSE 'batch' END, "
+        f'batch_id = ({batch.format("batch_id")}), '
+        f'response_time_ms = COALESCE(({batch.format("response_time_ms")}), response_time_ms), '
+        f'model_version = COALESCE(({batch.format("model_version")}), model_version)'
+    )
+
+    with op.batch_alter_table('prediction_logs', schema=None) as batch_op:
+        batch_op.alter_column('input_features', existing_type=sqlite.JSON(), nullable=False)
+        batch_op.alter_column('request_type', existing_type=sa.String(length=10), nullable=False)
+        batch_op.create_index(batch_op.f('ix_prediction_logs_batch_id'), ['batch_id'], unique=False)
+        batch_op.drop_constraint('fk_prediction_logs_prediction_batch_id', type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_prediction_logs_prediction_batch_id'))
+        for name in reversed(NEW_FEATURES):
+            batch_op.drop_column(name)
+        batch_op.drop_column('prediction_batch_id')
+
+    with op.batch_alter_table('prediction_batches', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_prediction_batches_id'))
+        batch_op.drop_index(batch_op.f('ix_prediction_batches_created_at'))
+
+    op.drop_table('prediction_batches')
@@ -0,0 +1,44 @@
+"""look up api keys by an hmac digest instead of scanning bcrypt hashes
+
+Revision ID: 4f0c9a7e2d15
+Revises: b38dffaf489f
+Create Date: 2026-10-16 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f0c9a7e2d15'
+down_revision: Union[str, None] = 'b38dffaf489f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    # Existing keys keep their bcrypt hash and get a digest on their next
+    # successful use (the plain key is needed to compute it)
+    with op.batch_alter_table('api_keys', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('key_digest', sa.String(length=64), nullable=True))
+        batch_op.alter_column('key_hash', existing_type=sa.String(length=255), nullable=True)
+        batch_op.create_index(batch_op.f('ix_api_keys_key_digest'), ['key_digest'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    # Keys issued or upgraded since have no bcrypt hash and cannot be
+    # verified by the old scheme; they are deactivated and given a
+    # placeholder hash so key_hash can be NOT NULL again
+    op.execute(
+        "UPDATE api_keys SET is_active = false, key_hash = 'revoked-' || key_digest "
+        'WHERE key_hash IS NULL'
+    )
+
+    with op.batch_alter_table('api_keys', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_api_keys_key_digest'))
+        batch_op.alter_column('key_hash', existing_type=sa.String(length=255), nullable=False)
+        batch_op.drop_column('key_digest')
@@ -0,0 +1,27 @@
+"""add updated_at index to api_keys
+
+Revision ID: 9d2e6b71c4a8
+Revises: 4f0c9a7e2d15
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d2e6b71c4a8'
+down_revision: Union[str, None] = '4f0c9a7e2d15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    op.create_index('ix_api_keys_updated_at', 'api_keys', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.drop_index('ix_api_keys_updated_at', table_name='api_keys')
@@ -0,0 +1,51 @@
+"""add per-day total rows to prediction_stats
+
+Revision ID: 6b3f18d4a9e7
+Revises: 9d2e6b71c4a8
+Create Date: 2026-10-16 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6b3f18d4a9e7'
+down_revision: Union[str, None] = '9d2e6b71c4a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _orphaned(alias: str) -> str:
+    # Counters of keys deleted before deletes folded them into row 0
+    return f'{alias}.api_key_id > 0 AND {alias}.api_key_id NOT IN (SELECT id FROM api_keys)'
+
+
+def upgrade() -> None:
+    """Upgrade database schema."""
+    op.execute(
+        'UPDATE prediction_stats SET prediction_count = prediction_count + '
+        '(SELECT SUM(o.prediction_count) FROM prediction_stats o '
+        f'WHERE o.day = prediction_stats.day AND {_orphaned("o")}) '
+        'WHERE api_key_id = 0 AND EXISTS (SELECT 1 FROM prediction_stats o '
+        f'WHERE o.day = prediction_stats.day AND {_orphaned("o")})'
+    )
+    op.execute(
+        'INSERT INTO prediction_stats (api_key_id, day, prediction_count) '
+        f'SELECT 0, o.day, SUM(o.prediction_count) FROM prediction_stats o WHERE {_orphaned("o")} '
+        'AND NOT EXISTS (SELECT 1 FROM prediction_stats u WHERE u.api_key_id = 0 AND u.day = o.day) '
+        'GROUP BY o.day'
+    )
+    op.execute(f'DELETE FROM prediction_stats WHERE {_orphaned("prediction_stats")}')
+
+    # One total row per day, so /logs/stats sums a single key's rows
+    op.execute(
+        'INSERT INTO prediction_stats (api_key_id, day, prediction_count) '
+        'SELECT -1, day, SUM(prediction_count) FROM prediction_stats GROUP BY day'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade database schema."""
+    op.execute('DELETE FROM prediction_stats WHERE api_key_id = -1')
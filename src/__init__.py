@@ -1 +1,6 @@
 """Housing Price Prediction API."""
+
+import time
+
+# Start of the "imports" phase in the startup report (src is imported first)
+IMPORT_STARTED = time.perf_counter()
@@ -0,0 +1 @@
+"""Admin domain for operational controls."""
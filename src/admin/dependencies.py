@@ -0,0 +1,27 @@
+"""Admin dependencies for FastAPI."""
+
+import secrets
+from typing import Annotated
+
+from fastapi import Depends, Header, HTTPException, status
+
+from src.config import settings
+
+
+def require_admin(
+    x_admin_token: Annotated[str | None, Header()] = None,
+) -> None:
+    """Allow the request only with the configured X-Admin-Token."""
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Admin API is disabled"
+        )
+    if x_admin_token is None or not secrets.compare_digest(
+        x_admin_token, settings.ADMIN_TOKEN
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid admin token"
+        )
+
+
+AdminDep = Depends(require_admin)
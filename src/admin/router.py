@@ -0,0 +1,54 @@
+"""Admin API routes."""
+
+import logging
+
+from fastapi import APIRouter, HTTPException, status
+
+from src.admin.dependencies import AdminDep
+from src.admin.schema import ModelInfoResponse, ModelReloadResponse
+from src.core.exceptions import ModelLoadError
+from src.ml.manager import ModelHandle, get_model_manager
+
+logger = logging.getLogger(__name__)
+router = APIRouter(dependencies=[AdminDep])
+
+
+def _model_info(handle: ModelHandle) -> dict:
+    return {
+        "model_version": handle.version,
+        "model_path": handle.path,
+        "loaded_at": handle.loaded_at,
+        "engine": type(handle.engine).__name__,
+    }
+
+
+@router.get("/model", response_model=ModelInfoResponse, summary="Get Serving Model")
+async def get_model_info() -> ModelInfoResponse:
+    return ModelInfoResponse(**_model_info(get_model_manager().current))
+
+
+@router.post(
+    "/model/reload",
+    response_model=ModelReloadResponse,
+    summary="Reload Model",
+    description=(
+        "Load MODEL_PATH in the background, validate and warm it, then swap it "
+        "in. In-flight requests finish on the previous version."
+    ),
+)
+async def reload_model(force: bool = False) -> ModelReloadResponse:
+    manager = get_model_manager()
+    previous = manager.current
+    try:
+        handle, reloaded = await manager.reload(force=force)
+    except ModelLoadError as e:
+        logger.error(f"Model reload rejected: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
+        ) from e
+
+    return ModelReloadResponse(
+        **_model_info(handle),
+        reloaded=reloaded,
+        previous_version=previous.version,
+    )
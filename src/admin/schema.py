@@ -0,0 +1,19 @@
+"""Pydantic schemas for admin operations."""
+
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class ModelInfoResponse(BaseModel):
+    model_config = ConfigDict(protected_namespaces=())
+
+    model_version: str = Field(..., examples=["3f1c2a9d7b10"])
+    model_path: str
+    loaded_at: datetime
+    engine: str = Field(..., examples=["CompiledForest"])
+
+
+class ModelReloadResponse(ModelInfoResponse):
+    reloaded: bool
+    previous_version: str | None = None
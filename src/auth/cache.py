@@ -0,0 +1,157 @@
+"""Bounded TTL cache of authenticated principals for get_current_user."""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from src.config import settings
+from src.core.metrics import metrics
+
+principal_hits = metrics.counter(
+    "principal_cache_hits", "Authenticated requests served without a key lookup"
+)
+principal_misses = metrics.counter(
+    "principal_cache_misses", "Authenticated requests that loaded the API key"
+)
+principal_evictions = metrics.counter(
+    "principal_cache_evictions", "Principals evicted by size, TTL or invalidation"
+)
+principal_entries = metrics.gauge(
+    "principal_cache_entries", "Principals currently cached"
+)
+
+
+def _token_key(token: str) -> bytes:
+    # Tokens are credentials; keep only a digest of them in memory
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+class PrincipalCache:
+    """LRU cache of active API keys' principals, by key id and by token.
+
+    A principal expires ``ttl_seconds`` after it was loaded, and is dropped
+    at once by ``invalidate`` when its key is deactivated or deleted in this
+    process; other processes see the change once the TTL runs out. Token
+    entries map a token to its key id until the token expires, so a hit also
+    skips decoding the JWT; they never outlive the key's principal entry.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._principals: OrderedDict[int, tuple[dict, float]] = OrderedDict()
+        self._tokens: OrderedDict[bytes, tuple[int, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._principals)
+
+    def _principal(self, key_id: int, now: float) -> dict | None:
+        entry = self._principals.get(key_id)
+        if entry is None:
+            return None
+        principal, expires_at = entry
+        if expires_at <= now:
+            del self._principals[key_id]
+            principal_evictions.inc()
+            return None
+        self._principals.move_to_end(key_id)
+        return principal
+
+    def get(self, key_id: int) -> dict | None:
+        with self._lock:
+            principal = self._principal(key_id, time.monotonic())
+            principal_entries.set(len(self._principals))
+        (principal_hits if principal is not None else principal_misses).inc()
+        return principal
+
+    def get_by_token(self, token: str) -> dict | None:
+        """Principal for an already validated token, without decoding it.
+
+        A miss is not counted; the caller falls back to ``get``.
+        """
+        key = _token_key(token)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._tokens.get(key)
+            if entry is None:
+                return None
+            key_id, expires_at = entry
+            if expires_at <= now:
+                del self._tokens[key]
+                return None
+            self._tokens.move_to_end(key)
+            principal = self._principal(key_id, now)
+        if principal is not None:
+            principal_hits.inc()
+        return principal
+
+    def token_key_id(self, token: str) -> int | None:
+        """Key id of a cached, unexpired token; not counted as a hit or miss."""
+        with self._lock:
+            entry = self._tokens.get(_token_key(token))
+        if entry is None or entry[1] <= time.monotonic():
+            return None
+        return entry[0]
+
+    def put(
+        self, principal: dict, token: str | None = None, token_exp: float | None = None
+    ) -> None:
+        """Cache an active key's principal, and the token it was presented with.
+
+        ``token_exp`` is the token's ``exp`` claim (Unix time).
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._principals[principal["id"]] = (principal, now + self.ttl_seconds)
+            self._principals.move_to_end(principal["id"])
+            if token is not None and token_exp is not None:
+                expires_at = now + (token_exp - time.time())
+                self._tokens[_token_key(token)] = (principal["id"], expires_at)
+                self._tokens.move_to_end(_token_key(token))
+
+            overflow = len(self._principals) - self.max_entries
+            for _ in range(max(0, overflow)):
+                self._principals.popitem(last=False)
+            if overflow > 0:
+                principal_evictions.inc(overflow)
+            for _ in range(max(0, len(self._tokens) - self.max_entries)):
+                self._tokens.popitem(last=False)
+            principal_entries.set(len(self._principals))
+
+    def invalidate(self, key_id: int) -> None:
+        """Forget a key's principal; its token entries then miss as well."""
+        with self._lock:
+            if self._principals.pop(key_id, None) is not None:
+                principal_evictions.inc()
+            principal_entries.set(len(self._principals))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._principals.clear()
+            self._tokens.clear()
+            principal_entries.set(0)
+
+
+_cache: PrincipalCache | None = None
+
+
+def get_principal_cache() -> PrincipalCache | None:
+    """Return the process-wide cache, or None when caching is disabled."""
+    global _cache
+    if not settings.PRINCIPAL_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = PrincipalCache(
+            max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+        )
+    return _cache
+
+
+def invalidate_principal(key_id: int) -> None:
+    """Drop a key from the cache after its status changed (no-op when off)."""
+    cache = get_principal_cache()
+    if cache is not None:
+        cache.invalidate(key_id)
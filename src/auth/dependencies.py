@@ -4,22 +4,33 @@ from typing import Annotated
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src.auth.repository import AuthRepository
+from src.auth.cache import get_principal_cache
+from src.auth.repository import AsyncAuthRepository, AuthRepository
 from src.auth.service import AuthService
-from src.config import http_bearer
-from src.core.database import get_db
+from src.config import http_bearer, settings
+from src.core.database import ThreadedRepository, get_async_db, get_db
 from src.core.security import decode_access_token
 
 DbSessionDep = Annotated[Session, Depends(get_db)]
+AsyncDbSessionDep = Annotated[AsyncSession, Depends(get_async_db)]
 
 
-def get_auth_repo(session: DbSessionDep) -> AuthRepository:
-    return AuthRepository(session)
+def get_auth_repo(session: DbSessionDep) -> AsyncAuthRepository:
+    """Sync engine: run AuthRepository on the db executor."""
+    return ThreadedRepository(AuthRepository(session))
 
 
-AuthRepoDep = Annotated[AuthRepository, Depends(get_auth_repo)]
+def get_async_auth_repo(session: AsyncDbSessionDep) -> AsyncAuthRepository:
+    return AsyncAuthRepository(session)
+
+
+AuthRepoDep = Annotated[
+    AsyncAuthRepository,
+    Depends(get_async_auth_repo if settings.database_is_async else get_auth_repo),
+]
 
 
 def get_auth_service(repo: AuthRepoDep) -> AuthService:
@@ -33,14 +44,23 @@ async def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(http_bearer)],
     repo: AuthRepoDep,
 ) -> dict:
-    """Get the current authenticated user from JWT token."""
+    """Get the current authenticated user from JWT token.
+
+    Active principals are cached by key id and token (see PrincipalCache),
+    so a hit neither decodes the token nor queries the database.
+    """
+    cache = get_principal_cache()
+    token = credentials.credentials
+    if cache is not None and (principal := cache.get_by_token(token)) is not None:
+        return principal
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    payload = decode_access_token(credentials.credentials)
+    payload = decode_access_token(token)
     if payload is None:
         raise credentials_exception
 
@@ -48,11 +68,18 @@ async def get_current_user(
     if key_id is None:
         raise credentials_exception
 
-    api_key = repo.get_by_id(int(key_id))
+    if cache is not None and (principal := cache.get(int(key_id))) is not None:
+        cache.put(principal, token, payload.get("exp"))
+        return principal
+
+    api_key = await repo.get_by_id(int(key_id))
     if api_key is None or not api_key.is_active or api_key.is_deleted:
         raise credentials_exception
 
-    return {"id": api_key.id, "name": api_key.name}
+    principal = {"id": api_key.id, "name": api_key.name}
+    if cache is not None:
+        cache.put(principal, token, payload.get("exp"))
+    return principal
 
 
 CurrentUserDep = Annotated[dict, Depends(get_current_user)]
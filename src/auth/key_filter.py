@@ -0,0 +1,333 @@
+"""Counting Bloom filter of usable API keys, checked before /auth/token work."""
+
+import asyncio
+import hashlib
+import logging
+import math
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.core.database import SessionLocal
+from src.core.executors import get_db_executor
+from src.core.metrics import metrics
+from src.core.security import api_key_digest
+from src.models import APIKey
+
+logger = logging.getLogger(__name__)
+
+filter_rejections = metrics.counter(
+    "api_key_filter_rejections", "API keys rejected by the filter without a lookup"
+)
+filter_false_positives = metrics.counter(
+    "api_key_filter_false_positives",
+    "API keys that passed the filter but matched no usable key",
+)
+filter_entries = metrics.gauge(
+    "api_key_filter_entries", "Usable API keys in the filter"
+)
+filter_fpr = metrics.gauge(
+    "api_key_filter_estimated_fpr", "Estimated false-positive rate at the current fill"
+)
+filter_stale_rebuilds = metrics.counter(
+    "api_key_filter_stale_rebuilds",
+    "Rebuilds after a miss found api_keys changed since the last load",
+)
+
+_MAX_COUNT = 255
+
+
+class CountingBloomFilter:
+    """Bloom filter with 8-bit counters, so items can also be removed.
+
+    Sized for ``capacity`` items at ``error_rate`` false positives. A counter
+    that reaches 255 stays there: its items can no longer be removed, which
+    only costs false positives.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        capacity = max(1, capacity)
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._counters = bytearray(self.size)
+        self.count = 0
+
+    def _positions(self, item: str) -> list[int]:
+        # Double hashing (Kirsch-Mitzenmacher) from one 128-bit digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def __contains__(self, item: str) -> bool:
+        counters = self._counters
+        return all(counters[p] for p in self._positions(item))
+
+    def add(self, item: str) -> None:
+        counters = self._counters
+        for p in self._positions(item):
+            if counters[p] < _MAX_COUNT:
+                counters[p] += 1
+        self.count += 1
+
+    def remove(self, item: str) -> bool:
+        """Remove an added item; False (and no change) if it is not present."""
+        positions = self._positions(item)
+        counters = self._counters
+        if not all(counters[p] for p in positions):
+            return False
+        for p in positions:
+            if counters[p] < _MAX_COUNT:
+                counters[p] -= 1
+        self.count = max(0, self.count - 1)
+        return True
+
+    def estimated_fpr(self) -> float:
+        return (1 - math.exp(-self.hash_count * self.count / self.size)) ** (
+            self.hash_count
+        )
+
+
+def filter_entry(api_key: APIKey) -> str:
+    """The filter entry of a key: its digest, or its prefix if legacy."""
+    # Legacy bcrypt rows have no digest yet; only their prefix is known
+    if api_key.key_digest is not None:
+        return api_key.key_digest
+    return f"prefix:{api_key.key_prefix}"
+
+
+def _table_version(session: Session) -> tuple[Any, ...]:
+    # Changes whenever a key is created, updated (deactivated, deleted,
+    # restored, upgraded) or the latest one hard-deleted; both are indexed
+    stmt = select(func.max(APIKey.id), func.max(APIKey.updated_at))
+    return tuple(session.execute(stmt).one())
+
+
+def _usable_items(session: Session) -> list[str]:
+    stmt = select(APIKey.key_digest, APIKey.key_prefix).where(
+        APIKey.is_active == True,  # noqa: E712
+        APIKey.deleted_at == None,  # noqa: E711
+    )
+    return [
+        digest if digest is not None else f"prefix:{prefix}"
+        for digest, prefix in session.execute(stmt)
+    ]
+
+
+class APIKeyFilter:
+    """Which plain keys could belong to a usable API key.
+
+    Holds the digest of every active, undeleted key, and the prefix of legacy
+    keys not yet upgraded. A hit still needs the database. Until the first
+    ``refresh`` every key passes.
+
+    The repositories update it on create, deactivate, delete, restore and
+    upgrade in this process, but other workers' changes only reach it on a
+    rebuild. So ``rejects`` confirms a miss against the version of api_keys
+    recorded at the last rebuild, and rebuilds first if the table changed.
+    That check runs at most once per ``stale_check_seconds``; misses in
+    between are answered from memory, so a flood of guessed keys costs one
+    query per window, and a key created elsewhere may be rejected for up to
+    that long.
+    Keys added while a refresh runs are added again afterwards, so a refresh
+    can leave stale entries (false positives) but never drops a usable key.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        capacity: int,
+        error_rate: float,
+        stale_check_seconds: float = 1.0,
+    ) -> None:
+        self.session_factory = session_factory
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.stale_check_seconds = stale_check_seconds
+        self._filter = CountingBloomFilter(capacity, error_rate)
+        self.loaded = False
+        self._lock = threading.Lock()
+        # Serializes rebuilds (background refresh and stale misses)
+        self._refresh_lock = threading.Lock()
+        self._version: tuple[Any, ...] | None = None
+        # time.monotonic() of the last table version read
+        self._version_checked_at = float("-inf")
+        self._added_during_refresh: list[str] | None = None
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return self._filter.count
+
+    def estimated_fpr(self) -> float:
+        return self._filter.estimated_fpr()
+
+    def _update_metrics(self) -> None:
+        filter_entries.set(self._filter.count)
+        filter_fpr.set(self._filter.estimated_fpr())
+
+    def might_exist(self, plain_key: str) -> bool:
+        """False when ``plain_key`` is not in the filter as last built."""
+        if not self.loaded:
+            return True
+        # Lock-free read: a concurrent update can only cause a false positive
+        # or a miss on a key whose create has not returned yet
+        return (
+            api_key_digest(plain_key) in self._filter
+            or f"prefix:{plain_key[:8]}" in self._filter
+        )
+
+    async def rejects(self, plain_key: str) -> bool:
+        """True when ``plain_key`` cannot be a usable key (counted as rejected).
+
+        A key created elsewhere since the last rebuild triggers a rebuild
+        rather than a rejection, once the staleness check is due.
+        """
+        if self.might_exist(plain_key):
+            return False
+        if self._version_check_due():
+            await get_db_executor().run(self.refresh_if_stale)
+            if self.might_exist(plain_key):
+                return False
+        filter_rejections.inc()
+        return True
+
+    def _version_check_due(self) -> bool:
+        elapsed = time.monotonic() - self._version_checked_at
+        return elapsed >= self.stale_check_seconds
+
+    def refresh_if_stale(self) -> bool:
+        """Rebuild if api_keys changed since the last rebuild (blocking).
+
+        Reads the table version at most once per ``stale_check_seconds``;
+        returns whether the filter was rebuilt.
+        """
+        with self._refresh_lock:
+            # Misses that queued behind another check reuse its answer
+            if not self._version_check_due():
+                return False
+            self._version_checked_at = time.monotonic()
+            with self.session_factory() as session:
+                if _table_version(session) == self._version:
+                    return False
+            filter_stale_rebuilds.inc()
+            self._refresh()
+        return True
+
+    def add(self, entry: str) -> None:
+        with self._lock:
+            self._filter.add(entry)
+            if self._added_during_refresh is not None:
+                self._added_during_refresh.append(entry)
+            self._update_metrics()
+
+    def remove(self, entry: str) -> None:
+        with self._lock:
+            self._filter.remove(entry)
+            self._update_metrics()
+
+    def refresh(self) -> int:
+        """Rebuild from the database (blocking); returns the number of keys."""
+        with self._refresh_lock:
+            return self._refresh()
+
+    def _refresh(self) -> int:
+        with self._lock:
+            self._added_during_refresh = []
+        try:
+            with self.session_factory() as session:
+                # Read first: a key created after this is caught as a change
+                version = _table_version(session)
+                items = _usable_items(session)
+        except BaseException:
+            with self._lock:
+                self._added_during_refresh = None
+            raise
+
+        rebuilt = CountingBloomFilter(self.capacity, self.error_rate)
+        for item in items:
+            rebuilt.add(item)
+        with self._lock:
+            for item in self._added_during_refresh or []:
+                rebuilt.add(item)
+            self._added_during_refresh = None
+            self._filter = rebuilt
+            self._version = version
+            self._version_checked_at = time.monotonic()
+            self.loaded = True
+            self._update_metrics()
+        if len(items) > self.capacity:
+            logger.warning(
+                f"{len(items)} API keys exceed API_KEY_FILTER_CAPACITY="
+                f"{self.capacity}; false-positive rate is "
+                f"{rebuilt.estimated_fpr():.2%}"
+            )
+        return len(items)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._filter = CountingBloomFilter(self.capacity, self.error_rate)
+            self._version = None
+            self.loaded = False
+            self._update_metrics()
+
+    async def load(self) -> int:
+        return await get_db_executor().run(self.refresh)
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.load()
+            except Exception as e:
+                logger.error(f"API key filter refresh failed: {e}")
+
+    def start(self, interval: float) -> None:
+        if self._task is None and interval > 0:
+            self._task = asyncio.get_running_loop().create_task(self._run(interval))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+_filter: APIKeyFilter | None = None
+
+
+def get_key_filter() -> APIKeyFilter | None:
+    """Return the process-wide filter, or None when it is disabled."""
+    global _filter
+    if not settings.API_KEY_FILTER_ENABLED:
+        return None
+    if _filter is None:
+        _filter = APIKeyFilter(
+            session_factory=SessionLocal,
+            capacity=settings.API_KEY_FILTER_CAPACITY,
+            error_rate=settings.API_KEY_FILTER_ERROR_RATE,
+            stale_check_seconds=settings.API_KEY_FILTER_STALE_CHECK_MS / 1000,
+        )
+    return _filter
+
+
+def remember_key(entry: str) -> None:
+    """Add a key that became usable (no-op when the filter is off)."""
+    key_filter = get_key_filter()
+    if key_filter is not None:
+        key_filter.add(entry)
+
+
+def forget_key(entry: str) -> None:
+    """Drop a key that stopped being usable (no-op when the filter is off)."""
+    key_filter = get_key_filter()
+    if key_filter is not None:
+        key_filter.remove(entry)
@@ -1,11 +1,84 @@
 """Repository for API key database operations."""
 
-from sqlalchemy import select
+import asyncio
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src.core.security import generate_api_key, hash_password, verify_password
+from src.auth.cache import invalidate_principal
+from src.auth.key_filter import filter_entry, forget_key, remember_key
+from src.core.metrics import metrics
+from src.core.security import api_key_digest, generate_api_key, verify_password
+from src.logs.stats import fold_key_stats_stmts
 from src.models import APIKey
 
+legacy_key_upgrades = metrics.counter(
+    "api_key_legacy_upgrades", "bcrypt-hashed API keys moved to HMAC digests"
+)
+
+
+def _new_api_key(name: str, description: str | None) -> tuple[APIKey, str]:
+    plain_key = generate_api_key()
+    api_key = APIKey(
+        name=name,
+        description=description,
+        key_digest=api_key_digest(plain_key),
+        key_prefix=plain_key[:8],
+    )
+    return api_key, plain_key
+
+
+def _all_stmt(skip: int, limit: int, include_deleted: bool) -> Select:
+    stmt = select(APIKey)
+    if not include_deleted:
+        stmt = stmt.where(APIKey.deleted_at == None)  # noqa: E711
+    return stmt.offset(skip).limit(limit)
+
+
+def _usable_key_stmt() -> Select:
+    return select(APIKey).where(
+        APIKey.is_active == True,  # noqa: E712
+        APIKey.deleted_at == None,  # noqa: E711
+    )
+
+
+def _key_by_digest_stmt(digest: str) -> Select:
+    return _usable_key_stmt().where(APIKey.key_digest == digest)
+
+
+def _legacy_candidates_stmt(plain_key: str) -> Select:
+    # Only bcrypt rows not yet upgraded; usually none, so invalid keys
+    # cost one indexed lookup and no hashing
+    return _usable_key_stmt().where(
+        APIKey.key_prefix == plain_key[:8],
+        APIKey.key_digest == None,  # noqa: E711
+    )
+
+
+def _match_key(plain_key: str, candidates: list[APIKey]) -> APIKey | None:
+    for candidate in candidates:
+        if candidate.key_hash and verify_password(plain_key, candidate.key_hash):
+            return candidate
+    return None
+
+
+def _upgrade_key(api_key: APIKey, digest: str) -> str:
+    # The bcrypt hash is dropped: the digest alone now identifies the key.
+    # Returns the key's old filter entry
+    legacy_entry = filter_entry(api_key)
+    api_key.key_digest = digest
+    api_key.key_hash = None
+    legacy_key_upgrades.inc()
+    return legacy_entry
+
+
+def _usable_entry(api_key: APIKey) -> str | None:
+    # Read before a change is committed: afterwards the row may be gone
+    if api_key.is_active and not api_key.is_deleted:
+        return filter_entry(api_key)
+    return None
+
 
 class AuthRepository:
     """Repository for API key CRUD operations."""
@@ -17,19 +90,12 @@ class AuthRepository:
         self, name: str, description: str | None = None
     ) -> tuple[APIKey, str]:
         """Create a new API key. Returns (APIKey, plain_key) - plain key only returned once!"""
-        plain_key = generate_api_key()
-        key_hash = hash_password(plain_key)
-
-        api_key = APIKey(
-            name=name,
-            description=description,
-            key_hash=key_hash,
-            key_prefix=plain_key[:8],
-        )
+        api_key, plain_key = _new_api_key(name, description)
 
         self.session.add(api_key)
         self.session.commit()
         self.session.refresh(api_key)
+        remember_key(api_key.key_digest)
 
         return api_key, plain_key
 
@@ -40,43 +106,57 @@ class AuthRepository:
     def get_all(
         self, skip: int = 0, limit: int = 100, include_deleted: bool = False
     ) -> list[APIKey]:
-        stmt = select(APIKey)
-        if not include_deleted:
-            stmt = stmt.where(APIKey.deleted_at == None)  # noqa: E711
-        stmt = stmt.offset(skip).limit(limit)
+        stmt = _all_stmt(skip, limit, include_deleted)
         return list(self.session.execute(stmt).scalars().all())
 
     def validate_key(self, plain_key: str) -> APIKey | None:
-        """Validate an API key and return the record if valid."""
-        key_prefix = plain_key[:8]
-        stmt = select(APIKey).where(
-            APIKey.key_prefix == key_prefix,
-            APIKey.is_active == True,  # noqa: E712
-            APIKey.deleted_at == None,  # noqa: E711
-        )
-        candidates = self.session.execute(stmt).scalars().all()
-
-        for candidate in candidates:
-            if verify_password(plain_key, candidate.key_hash):
-                return candidate
-        return None
+        """Validate an API key and return the record if valid.
+
+        A legacy bcrypt row is upgraded to a digest on its first match.
+        """
+        digest = api_key_digest(plain_key)
+        stmt = _key_by_digest_stmt(digest)
+        api_key = self.session.execute(stmt).scalar_one_or_none()
+        if api_key is not None:
+            return api_key
+
+        stmt = _legacy_candidates_stmt(plain_key)
+        api_key = _match_key(plain_key, list(self.session.execute(stmt).scalars()))
+        if api_key is not None:
+            legacy_entry = _upgrade_key(api_key, digest)
+            self.session.commit()
+            self.session.refresh(api_key)
+            remember_key(digest)
+            forget_key(legacy_entry)
+        return api_key
 
     def deactivate(self, key_id: int) -> bool:
         api_key = self.get_by_id(key_id)
         if api_key:
+            entry = _usable_entry(api_key)
             api_key.is_active = False
             self.session.commit()
+            invalidate_principal(key_id)
+            if entry is not None:
+                forget_key(entry)
             return True
         return False
 
     def delete(self, key_id: int, hard_delete: bool = False) -> bool:
         api_key = self.get_by_id(key_id)
         if api_key:
+            entry = _usable_entry(api_key)
             if hard_delete:
+                # Its logs lose their key, so its counters move with them
+                for stmt in fold_key_stats_stmts(key_id):
+                    self.session.execute(stmt)
                 self.session.delete(api_key)
             else:
                 api_key.soft_delete()
             self.session.commit()
+            invalidate_principal(key_id)
+            if entry is not None:
+                forget_key(entry)
             return True
         return False
 
@@ -84,6 +164,107 @@ class AuthRepository:
         api_key = self.get_by_id(key_id)
         if api_key and api_key.is_deleted:
             api_key.restore()
+            entry = _usable_entry(api_key)
             self.session.commit()
+            if entry is not None:
+                remember_key(entry)
+            return True
+        return False
+
+
+class AsyncAuthRepository:
+    """AuthRepository for an AsyncSession (aiosqlite / asyncpg).
+
+    bcrypt verification of legacy keys runs in a worker thread so it does
+    not stall the event loop.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def create_api_key(
+        self, name: str, description: str | None = None
+    ) -> tuple[APIKey, str]:
+        """Create a new API key. Returns (APIKey, plain_key) - plain key only returned once!"""
+        api_key, plain_key = _new_api_key(name, description)
+
+        self.session.add(api_key)
+        await self.session.commit()
+        await self.session.refresh(api_key)
+        remember_key(api_key.key_digest)
+
+        return api_key, plain_key
+
+    async def get_by_id(self, key_id: int) -> APIKey | None:
+        stmt = select(APIKey).where(APIKey.id == key_id)
+        return (await self.session.execute(stmt)).scalar_one_or_none()
+
+    async def get_all(
+        self, skip: int = 0, limit: int = 100, include_deleted: bool = False
+    ) -> list[APIKey]:
+        stmt = _all_stmt(skip, limit, include_deleted)
+        return list((await self.session.execute(stmt)).scalars().all())
+
+    async def validate_key(self, plain_key: str) -> APIKey | None:
+        """Validate an API key and return the record if valid.
+
+        A legacy bcrypt row is upgraded to a digest on its first match.
+        """
+        digest = api_key_digest(plain_key)
+        stmt = _key_by_digest_stmt(digest)
+        api_key = (await self.session.execute(stmt)).scalar_one_or_none()
+        if api_key is not None:
+            return api_key
+
+        stmt = _legacy_candidates_stmt(plain_key)
+        candidates = list((await self.session.execute(stmt)).scalars())
+        if not candidates:
+            return None
+        api_key = await asyncio.to_thread(_match_key, plain_key, candidates)
+        if api_key is not None:
+            legacy_entry = _upgrade_key(api_key, digest)
+            await self.session.commit()
+            await self.session.refresh(api_key)
+            remember_key(digest)
+            forget_key(legacy_entry)
+        return api_key
+
+    async def deactivate(self, key_id: int) -> bool:
+        api_key = await self.get_by_id(key_id)
+        if api_key:
+            entry = _usable_entry(api_key)
+            api_key.is_active = False
+            await self.session.commit()
+            invalidate_principal(key_id)
+            if entry is not None:
+                forget_key(entry)
+            return True
+        return False
+
+    async def delete(self, key_id: int, hard_delete: bool = False) -> bool:
+        api_key = await self.get_by_id(key_id)
+        if api_key:
+            entry = _usable_entry(api_key)
+            if hard_delete:
+                for stmt in fold_key_stats_stmts(key_id):
+                    await self.session.execute(stmt)
+                await self.session.delete(api_key)
+            else:
+                api_key.soft_delete()
+            await self.session.commit()
+            invalidate_principal(key_id)
+            if entry is not None:
+                forget_key(entry)
+            return True
+        return False
+
+    async def restore(self, key_id: int) -> bool:
+        api_key = await self.get_by_id(key_id)
+        if api_key and api_key.is_deleted:
+            api_key.restore()
+            entry = _usable_entry(api_key)
+            await self.session.commit()
+            if entry is not None:
+                remember_key(entry)
             return True
         return False
@@ -33,7 +33,7 @@ async def create_api_key(
     service: AuthServiceDep,
 ) -> APIKeyResponse:
     logger.info(f"Creating new API key: {data.name}")
-    api_key = service.create_api_key(data)
+    api_key = await service.create_api_key(data)
     logger.info(f"API key created: id={api_key.id}")
     return api_key
 
@@ -50,7 +50,7 @@ async def get_token(
     data: TokenRequest,
     service: AuthServiceDep,
 ) -> TokenResponse:
-    token = service.generate_token(data.api_key)
+    token = await service.generate_token(data.api_key)
     if token is None:
         logger.warning("Invalid API key used for token request")
         raise HTTPException(
@@ -72,7 +72,7 @@ async def list_api_keys(
     skip: int = 0,
     limit: int = 100,
 ) -> list[APIKeyInfo]:
-    keys = service.get_all_keys(skip=skip, limit=limit)
+    keys = await service.get_all_keys(skip=skip, limit=limit)
     return [
         APIKeyInfo(
             id=key.id,
@@ -99,7 +99,7 @@ async def deactivate_api_key(
     service: AuthServiceDep,
 ) -> MessageResponse:
     logger.info(f"Deactivating API key {key_id}")
-    if not service.deactivate_key(key_id):
+    if not await service.deactivate_key(key_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="API key not found"
         )
@@ -2,7 +2,8 @@
 
 from datetime import timedelta
 
-from src.auth.repository import AuthRepository
+from src.auth.key_filter import filter_false_positives, get_key_filter
+from src.auth.repository import AsyncAuthRepository
 from src.auth.schema import APIKeyCreate, APIKeyResponse, TokenResponse
 from src.config import settings
 from src.core.security import create_access_token
@@ -12,12 +13,12 @@ from src.models import APIKey
 class AuthService:
     """Service for authentication operations."""
 
-    def __init__(self, repo: AuthRepository) -> None:
+    def __init__(self, repo: AsyncAuthRepository) -> None:
         self.repo = repo
 
-    def create_api_key(self, data: APIKeyCreate) -> APIKeyResponse:
+    async def create_api_key(self, data: APIKeyCreate) -> APIKeyResponse:
         """Create a new API key and return it (plain key only returned once)."""
-        api_key, plain_key = self.repo.create_api_key(
+        api_key, plain_key = await self.repo.create_api_key(
             name=data.name, description=data.description
         )
         return APIKeyResponse(
@@ -28,9 +29,19 @@ class AuthService:
             is_active=api_key.is_active,
         )
 
-    def generate_token(self, api_key: str) -> TokenResponse | None:
+    async def _validate(self, api_key: str) -> APIKey | None:
+        # Keys the filter rules out never reach the database or bcrypt
+        key_filter = get_key_filter()
+        if key_filter is not None and await key_filter.rejects(api_key):
+            return None
+        key_record = await self.repo.validate_key(api_key)
+        if key_record is None and key_filter is not None and key_filter.loaded:
+            filter_false_positives.inc()
+        return key_record
+
+    async def generate_token(self, api_key: str) -> TokenResponse | None:
         """Generate a JWT token for a valid API key."""
-        key_record = self.repo.validate_key(api_key)
+        key_record = await self._validate(api_key)
         if not key_record:
             return None
 
@@ -46,12 +57,12 @@ class AuthService:
             expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
         )
 
-    def validate_api_key(self, api_key: str) -> APIKey | None:
+    async def validate_api_key(self, api_key: str) -> APIKey | None:
         """Validate an API key and return the record if valid."""
-        return self.repo.validate_key(api_key)
+        return await self._validate(api_key)
 
-    def get_all_keys(self, skip: int = 0, limit: int = 100) -> list[APIKey]:
-        return self.repo.get_all(skip=skip, limit=limit)
+    async def get_all_keys(self, skip: int = 0, limit: int = 100) -> list[APIKey]:
+        return await self.repo.get_all(skip=skip, limit=limit)
 
-    def deactivate_key(self, key_id: int) -> bool:
-        return self.repo.deactivate(key_id)
+    async def deactivate_key(self, key_id: int) -> bool:
+        return await self.repo.deactivate(key_id)
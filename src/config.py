@@ -7,6 +7,13 @@ from typing import Any, Literal
 from fastapi.security import HTTPBearer
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Async drivers selectable through DATABASE_URL, mapped to their sync twin
+# (used by Alembic, init_db and other blocking callers)
+ASYNC_DATABASE_DRIVERS = {
+    "sqlite+aiosqlite": "sqlite",
+    "postgresql+asyncpg": "postgresql",
+}
+
 
 class Config(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -25,12 +32,56 @@ class Config(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(
         os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
     )
+    # HMAC-SHA256 key for stored API key digests (empty = SECRET_KEY);
+    # changing it invalidates every key already issued
+    API_KEY_HMAC_SECRET: str = os.getenv("API_KEY_HMAC_SECRET", "")
 
-    # Database
+    # Database (sqlite+aiosqlite:// or postgresql+asyncpg:// selects async I/O)
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./app.db")
 
-    # Rate Limiting
+    # SQLite pragmas applied to every connection of a file database
+    # (a negative cache size is in KiB)
+    SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_CACHE_SIZE: int = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+
+    # Connection pool (file SQLite and server databases); pre-ping and
+    # recycle only apply to server databases, -1 disables recycling
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT_SECONDS: float = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_POOL_RECYCLE_SECONDS: int = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+
+    # Rate Limiting: memory:// counts per worker; sqlite:///rate_limits.db
+    # shares one sliding-window counter per key between a host's workers
     RATE_LIMIT_PER_MINUTE: int = int(os.getenv("RATE_LIMIT_PER_MINUTE", "100"))
+    RATE_LIMIT_STORAGE_URI: str = os.getenv("RATE_LIMIT_STORAGE_URI", "memory://")
+    RATE_LIMIT_STRATEGY: Literal[
+        "sliding-window-counter", "fixed-window", "moving-window"
+    ] = os.getenv("RATE_LIMIT_STRATEGY", "sliding-window-counter")
+    # api_key: authenticated requests are limited per API key, others per IP
+    RATE_LIMIT_KEY: Literal["api_key", "ip"] = os.getenv("RATE_LIMIT_KEY", "api_key")
+
+    # Per-API-key prediction quotas: a token bucket of QUOTA_BURST_UNITS
+    # refilled at QUOTA_UNITS_PER_SECOND, charged one unit per row scored
+    # (streamed uploads also per QUOTA_STREAM_BYTES_PER_UNIT bytes), plus at
+    # most QUOTA_MAX_CONCURRENT requests in flight. Storage URIs as for rate
+    # limits; the sqlite:// default shares the buckets between workers, while
+    # memory:// gives each worker its own
+    QUOTA_ENABLED: bool = os.getenv("QUOTA_ENABLED", "true").lower() == "true"
+    QUOTA_STORAGE_URI: str = os.getenv("QUOTA_STORAGE_URI", "sqlite:///rate_limits.db")
+    QUOTA_BURST_UNITS: float = float(os.getenv("QUOTA_BURST_UNITS", "1000"))
+    QUOTA_UNITS_PER_SECOND: float = float(os.getenv("QUOTA_UNITS_PER_SECOND", "50"))
+    QUOTA_STREAM_BYTES_PER_UNIT: int = int(
+        os.getenv("QUOTA_STREAM_BYTES_PER_UNIT", "65536")
+    )
+    QUOTA_MAX_CONCURRENT: int = int(os.getenv("QUOTA_MAX_CONCURRENT", "4"))
+    # Held slots are renewed every third of this; a crashed worker's slots
+    # are freed after it
+    QUOTA_LEASE_SECONDS: float = float(os.getenv("QUOTA_LEASE_SECONDS", "300"))
 
     # API Settings
     API_V1_PREFIX: str = os.getenv("API_V1_PREFIX", "/api/v1")
@@ -39,6 +90,116 @@ class Config(BaseSettings):
 
     # ML Model
     MODEL_PATH: str = os.getenv("MODEL_PATH", "model.joblib")
+    COMPILED_FOREST_ENABLED: bool = (
+        os.getenv("COMPILED_FOREST_ENABLED", "true").lower() == "true"
+    )
+    MODEL_RELOAD_POLL_SECONDS: float = float(
+        os.getenv("MODEL_RELOAD_POLL_SECONDS", "5")
+    )  # 0 disables watching MODEL_PATH
+    # Synthetic requests sent through the prediction path before readiness
+    WARMUP_REQUESTS: int = int(os.getenv("WARMUP_REQUESTS", "3"))
+
+    # Admin API (disabled while empty)
+    ADMIN_TOKEN: str = os.getenv("ADMIN_TOKEN", "")
+
+    # Micro-batching of concurrent single predictions
+    MICRO_BATCH_ENABLED: bool = (
+        os.getenv("MICRO_BATCH_ENABLED", "true").lower() == "true"
+    )
+    MICRO_BATCH_MAX_SIZE: int = int(os.getenv("MICRO_BATCH_MAX_SIZE", "64"))
+    MICRO_BATCH_MAX_WAIT_MS: float = float(os.getenv("MICRO_BATCH_MAX_WAIT_MS", "2"))
+
+    # Executors for blocking work (inference and database I/O)
+    INFERENCE_THREADS: int = int(
+        os.getenv("INFERENCE_THREADS", str(min(4, os.cpu_count() or 1)))
+    )
+    INFERENCE_QUEUE_SIZE: int = int(os.getenv("INFERENCE_QUEUE_SIZE", "256"))
+    INFERENCE_BACKEND: Literal["thread", "process"] = os.getenv(
+        "INFERENCE_BACKEND", "thread"
+    )
+    INFERENCE_PROCESSES: int = int(os.getenv("INFERENCE_PROCESSES", "0"))  # 0 = CPUs
+    MODEL_MMAP_DIR: str = os.getenv("MODEL_MMAP_DIR", ".model_cache")
+    DB_THREADS: int = int(os.getenv("DB_THREADS", "8"))
+    DB_QUEUE_SIZE: int = int(os.getenv("DB_QUEUE_SIZE", "1024"))
+
+    # Prediction result cache
+    PREDICTION_CACHE_ENABLED: bool = (
+        os.getenv("PREDICTION_CACHE_ENABLED", "true").lower() == "true"
+    )
+    PREDICTION_CACHE_MAX_BYTES: int = int(
+        os.getenv("PREDICTION_CACHE_MAX_BYTES", str(32 * 1024 * 1024))
+    )
+    PREDICTION_CACHE_TTL_SECONDS: float = float(
+        os.getenv("PREDICTION_CACHE_TTL_SECONDS", "3600")
+    )
+
+    # Authenticated-principal cache for get_current_user; deactivating or
+    # deleting a key invalidates it in-process, other workers after the TTL
+    PRINCIPAL_CACHE_ENABLED: bool = (
+        os.getenv("PRINCIPAL_CACHE_ENABLED", "true").lower() == "true"
+    )
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = int(
+        os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000")
+    )
+    PRINCIPAL_CACHE_TTL_SECONDS: float = float(
+        os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "30")
+    )
+
+    # Counting Bloom filter of usable API keys: /auth/token rejects keys that
+    # cannot exist without a key lookup. Misses re-check whether api_keys
+    # changed (one indexed query per API_KEY_FILTER_STALE_CHECK_MS) and
+    # rebuild if so; the periodic refresh (0 = never) only drops stale entries
+    API_KEY_FILTER_ENABLED: bool = (
+        os.getenv("API_KEY_FILTER_ENABLED", "true").lower() == "true"
+    )
+    API_KEY_FILTER_CAPACITY: int = int(os.getenv("API_KEY_FILTER_CAPACITY", "100000"))
+    API_KEY_FILTER_ERROR_RATE: float = float(
+        os.getenv("API_KEY_FILTER_ERROR_RATE", "0.001")
+    )
+    API_KEY_FILTER_REFRESH_SECONDS: float = float(
+        os.getenv("API_KEY_FILTER_REFRESH_SECONDS", "0")
+    )
+    # A miss reads the api_keys version at most this often; keys created by
+    # other workers can be rejected for up to this long
+    API_KEY_FILTER_STALE_CHECK_MS: int = int(
+        os.getenv("API_KEY_FILTER_STALE_CHECK_MS", "1000")
+    )
+
+    # Write-behind prediction audit logs (queued and bulk-inserted off the
+    # request path); block | drop | spill when the queue is full
+    LOG_WRITE_BEHIND_ENABLED: bool = (
+        os.getenv("LOG_WRITE_BEHIND_ENABLED", "false").lower() == "true"
+    )
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    LOG_FLUSH_ROWS: int = int(os.getenv("LOG_FLUSH_ROWS", "500"))
+    LOG_FLUSH_INTERVAL_MS: float = float(os.getenv("LOG_FLUSH_INTERVAL_MS", "200"))
+    LOG_QUEUE_FULL_POLICY: Literal["block", "drop", "spill"] = os.getenv(
+        "LOG_QUEUE_FULL_POLICY", "block"
+    )
+    LOG_QUEUE_BLOCK_TIMEOUT_MS: float = float(
+        os.getenv("LOG_QUEUE_BLOCK_TIMEOUT_MS", "1000")
+    )
+    LOG_SPILL_PATH: str = os.getenv("LOG_SPILL_PATH", "prediction_logs.spill.ndjson")
+
+    # Retention: logs older than this many days are moved to gzip NDJSON
+    # archives (one file per UTC day) and deleted; 0 keeps logs forever
+    LOG_RETENTION_DAYS: int = int(os.getenv("LOG_RETENTION_DAYS", "0"))
+    LOG_ARCHIVE_DIR: str = os.getenv("LOG_ARCHIVE_DIR", "log_archive")
+    LOG_RETENTION_CHUNK_ROWS: int = int(os.getenv("LOG_RETENTION_CHUNK_ROWS", "5000"))
+    LOG_RETENTION_INTERVAL_SECONDS: float = float(
+        os.getenv("LOG_RETENTION_INTERVAL_SECONDS", "3600")
+    )
+
+    # Export (/logs/export and python -m src.logs.export): rows fetched from
+    # the streaming cursor and serialized per chunk
+    LOG_EXPORT_CHUNK_ROWS: int = int(os.getenv("LOG_EXPORT_CHUNK_ROWS", "1000"))
+
+    # Streaming bulk scoring (/predict/stream)
+    STREAM_CHUNK_ROWS: int = int(os.getenv("STREAM_CHUNK_ROWS", "1000"))
+    STREAM_MAX_LINE_BYTES: int = int(os.getenv("STREAM_MAX_LINE_BYTES", "65536"))
+    STREAM_SPOOL_MAX_BYTES: int = int(
+        os.getenv("STREAM_SPOOL_MAX_BYTES", str(8 * 1024 * 1024))
+    )
 
     # CORS
     CORS_ALLOWED_ORIGINS: str = os.getenv("CORS_ALLOWED_ORIGINS", "*")
@@ -64,6 +225,23 @@ class Config(BaseSettings):
     def is_testing(self) -> bool:
         return self.ENVIRONMENT == "testing"
 
+    @property
+    def database_is_async(self) -> bool:
+        return self.DATABASE_URL.split("://", 1)[0] in ASYNC_DATABASE_DRIVERS
+
+    @property
+    def sync_database_url(self) -> str:
+        """DATABASE_URL with an async driver swapped for its sync equivalent."""
+        scheme, sep, rest = self.DATABASE_URL.partition("://")
+        return ASYNC_DATABASE_DRIVERS.get(scheme, scheme) + sep + rest
+
+    @property
+    def inference_concurrency(self) -> int:
+        """Number of inference calls that can run in parallel."""
+        if self.INFERENCE_BACKEND == "process":
+            return self.INFERENCE_PROCESSES or os.cpu_count() or 1
+        return self.INFERENCE_THREADS
+
     @property
     def cors_origins(self) -> list[str]:
         if self.CORS_ALLOWED_ORIGINS == "*":
@@ -114,6 +292,7 @@ Authorization: Bearer <your_token>
         {"name": "Authentication", "description": "API key and token management"},
         {"name": "Predictions", "description": "House price predictions"},
         {"name": "Prediction Logs", "description": "Prediction audit trail"},
+        {"name": "Admin", "description": "Operational controls (X-Admin-Token)"},
     ],
 }
 
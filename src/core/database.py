@@ -1,12 +1,15 @@
 """Database configuration and session management."""
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Generator
 from typing import Any
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
 from src.config import settings
+from src.core.engine_profiles import apply_profile, engine_options
+from src.core.executors import get_db_executor
 
 
 class Base(DeclarativeBase):
@@ -16,13 +19,31 @@ class Base(DeclarativeBase):
 
 
 engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False},  # Required for SQLite
-    echo=False,
+    settings.sync_database_url, echo=False, **engine_options(settings.sync_database_url)
 )
+apply_profile(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Only created when DATABASE_URL names an async driver
+async_engine = (
+    create_async_engine(
+        settings.DATABASE_URL,
+        echo=False,
+        **engine_options(settings.DATABASE_URL, is_async=True),
+    )
+    if settings.database_is_async
+    else None
+)
+if async_engine is not None:
+    apply_profile(async_engine.sync_engine)
+
+AsyncSessionLocal = (
+    async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    if async_engine is not None
+    else None
+)
+
 
 def init_db() -> None:
     """Create all database tables."""
@@ -36,3 +57,42 @@ def get_db() -> Generator[Session, Any, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency that provides an async database session."""
+    if AsyncSessionLocal is None:
+        raise RuntimeError("DATABASE_URL does not use an async driver")
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+class ThreadedRepository:
+    """Async facade over a sync repository.
+
+    Every method call runs on the bounded db executor, so routes written
+    against the async repositories also work on a sync engine without
+    blocking the event loop. The session is closed after each call; the
+    repositories commit per call and return fully loaded objects.
+    """
+
+    def __init__(self, repo: Any) -> None:
+        self._repo = repo
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._repo, name)
+        if not callable(attr):
+            return attr
+
+        def call_and_release(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                # Hand the connection back before the request awaits again,
+                # so requests cannot hold the pool while db threads wait on it
+                self._repo.session.close()
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return await get_db_executor().run(call_and_release, *args, **kwargs)
+
+        return call
@@ -0,0 +1,119 @@
+"""Per-dialect engine profiles: SQLite pragmas, pool sizing and pool metrics."""
+
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from src.config import Config, settings
+from src.core.metrics import metrics
+
+_checkout_wait_ms = metrics.histogram(
+    "db_pool_checkout_wait_ms", "Time to obtain a pooled database connection"
+)
+_checkout_timeouts = metrics.counter(
+    "db_pool_checkout_timeouts", "Pool checkouts that gave up after the pool timeout"
+)
+_in_use = metrics.gauge("db_pool_in_use", "Database connections checked out")
+
+
+class _TimedCheckout:
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            _checkout_timeouts.inc()
+            raise
+        finally:
+            _checkout_wait_ms.observe((time.perf_counter() - start) * 1000)
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    """QueuePool that records how long callers wait for a connection."""
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long callers wait for a connection."""
+
+
+def is_sqlite_memory(url: str) -> bool:
+    parsed = make_url(url)
+    database = parsed.database or ""
+    return parsed.get_backend_name() == "sqlite" and (
+        database in ("", ":memory:") or parsed.query.get("mode") == "memory"
+    )
+
+
+def sqlite_pragmas(config: Config = settings) -> dict[str, str | int]:
+    """PRAGMAs run on every new connection to a file-backed SQLite database."""
+    return {
+        "journal_mode": config.SQLITE_JOURNAL_MODE,
+        "synchronous": config.SQLITE_SYNCHRONOUS,
+        "mmap_size": config.SQLITE_MMAP_SIZE,
+        "cache_size": config.SQLITE_CACHE_SIZE,
+        "busy_timeout": config.SQLITE_BUSY_TIMEOUT_MS,
+    }
+
+
+def engine_options(
+    url: str, is_async: bool = False, config: Config = settings
+) -> dict[str, Any]:
+    """Keyword arguments for create_engine / create_async_engine.
+
+    In-memory SQLite keeps SQLAlchemy's default pool, since every new
+    connection would be a new empty database. File SQLite and server
+    databases get a sized, instrumented queue pool; pre-ping and recycling
+    only apply to server databases, where connections can be dropped by
+    the network or the server.
+    """
+    backend = make_url(url).get_backend_name()
+    options: dict[str, Any] = {}
+    if backend == "sqlite":
+        # Sessions are handed between event loop and db executor threads
+        options["connect_args"] = {"check_same_thread": False}
+        if is_sqlite_memory(url):
+            return options
+
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT_SECONDS,
+    )
+    if backend != "sqlite":
+        options.update(
+            pool_pre_ping=config.DB_POOL_PRE_PING,
+            pool_recycle=config.DB_POOL_RECYCLE_SECONDS,
+        )
+    return options
+
+
+def apply_profile(engine: Engine, config: Config = settings) -> None:
+    """Register connect hooks (SQLite pragmas) and pool in-use tracking.
+
+    Pass ``async_engine.sync_engine`` for an async engine.
+    """
+    url = engine.url.render_as_string(hide_password=False)
+    if engine.dialect.name == "sqlite" and not is_sqlite_memory(url):
+        pragmas = sqlite_pragmas(config)
+
+        @event.listens_for(engine, "connect")
+        def set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+            cursor = dbapi_connection.cursor()
+            try:
+                for name, value in pragmas.items():
+                    cursor.execute(f"PRAGMA {name}={value}")
+            finally:
+                cursor.close()
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(*args: Any) -> None:
+        _in_use.inc()
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(*args: Any) -> None:
+        _in_use.dec()
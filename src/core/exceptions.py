@@ -11,3 +11,32 @@ class PredictionError(Exception):
     """Raised when prediction fails."""
 
     pass
+
+
+class ExecutorSaturatedError(Exception):
+    """Raised when a bounded executor cannot accept more work."""
+
+    pass
+
+
+class StreamFormatError(Exception):
+    """Raised when a streamed upload cannot be parsed as the declared format."""
+
+    pass
+
+
+class InvalidCursorError(Exception):
+    """Raised when a pagination cursor cannot be decoded."""
+
+    pass
+
+
+class QuotaExceededError(Exception):
+    """Raised when an API key's prediction quota cannot admit a request."""
+
+    def __init__(
+        self, message: str, retry_after: float, remaining: float | None = None
+    ) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.remaining = remaining
@@ -0,0 +1,124 @@
+"""Bounded thread pools for running blocking work off the event loop."""
+
+import asyncio
+import functools
+import logging
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from src.config import settings
+from src.core.exceptions import ExecutorSaturatedError
+from src.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class BoundedExecutor:
+    """Thread pool that rejects work once ``max_workers + max_queue`` is reached.
+
+    Exposes queue depth, active workers, saturation (active / max_workers) and
+    rejections as ``<name>_executor_*`` metrics.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int) -> None:
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"{name}-worker"
+        )
+        self._pending = 0
+        self._active = 0
+        self._lock = threading.Lock()
+
+        self._queue_depth = metrics.gauge(
+            f"{name}_executor_queue_depth", "Tasks waiting for a worker"
+        )
+        self._active_gauge = metrics.gauge(
+            f"{name}_executor_active", "Tasks currently running"
+        )
+        self._saturation = metrics.gauge(
+            f"{name}_executor_saturation", "Active tasks / max workers"
+        )
+        self._rejected = metrics.counter(
+            f"{name}_executor_rejected", "Tasks rejected because the queue was full"
+        )
+
+    def _update_gauges(self) -> None:
+        self._queue_depth.set(self._pending - self._active)
+        self._active_gauge.set(self._active)
+        self._saturation.set(self._active / self.max_workers)
+
+    def _call(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        with self._lock:
+            self._active += 1
+            self._update_gauges()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._pending -= 1
+                self._update_gauges()
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run ``fn`` on the pool and await its result."""
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._rejected.inc()
+                raise ExecutorSaturatedError(f"{self.name} executor is saturated")
+            self._pending += 1
+            self._update_gauges()
+
+        loop = asyncio.get_running_loop()
+        call = functools.partial(self._call, fn, *args, **kwargs)
+        try:
+            return await loop.run_in_executor(self._pool, call)
+        except RuntimeError:
+            # Pool already shut down: the task never ran, so undo the bookkeeping
+            with self._lock:
+                self._pending -= 1
+                self._update_gauges()
+            raise
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+
+_executors: dict[str, BoundedExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def _get_executor(name: str, max_workers: int, max_queue: int) -> BoundedExecutor:
+    with _executors_lock:
+        executor = _executors.get(name)
+        if executor is None:
+            executor = BoundedExecutor(name, max_workers, max_queue)
+            _executors[name] = executor
+        return executor
+
+
+def get_inference_executor() -> BoundedExecutor:
+    """Executor for CPU-bound model inference."""
+    return _get_executor(
+        "inference", settings.INFERENCE_THREADS, settings.INFERENCE_QUEUE_SIZE
+    )
+
+
+def get_db_executor() -> BoundedExecutor:
+    """Executor for blocking database I/O, kept apart from inference."""
+    return _get_executor("db", settings.DB_THREADS, settings.DB_QUEUE_SIZE)
+
+
+def shutdown_executors() -> None:
+    """Wait for running tasks and release all worker threads."""
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        logger.info(f"Shutting down {executor.name} executor")
+        executor.shutdown(wait=True)
@@ -0,0 +1,214 @@
+"""Token bucket and concurrency lease storage for per-API-key quotas.
+
+``memory://`` keeps state in the process; ``sqlite:///path.db`` keeps it in
+a file shared by every worker on the host, with each check a single atomic
+statement or an immediate transaction.
+"""
+
+import sqlite3
+import threading
+import time
+import uuid
+
+
+def _refilled(
+    tokens: float, updated_at: float, now: float, capacity: float, rate: float
+) -> float:
+    return min(capacity, tokens + max(0.0, now - updated_at) * rate)
+
+
+class MemoryQuotaStore:
+    """Per-process buckets and leases (one worker)."""
+
+    # Only a short in-process lock: safe to call on the event loop
+    blocking = False
+
+    def __init__(self) -> None:
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._leases: dict[str, dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def take(
+        self, key: str, cost: float, need: float, capacity: float, rate: float
+    ) -> tuple[bool, float]:
+        """Refill the bucket, then deduct ``cost`` if it holds at least ``need``.
+
+        Returns (taken, tokens left); the balance goes negative when ``cost``
+        exceeds what the bucket held.
+        """
+        now = time.time()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = _refilled(tokens, updated_at, now, capacity, rate)
+            taken = tokens >= need
+            if taken:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+        return taken, tokens
+
+    def acquire_slot(self, key: str, limit: int, lease_seconds: float) -> str | None:
+        """A lease id while fewer than ``limit`` leases are live, else None."""
+        now = time.time()
+        with self._lock:
+            leases = self._leases.setdefault(key, {})
+            for lease, expires_at in list(leases.items()):
+                if expires_at <= now:
+                    del leases[lease]
+            if len(leases) >= limit:
+                return None
+            lease = uuid.uuid4().hex
+            leases[lease] = now + lease_seconds
+        return lease
+
+    def renew_slot(self, key: str, lease: str, lease_seconds: float) -> bool:
+        """Push a live lease's expiry out; False if it already expired."""
+        now = time.time()
+        with self._lock:
+            leases = self._leases.get(key)
+            if leases is None or leases.get(lease, now) <= now:
+                return False
+            leases[lease] = now + lease_seconds
+        return True
+
+    def release_slot(self, key: str, lease: str) -> None:
+        with self._lock:
+            leases = self._leases.get(key)
+            if leases is not None:
+                leases.pop(lease, None)
+                if not leases:
+                    del self._leases[key]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+            self._leases.clear()
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS quota_buckets (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS quota_leases (
+    key TEXT NOT NULL,
+    lease TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (key, lease)
+) WITHOUT ROWID;
+"""
+
+# Refill and deduct in one statement; no row comes back when the refilled
+# bucket holds less than :need
+_TAKE = """
+INSERT INTO quota_buckets (key, tokens, updated_at)
+VALUES (:key, :capacity - :cost, :now)
+ON CONFLICT (key) DO UPDATE SET
+    tokens = MIN(:capacity, tokens + MAX(0, :now - updated_at) * :rate) - :cost,
+    updated_at = :now
+WHERE MIN(:capacity, tokens + MAX(0, :now - updated_at) * :rate) >= :need
+RETURNING tokens
+"""
+
+
+class SQLiteQuotaStore:
+    """Buckets and leases in a SQLite file shared by a host's workers.
+
+    Leases expire after ``lease_seconds`` so a crashed worker's requests
+    stop counting against the concurrency limit. Calls can wait up to
+    ``busy_timeout_ms`` for the file lock, so they belong on the db executor.
+    """
+
+    blocking = True
+
+    def __init__(self, uri: str, busy_timeout_ms: int = 5000) -> None:
+        self.path = uri.removeprefix("sqlite:///")
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None)
+            conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def take(
+        self, key: str, cost: float, need: float, capacity: float, rate: float
+    ) -> tuple[bool, float]:
+        now = time.time()
+        params = {
+            "key": key,
+            "cost": cost,
+            "need": need,
+            "capacity": capacity,
+            "rate": rate,
+            "now": now,
+        }
+        row = self._conn.execute(_TAKE, params).fetchone()
+        if row is not None:
+            return True, row[0]
+        tokens, updated_at = self._conn.execute(
+            "SELECT tokens, updated_at FROM quota_buckets WHERE key = ?", (key,)
+        ).fetchone()
+        return False, _refilled(tokens, updated_at, now, capacity, rate)
+
+    def acquire_slot(self, key: str, limit: int, lease_seconds: float) -> str | None:
+        now = time.time()
+        conn = self._conn
+        # Count and insert under the write lock, so workers cannot both take
+        # the last slot
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "DELETE FROM quota_leases WHERE key = ? AND expires_at <= ?", (key, now)
+            )
+            (live,) = conn.execute(
+                "SELECT COUNT(*) FROM quota_leases WHERE key = ?", (key,)
+            ).fetchone()
+            lease = None
+            if live < limit:
+                lease = uuid.uuid4().hex
+                conn.execute(
+                    "INSERT INTO quota_leases (key, lease, expires_at) VALUES (?, ?, ?)",
+                    (key, lease, now + lease_seconds),
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return lease
+
+    def renew_slot(self, key: str, lease: str, lease_seconds: float) -> bool:
+        now = time.time()
+        cursor = self._conn.execute(
+            "UPDATE quota_leases SET expires_at = ? "
+            "WHERE key = ? AND lease = ? AND expires_at > ?",
+            (now + lease_seconds, key, lease, now),
+        )
+        return cursor.rowcount == 1
+
+    def release_slot(self, key: str, lease: str) -> None:
+        self._conn.execute(
+            "DELETE FROM quota_leases WHERE key = ? AND lease = ?", (key, lease)
+        )
+
+    def reset(self) -> None:
+        self._conn.execute("DELETE FROM quota_buckets")
+        self._conn.execute("DELETE FROM quota_leases")
+
+
+QuotaStore = MemoryQuotaStore | SQLiteQuotaStore
+
+
+def quota_store_from_uri(uri: str) -> QuotaStore:
+    if uri.startswith("memory://"):
+        return MemoryQuotaStore()
+    if uri.startswith("sqlite:///"):
+        return SQLiteQuotaStore(uri)
+    raise ValueError(f"Unsupported QUOTA_STORAGE_URI: {uri}")
@@ -0,0 +1,173 @@
+"""Cost-weighted per-API-key prediction quotas.
+
+Each key has a token bucket of ``capacity`` units refilled at
+``refill_per_second``, and at most ``max_concurrent`` prediction requests in
+flight. A request is charged one unit per row it scores (plus, for
+streamed uploads, one per ``QUOTA_STREAM_BYTES_PER_UNIT`` bytes read).
+Calls to a blocking store (SQLite) run on the db executor.
+"""
+
+import asyncio
+import logging
+import math
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from typing import Any, TypeVar
+
+from src.config import settings
+from src.core.exceptions import ExecutorSaturatedError, QuotaExceededError
+from src.core.executors import get_db_executor
+from src.core.metrics import metrics
+from src.core.quota_storage import QuotaStore, quota_store_from_uri
+
+units_charged = metrics.counter("quota_units_charged", "Prediction quota units spent")
+quota_rejections = metrics.counter(
+    "quota_rejections", "Prediction requests rejected (429) by quota"
+)
+quota_waits = metrics.counter(
+    "quota_stream_waits", "Times a streamed upload paused for its quota to refill"
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Delay before charging again when the db executor is saturated
+SATURATED_RETRY_SECONDS = 0.05
+
+
+class QuotaManager:
+    """Token buckets and concurrency slots per API key over a QuotaStore."""
+
+    def __init__(
+        self,
+        store: QuotaStore,
+        capacity: float,
+        refill_per_second: float,
+        max_concurrent: int,
+        lease_seconds: float,
+    ) -> None:
+        if capacity <= 0 or refill_per_second <= 0:
+            raise ValueError(
+                "QUOTA_BURST_UNITS and QUOTA_UNITS_PER_SECOND must be positive"
+            )
+        self.store = store
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.max_concurrent = max_concurrent
+        self.lease_seconds = lease_seconds
+
+    async def _call(self, fn: Callable[..., T], *args: Any) -> T:
+        if self.store.blocking:
+            return await get_db_executor().run(fn, *args)
+        return fn(*args)
+
+    async def take(self, key_id: int, cost: float) -> float:
+        """Charge ``cost`` units now or raise QuotaExceededError.
+
+        A cost above ``capacity`` is admitted once the bucket is full and
+        leaves it in debt. Returns the units left.
+        """
+        need = min(cost, self.capacity)
+        taken, tokens = await self._call(
+            self.store.take,
+            f"api_key:{key_id}",
+            cost,
+            need,
+            self.capacity,
+            self.refill_per_second,
+        )
+        if not taken:
+            quota_rejections.inc()
+            raise QuotaExceededError(
+                "Prediction quota exhausted",
+                retry_after=(need - tokens) / self.refill_per_second,
+                remaining=tokens,
+            )
+        units_charged.inc(cost)
+        return tokens
+
+    async def consume(self, key_id: int, cost: float) -> float:
+        """Charge ``cost`` units, waiting for the bucket to refill if needed."""
+        while True:
+            try:
+                return await self.take(key_id, cost)
+            except QuotaExceededError as e:
+                quota_waits.inc()
+                await asyncio.sleep(e.retry_after)
+            except ExecutorSaturatedError:
+                await asyncio.sleep(SATURATED_RETRY_SECONDS)
+
+    async def _release(self, key: str, lease: str) -> None:
+        # A leaked lease would hold the slot until it expires, so a busy
+        # executor is waited out rather than blocking the loop on the store
+        while True:
+            try:
+                return await self._call(self.store.release_slot, key, lease)
+            except ExecutorSaturatedError:
+                await asyncio.sleep(SATURATED_RETRY_SECONDS)
+
+    async def _heartbeat(self, key: str, lease: str) -> None:
+        # Renews well before expiry, so a long request keeps its slot
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                renewed = await self._call(
+                    self.store.renew_slot, key, lease, self.lease_seconds
+                )
+            except ExecutorSaturatedError:
+                continue
+            if not renewed:
+                logger.warning(f"Quota slot lease for {key} expired while in use")
+                return
+
+    @asynccontextmanager
+    async def slot(self, key_id: int) -> AsyncIterator[None]:
+        """Hold one of the key's concurrent request slots.
+
+        The lease is renewed every third of ``lease_seconds`` while held; it
+        only expires if this worker dies.
+        """
+        key = f"api_key:{key_id}"
+        lease = await self._call(
+            self.store.acquire_slot, key, self.max_concurrent, self.lease_seconds
+        )
+        if lease is None:
+            quota_rejections.inc()
+            raise QuotaExceededError(
+                "Too many concurrent prediction requests", retry_after=1
+            )
+        heartbeat = asyncio.get_running_loop().create_task(self._heartbeat(key, lease))
+        try:
+            yield
+        finally:
+            heartbeat.cancel()
+            await self._release(key, lease)
+
+    def headers(self, remaining: float | None) -> dict[str, str]:
+        headers = {"X-Quota-Limit": str(math.floor(self.capacity))}
+        if remaining is not None:
+            headers["X-Quota-Remaining"] = str(max(0, math.floor(remaining)))
+        return headers
+
+    def reset(self) -> None:
+        self.store.reset()
+
+
+_manager: QuotaManager | None = None
+
+
+def get_quota_manager() -> QuotaManager | None:
+    """Return the process-wide quota manager, or None when quotas are off."""
+    global _manager
+    if not settings.QUOTA_ENABLED:
+        return None
+    if _manager is None:
+        _manager = QuotaManager(
+            store=quota_store_from_uri(settings.QUOTA_STORAGE_URI),
+            capacity=settings.QUOTA_BURST_UNITS,
+            refill_per_second=settings.QUOTA_UNITS_PER_SECOND,
+            max_concurrent=settings.QUOTA_MAX_CONCURRENT,
+            lease_seconds=settings.QUOTA_LEASE_SECONDS,
+        )
+    return _manager
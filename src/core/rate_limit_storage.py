@@ -0,0 +1,178 @@
+"""SQLite rate limit storage shared by every worker on a host.
+
+Registered with ``limits`` under the ``sqlite`` scheme, so the slowapi
+limiter selects it with ``RATE_LIMIT_STORAGE_URI=sqlite:///rate_limits.db``
+(``sqlite:////abs/path.db`` for an absolute path). Implements the limits
+5.x storage interface; requirements.txt pins that major version.
+"""
+
+import sqlite3
+import threading
+import time
+
+from limits.storage import SlidingWindowCounterSupport, Storage
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_limits (
+    key TEXT PRIMARY KEY,
+    bucket INTEGER NOT NULL,
+    current INTEGER NOT NULL,
+    previous INTEGER NOT NULL,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+# One statement, so concurrent workers cannot interleave the read, the
+# window roll-over and the increment. The row rolls over to bucket :window
+# (current becomes previous, or both reset after an idle window), and the
+# update only happens while the weighted count leaves room for :amount;
+# RETURNING yields no row when it does not.
+_ACQUIRE = """
+INSERT INTO rate_limits (key, bucket, current, previous, expires_at)
+VALUES (:key, :window, :amount, 0, :expires_at)
+ON CONFLICT (key) DO UPDATE SET
+    previous = CASE bucket WHEN :window THEN previous
+        WHEN :window - 1 THEN current ELSE 0 END,
+    current = CASE bucket WHEN :window THEN current ELSE 0 END + :amount,
+    bucket = :window,
+    expires_at = :expires_at
+WHERE CASE bucket WHEN :window THEN previous WHEN :window - 1 THEN current
+        ELSE 0 END * :weight
+    + CASE bucket WHEN :window THEN current ELSE 0 END
+    + :amount <= :limit
+RETURNING current
+"""
+
+_INCR = """
+INSERT INTO rate_limits (key, bucket, current, previous, expires_at)
+VALUES (:key, 0, :amount, 0, :expires_at)
+ON CONFLICT (key) DO UPDATE SET
+    current = CASE WHEN expires_at <= :now THEN 0 ELSE current END + :amount,
+    expires_at = CASE WHEN expires_at <= :now THEN :expires_at ELSE expires_at END
+RETURNING current
+"""
+
+
+class SQLiteStorage(Storage, SlidingWindowCounterSupport):
+    """Fixed and sliding window counters in one SQLite file.
+
+    Each limit key is one row: for the sliding window counter, the counts of
+    the current and previous windows and the current window's index. Rows
+    whose windows have both passed are deleted every ``purge_seconds``. The
+    file runs in WAL mode without fsync; counters are not worth durability.
+    """
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(
+        self,
+        uri: str | None = None,
+        wrap_exceptions: bool = False,
+        busy_timeout_ms: int = 5000,
+        purge_seconds: float = 60.0,
+        **options: float | str | bool,
+    ) -> None:
+        self.path = (uri or "sqlite:///rate_limits.db").removeprefix("sqlite:///")
+        self.busy_timeout_ms = int(busy_timeout_ms)
+        self.purge_seconds = float(purge_seconds)
+        self._local = threading.local()
+        self._next_purge = 0.0
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self) -> type[Exception]:
+        return sqlite3.Error
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # One autocommit connection per thread; every statement is atomic
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None)
+            conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def _purge(self, now: float) -> None:
+        if now >= self._next_purge:
+            self._next_purge = now + self.purge_seconds
+            self._conn.execute("DELETE FROM rate_limits WHERE expires_at <= ?", (now,))
+
+    def _row(self, key: str) -> tuple[int, int, int, float] | None:
+        return self._conn.execute(
+            "SELECT bucket, current, previous, expires_at FROM rate_limits "
+            "WHERE key = ?",
+            (key,),
+        ).fetchone()
+
+    # Fixed window (``incr``/``get``/``get_expiry``)
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        now = time.time()
+        self._purge(now)
+        params = {"key": key, "amount": amount, "now": now, "expires_at": now + expiry}
+        return self._conn.execute(_INCR, params).fetchone()[0]
+
+    def get(self, key: str) -> int:
+        row = self._row(key)
+        if row is None or row[3] <= time.time():
+            return 0
+        return row[1]
+
+    def get_expiry(self, key: str) -> float:
+        row = self._row(key)
+        return row[3] if row is not None else time.time()
+
+    # Sliding window counter
+
+    def acquire_sliding_window_entry(
+        self, key: str, limit: int, expiry: int, amount: int = 1
+    ) -> bool:
+        if amount > limit:
+            return False
+        now = time.time()
+        self._purge(now)
+        window = int(now // expiry)
+        params = {
+            "key": key,
+            "window": window,
+            "amount": amount,
+            "limit": limit,
+            # Share of the previous window still inside the sliding window
+            "weight": 1 - (now % expiry) / expiry,
+            "expires_at": (window + 2) * expiry,
+        }
+        return self._conn.execute(_ACQUIRE, params).fetchone() is not None
+
+    def get_sliding_window(
+        self, key: str, expiry: int
+    ) -> tuple[int, float, int, float]:
+        now = time.time()
+        window = int(now // expiry)
+        previous_ttl = (1 - (now % expiry) / expiry) * expiry
+        current_ttl = previous_ttl + expiry
+        row = self._row(key)
+        if row is None or row[0] < window - 1:
+            return 0, 0.0, 0, current_ttl
+        row_window, current, previous, _ = row
+        if row_window == window - 1:
+            previous, current = current, 0
+        return previous, previous_ttl if previous else 0.0, current, current_ttl
+
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        self.clear(key)
+
+    # Maintenance
+
+    def check(self) -> bool:
+        self._conn.execute("SELECT 1").fetchone()
+        return True
+
+    def reset(self) -> int | None:
+        return self._conn.execute("DELETE FROM rate_limits").rowcount
+
+    def clear(self, key: str) -> None:
+        self._conn.execute("DELETE FROM rate_limits WHERE key = ?", (key,))
@@ -2,10 +2,38 @@
 
 from slowapi import Limiter
 from slowapi.util import get_remote_address
+from starlette.requests import Request
 
+import src.core.rate_limit_storage  # noqa: F401  (registers sqlite://)
+from src.auth.cache import get_principal_cache
 from src.config import settings
+from src.core.security import decode_access_token
 
-limiter = Limiter(key_func=get_remote_address)
+
+def rate_limit_key(request: Request) -> str:
+    """Limit by the bearer token's API key id, else by client IP.
+
+    Only a valid token counts; an invalid or missing one is limited by IP
+    (and rejected by authentication). Limits are checked after the route's
+    dependencies ran, so the token is usually in the principal cache already.
+    """
+    if settings.RATE_LIMIT_KEY == "api_key":
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and token:
+            cache = get_principal_cache()
+            if cache is not None and (key_id := cache.token_key_id(token)) is not None:
+                return f"key:{key_id}"
+            payload = decode_access_token(token)
+            if payload is not None and payload.get("sub"):
+                return f"key:{payload['sub']}"
+    return get_remote_address(request)
+
+
+limiter = Limiter(
+    key_func=rate_limit_key,
+    storage_uri=settings.RATE_LIMIT_STORAGE_URI,
+    strategy=settings.RATE_LIMIT_STRATEGY,
+)
 
 
 def get_rate_limit_string() -> str:
@@ -1,5 +1,7 @@
 """Security utilities for JWT tokens and password hashing."""
 
+import hashlib
+import hmac
 import secrets
 from datetime import UTC, datetime, timedelta
 
@@ -47,3 +49,13 @@ def decode_access_token(token: str) -> dict | None:
 def generate_api_key() -> str:
     """Generate a secure random 64-character hex API key."""
     return secrets.token_hex(32)
+
+
+def api_key_digest(plain_key: str) -> str:
+    """HMAC-SHA256 hex digest an API key is stored and looked up by.
+
+    The keys are 256-bit random values, so a fast keyed hash is as hard to
+    brute-force as bcrypt; the HMAC secret keeps a leaked table unusable.
+    """
+    secret = settings.API_KEY_HMAC_SECRET or settings.SECRET_KEY
+    return hmac.new(secret.encode(), plain_key.encode(), hashlib.sha256).hexdigest()
@@ -0,0 +1,61 @@
+"""Startup timing breakdown and readiness state."""
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from src import IMPORT_STARTED
+
+
+class StartupReport:
+    """Per-phase startup durations plus whether the app may take traffic.
+
+    The app only reports ready once the lifespan hook has loaded the model
+    and finished warm-up, so load balancers never route a cold first request.
+    """
+
+    def __init__(self, import_started: float | None = None) -> None:
+        self._import_started = import_started
+        self.phases: dict[str, float] = {}
+        self.ready = False
+        self.warmup_error: str | None = None
+
+    def begin(self) -> None:
+        """Start a new startup sequence, recording time spent importing."""
+        now = time.perf_counter()
+        self.ready = False
+        self.warmup_error = None
+        self.phases = {}
+        if self._import_started is not None:
+            self.phases["imports"] = (now - self._import_started) * 1000
+            # Only the first startup in a process pays for imports
+            self._import_started = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as one startup phase (milliseconds)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = (time.perf_counter() - start) * 1000
+
+    @property
+    def total_ms(self) -> float:
+        return sum(self.phases.values())
+
+    def summary(self) -> str:
+        parts = ", ".join(f"{name}={ms:.0f}ms" for name, ms in self.phases.items())
+        return f"{self.total_ms:.0f}ms ({parts})"
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "total_ms": round(self.total_ms, 1),
+            "phases_ms": {name: round(ms, 1) for name, ms in self.phases.items()},
+            "warmup_error": self.warmup_error,
+        }
+
+
+startup_report = StartupReport(IMPORT_STARTED)
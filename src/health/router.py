@@ -2,13 +2,16 @@
 
 import logging
 from datetime import UTC, datetime
+from typing import Any
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Response, status
 from pydantic import BaseModel, Field
 from sqlalchemy import text
 
 from src.config import settings
 from src.core.database import engine
+from src.core.metrics import metrics
+from src.core.startup import startup_report
 from src.ml.model import load_model
 
 logger = logging.getLogger(__name__)
@@ -28,6 +31,20 @@ class DetailedHealthResponse(HealthResponse):
     )
 
 
+class ReadinessResponse(BaseModel):
+    status: str = Field(..., examples=["ready"])
+    timestamp: datetime
+
+
+class StartupReportResponse(BaseModel):
+    ready: bool
+    total_ms: float = Field(..., examples=[2140.5])
+    phases_ms: dict[str, float] = Field(
+        ..., examples=[{"imports": 1650.2, "model_load": 410.8, "warmup": 79.5}]
+    )
+    warmup_error: str | None = None
+
+
 @router.get("/health", response_model=HealthResponse, status_code=status.HTTP_200_OK)
 async def health_check() -> HealthResponse:
     return HealthResponse(
@@ -73,3 +90,30 @@ async def detailed_health_check() -> DetailedHealthResponse:
         environment=settings.ENVIRONMENT,
         components=components,
     )
+
+
+@router.get(
+    "/health/ready",
+    response_model=ReadinessResponse,
+    responses={503: {"model": ReadinessResponse}},
+)
+async def readiness_check(response: Response) -> ReadinessResponse:
+    """Ready only once the model is loaded and startup warm-up has finished."""
+    if not startup_report.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return ReadinessResponse(
+        status="ready" if startup_report.ready else "starting",
+        timestamp=datetime.now(UTC),
+    )
+
+
+@router.get("/health/startup", response_model=StartupReportResponse)
+async def startup_timing() -> StartupReportResponse:
+    """Cold-start timing breakdown of the last startup, in milliseconds."""
+    return StartupReportResponse(**startup_report.snapshot())
+
+
+@router.get("/health/metrics", status_code=status.HTTP_200_OK)
+async def metrics_snapshot() -> dict[str, dict[str, Any]]:
+    """Current values of in-process performance metrics."""
+    return metrics.snapshot()
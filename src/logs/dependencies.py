@@ -1,20 +1,60 @@
 """Prediction log dependencies for FastAPI."""
 
+from collections.abc import Callable
 from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src.core.database import get_db
-from src.logs.repository import PredictionLogRepository
+from src.config import settings
+from src.core.database import (
+    AsyncSessionLocal,
+    SessionLocal,
+    ThreadedRepository,
+    get_async_db,
+    get_db,
+)
+from src.logs.repository import AsyncPredictionLogRepository, PredictionLogRepository
 
 DbSessionDep = Annotated[Session, Depends(get_db)]
+AsyncDbSessionDep = Annotated[AsyncSession, Depends(get_async_db)]
 
 
-def get_prediction_log_repo(session: DbSessionDep) -> PredictionLogRepository:
-    return PredictionLogRepository(session)
+def get_prediction_log_repo(session: DbSessionDep) -> AsyncPredictionLogRepository:
+    """Sync engine: run PredictionLogRepository on the db executor."""
+    return ThreadedRepository(PredictionLogRepository(session))
+
+
+def get_async_prediction_log_repo(
+    session: AsyncDbSessionDep,
+) -> AsyncPredictionLogRepository:
+    return AsyncPredictionLogRepository(session)
 
 
 PredictionLogRepoDep = Annotated[
-    PredictionLogRepository, Depends(get_prediction_log_repo)
+    AsyncPredictionLogRepository,
+    Depends(
+        get_async_prediction_log_repo
+        if settings.database_is_async
+        else get_prediction_log_repo
+    ),
+]
+
+
+def get_export_session_factory(
+    request: Request,
+) -> Callable[[], Session | AsyncSession]:
+    """Session factory for streaming routes, whose body opens its own session.
+
+    FastAPI closes yield dependencies such as get_db before a streamed body
+    is sent. Tests that override get_db set ``app.state.session_factory``.
+    """
+    if settings.database_is_async:
+        return AsyncSessionLocal
+    return getattr(request.app.state, "session_factory", SessionLocal)
+
+
+ExportSessionFactoryDep = Annotated[
+    Callable[[], Session | AsyncSession], Depends(get_export_session_factory)
 ]
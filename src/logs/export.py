@@ -0,0 +1,249 @@
+"""Streaming export of prediction logs as NDJSON, CSV or Parquet.
+
+Rows are read through a streaming cursor ``LOG_EXPORT_CHUNK_ROWS`` at a time
+as plain Core rows (no ORM objects or response models), in the same shape as
+the /logs responses, and each chunk is serialized on its own, so memory stays
+flat however many rows match.
+
+Usage:
+    python -m src.logs.export OUTPUT [--format ndjson|csv|parquet]
+                              [--api-key-id N] [--from ISO] [--to ISO]
+
+Parquet output needs pyarrow (CLI only).
+"""
+
+import argparse
+import csv
+import io
+import json
+import sys
+from collections.abc import AsyncIterator, Callable, Iterator, Sequence
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Literal
+
+from sqlalchemy import RowMapping, Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.core.database import SessionLocal
+from src.core.executors import get_db_executor
+from src.logs.repository import log_record, log_view_stmt, prediction_logs
+
+ExportFormat = Literal["ndjson", "csv", "parquet"]
+
+EXPORT_COLUMNS = [
+    "id",
+    "api_key_id",
+    "created_at",
+    "request_type",
+    "batch_id",
+    "model_version",
+    "predicted_price",
+    "response_time_ms",
+    "input_features",
+]
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(UTC).replace(tzinfo=None)
+
+
+def export_stmt(
+    api_key_id: int | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> Select:
+    """Logs in id order, optionally for one key and an inclusive time range."""
+    stmt = log_view_stmt()
+    if api_key_id is not None:
+        stmt = stmt.where(prediction_logs.c.api_key_id == api_key_id)
+    if created_from is not None:
+        stmt = stmt.where(prediction_logs.c.created_at >= _naive_utc(created_from))
+    if created_to is not None:
+        stmt = stmt.where(prediction_logs.c.created_at <= _naive_utc(created_to))
+    return stmt.order_by(prediction_logs.c.id)
+
+
+def _plain(row: RowMapping) -> dict[str, Any]:
+    record = log_record(row)
+    values = {}
+    for name in EXPORT_COLUMNS:
+        value = record[name]
+        values[name] = value.isoformat() if isinstance(value, datetime) else value
+    return values
+
+
+def _ndjson_encoder() -> Callable[[Sequence[RowMapping]], str]:
+    def encode(rows: Sequence[RowMapping]) -> str:
+        return "".join(json.dumps(_plain(row)) + "\n" for row in rows)
+
+    return encode
+
+
+def _csv_encoder() -> Callable[[Sequence[RowMapping]], str]:
+    header_written = False
+
+    def encode(rows: Sequence[RowMapping]) -> str:
+        nonlocal header_written
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        if not header_written:
+            writer.writerow(EXPORT_COLUMNS)
+            header_written = True
+        for row in rows:
+            values = _plain(row)
+            values["input_features"] = json.dumps(values["input_features"])
+            writer.writerow(values[name] for name in EXPORT_COLUMNS)
+        return buffer.getvalue()
+
+    return encode
+
+
+def make_encoder(fmt: ExportFormat) -> Callable[[Sequence[RowMapping]], str]:
+    """Serializer for one chunk of rows; CSV writes its header once."""
+    if fmt == "ndjson":
+        return _ndjson_encoder()
+    if fmt == "csv":
+        return _csv_encoder()
+    raise ValueError(f"{fmt} export is not a text format")
+
+
+def iter_partitions(
+    session: Session, stmt: Select, chunk_rows: int
+) -> Iterator[Sequence[RowMapping]]:
+    """Rows from a streaming cursor, ``chunk_rows`` at a time."""
+    result = session.execute(
+        stmt, execution_options={"stream_results": True, "yield_per": chunk_rows}
+    )
+    yield from result.mappings().partitions()
+
+
+async def stream_export(
+    session_factory: Callable[[], Session | AsyncSession],
+    stmt: Select,
+    fmt: ExportFormat,
+    chunk_rows: int,
+) -> AsyncIterator[str]:
+    """Serialized chunks for a StreamingResponse.
+
+    The session is opened here and closed when the body is done, not by a
+    route dependency: FastAPI exits those before a streamed body is sent.
+    A sync session is read on the db executor one chunk at a time.
+    """
+    encode = make_encoder(fmt)
+    session = session_factory()
+    if isinstance(session, AsyncSession):
+        async with session:
+            result = await session.stream(
+                stmt, execution_options={"yield_per": chunk_rows}
+            )
+            async for rows in result.mappings().partitions():
+                yield encode(rows)
+        return
+
+    executor = get_db_executor()
+    try:
+        partitions = iter_partitions(session, stmt, chunk_rows)
+        try:
+            while (rows := await executor.run(next, partitions, None)) is not None:
+                yield encode(rows)
+        finally:
+            await executor.run(partitions.close)
+    finally:
+        await executor.run(session.close)
+
+
+def _write_parquet(partitions: Iterator[Sequence[RowMapping]], output: Path) -> int:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise SystemExit("Parquet export requires pyarrow: pip install pyarrow") from e
+
+    schema = pa.schema(
+        [
+            ("id", pa.int64()),
+            ("api_key_id", pa.int64()),
+            ("created_at", pa.timestamp("us")),
+            ("request_type", pa.string()),
+            ("batch_id", pa.string()),
+            ("model_version", pa.string()),
+            ("predicted_price", pa.float64()),
+            ("response_time_ms", pa.int64()),
+            ("input_features", pa.string()),
+        ]
+    )
+    total = 0
+    with pq.ParquetWriter(output, schema) as writer:
+        for rows in partitions:
+            records = []
+            for row in rows:
+                record = log_record(row)
+                record["input_features"] = json.dumps(record["input_features"])
+                records.append({name: record[name] for name in EXPORT_COLUMNS})
+            writer.write_table(pa.Table.from_pylist(records, schema=schema))
+            total += len(records)
+    return total
+
+
+def export_to_file(
+    output: Path,
+    fmt: ExportFormat,
+    stmt: Select,
+    chunk_rows: int,
+    session_factory: Callable[[], Session] = SessionLocal,
+) -> int:
+    """Write the export to ``output`` (``-`` for stdout); returns the row count."""
+    with session_factory() as session:
+        partitions = iter_partitions(session, stmt, chunk_rows)
+        if fmt == "parquet":
+            return _write_parquet(partitions, output)
+
+        encode = make_encoder(fmt)
+        total = 0
+        out = sys.stdout if str(output) == "-" else open(output, "w", newline="")
+        try:
+            for rows in partitions:
+                out.write(encode(rows))
+                total += len(rows)
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        return total
+
+
+def _format_for(path: Path) -> ExportFormat:
+    suffix = path.suffix.lower()
+    if suffix in (".parquet", ".pq"):
+        return "parquet"
+    return "csv" if suffix == ".csv" else "ndjson"
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Export prediction logs.")
+    parser.add_argument("output", type=Path, help="File path, or - for stdout")
+    parser.add_argument("--format", choices=["ndjson", "csv", "parquet"])
+    parser.add_argument("--api-key-id", type=int, default=None)
+    parser.add_argument("--from", dest="created_from", type=datetime.fromisoformat)
+    parser.add_argument("--to", dest="created_to", type=datetime.fromisoformat)
+    parser.add_argument(
+        "--chunk-rows", type=int, default=settings.LOG_EXPORT_CHUNK_ROWS
+    )
+    args = parser.parse_args(argv)
+
+    fmt = args.format or _format_for(args.output)
+    if fmt == "parquet" and str(args.output) == "-":
+        parser.error("Parquet cannot be written to stdout")
+    stmt = export_stmt(args.api_key_id, args.created_from, args.created_to)
+    total = export_to_file(args.output, fmt, stmt, args.chunk_rows)
+    print(f"Exported {total:,} prediction logs as {fmt}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
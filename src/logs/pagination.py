@@ -0,0 +1,26 @@
+"""Opaque keyset cursors for paging prediction logs."""
+
+import base64
+import json
+from datetime import datetime
+
+from src.core.exceptions import InvalidCursorError
+
+LogPosition = tuple[datetime, int]
+
+
+def encode_cursor(created_at: datetime, log_id: int) -> str:
+    """Cursor pointing just past the log with this ``(created_at, id)``."""
+    payload = json.dumps([created_at.isoformat(), log_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> LogPosition:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, log_id = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(log_id, int):
+            raise TypeError(log_id)
+        return datetime.fromisoformat(created_at), log_id
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
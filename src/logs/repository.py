@@ -1,12 +1,245 @@
 """Repository for prediction log operations."""
 
 import uuid
-from typing import Any
+from datetime import UTC, datetime
+from typing import Any, NamedTuple
 
-from sqlalchemy import func, select
+from sqlalchemy import Insert, RowMapping, Select, case, func, insert, select, tuple_
+from sqlalchemy.engine import Dialect
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from src.models import PredictionLog
+from src.logs.pagination import LogPosition
+from src.logs.stats import (
+    prediction_stats,
+    stats_count_stmt,
+    stats_deltas,
+    update_stats_stmt,
+    upsert_stats_stmt,
+)
+from src.models import PredictionBatch, PredictionLog
+from src.models.prediction_log import FEATURE_COLUMNS
+
+prediction_logs = PredictionLog.__table__
+prediction_batches = PredictionBatch.__table__
+
+
+class BatchInsertResult(NamedTuple):
+    batch_id: str
+    ids: list[int]
+
+
+class LogSearchFilters(NamedTuple):
+    """Optional /logs/search bounds; ``None`` leaves a bound open."""
+
+    min_price: float | None = None
+    max_price: float | None = None
+    ocean_proximity: str | None = None
+    min_latitude: float | None = None
+    max_latitude: float | None = None
+    min_longitude: float | None = None
+    max_longitude: float | None = None
+    created_from: datetime | None = None
+    created_to: datetime | None = None
+
+
+def feature_columns(input_features: dict[str, Any]) -> dict[str, Any]:
+    """Typed feature columns for an input dict; other keys are not stored."""
+    values = {name: input_features.get(name) for name in FEATURE_COLUMNS}
+    ocean_proximity = values["ocean_proximity"]
+    values["ocean_proximity"] = getattr(ocean_proximity, "value", ocean_proximity)
+    return values
+
+
+def _batch_rows(
+    api_key_id: int,
+    predictions: list[tuple[dict[str, Any], float]],
+    prediction_batch_id: int,
+    created_at: datetime,
+) -> list[dict[str, Any]]:
+    # Only per-prediction values; the rest lives on the batch header
+    return [
+        {
+            "api_key_id": api_key_id,
+            "predicted_price": predicted_price,
+            "prediction_batch_id": prediction_batch_id,
+            "created_at": created_at,
+            "updated_at": created_at,
+            **feature_columns(input_features),
+        }
+        for input_features, predicted_price in predictions
+    ]
+
+
+def _batch_headers(rows: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """prediction_batches rows for the batch ids among write-behind rows."""
+    headers: dict[str, dict[str, Any]] = {}
+    for row in rows:
+        batch_id = row.get("batch_id")
+        if batch_id is None:
+            continue
+        header = headers.get(batch_id)
+        if header is None:
+            headers[batch_id] = {
+                "batch_id": batch_id,
+                "api_key_id": row["api_key_id"],
+                "response_time_ms": row.get("response_time_ms"),
+                "model_version": row.get("model_version"),
+                "created_at": row["created_at"],
+            }
+        elif row["created_at"] < header["created_at"]:
+            header["created_at"] = row["created_at"]
+    return headers
+
+
+def _batch_pks_stmt(batch_ids: list[str]) -> Select:
+    return select(prediction_batches.c.batch_id, prediction_batches.c.id).where(
+        prediction_batches.c.batch_id.in_(batch_ids)
+    )
+
+
+def _stored_rows(
+    rows: list[dict[str, Any]], batch_pks: dict[str, int]
+) -> list[dict[str, Any]]:
+    # Write-behind rows carry every field; batch rows keep only their own
+    stored = []
+    for row in rows:
+        batch_pk = batch_pks.get(row.get("batch_id"))
+        stored.append(
+            {
+                "api_key_id": row["api_key_id"],
+                "predicted_price": row["predicted_price"],
+                "prediction_batch_id": batch_pk,
+                "response_time_ms": None if batch_pk else row.get("response_time_ms"),
+                "model_version": None if batch_pk else row.get("model_version"),
+                "created_at": row["created_at"],
+                **feature_columns(row["input_features"]),
+            }
+        )
+    return stored
+
+
+def log_view_stmt() -> Select:
+    """Flat Core rows of every log with its batch fields filled in.
+
+    Turn a row into the API shape with ``log_record``.
+    """
+    return select(
+        prediction_logs.c.id,
+        prediction_logs.c.api_key_id,
+        prediction_logs.c.predicted_price,
+        func.coalesce(
+            prediction_batches.c.response_time_ms, prediction_logs.c.response_time_ms
+        ).label("response_time_ms"),
+        case(
+            (prediction_logs.c.prediction_batch_id.is_(None), "single"),
+            else_="batch",
+        ).label("request_type"),
+        prediction_batches.c.batch_id,
+        func.coalesce(
+            prediction_batches.c.model_version, prediction_logs.c.model_version
+        ).label("model_version"),
+        prediction_logs.c.created_at,
+        prediction_logs.c.updated_at,
+        *(prediction_logs.c[name] for name in FEATURE_COLUMNS),
+    ).select_from(
+        prediction_logs.outerjoin(
+            prediction_batches,
+            prediction_logs.c.prediction_batch_id == prediction_batches.c.id,
+        )
+    )
+
+
+def log_record(row: RowMapping) -> dict[str, Any]:
+    """A ``log_view_stmt`` row with its features gathered into input_features."""
+    record = {key: value for key, value in row.items() if key not in FEATURE_COLUMNS}
+    record["input_features"] = {name: row[name] for name in FEATURE_COLUMNS}
+    return record
+
+
+def _insert_returning_ids(dialect: Dialect) -> Insert | None:
+    # RETURNING with executemany keeps input order only where supported
+    if not dialect.insert_executemany_returning_sort_by_parameter_order:
+        return None
+    return insert(prediction_logs).returning(
+        prediction_logs.c.id, sort_by_parameter_order=True
+    )
+
+
+def _batch_ids_stmt(prediction_batch_id: int) -> Select:
+    return (
+        select(prediction_logs.c.id)
+        .where(prediction_logs.c.prediction_batch_id == prediction_batch_id)
+        .order_by(prediction_logs.c.id)
+    )
+
+
+def _by_api_key_stmt(
+    api_key_id: int, skip: int, limit: int, after: LogPosition | None
+) -> Select:
+    # Newest first; id breaks created_at ties so keyset pages never overlap
+    stmt = select(PredictionLog).where(PredictionLog.api_key_id == api_key_id)
+    if after is not None:
+        # A row-value comparison lets the index seek straight to the cursor
+        stmt = stmt.where(tuple_(PredictionLog.created_at, PredictionLog.id) < after)
+    return (
+        stmt.order_by(PredictionLog.created_at.desc(), PredictionLog.id.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+
+
+def _naive_utc(value: datetime) -> datetime:
+    # Timestamps are stored as naive UTC
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(UTC).replace(tzinfo=None)
+
+
+def _search_stmt(
+    api_key_id: int, filters: LogSearchFilters, limit: int, after: LogPosition | None
+) -> Select:
+    stmt = _by_api_key_stmt(api_key_id, 0, limit, after)
+    if filters.ocean_proximity is not None:
+        stmt = stmt.where(PredictionLog.ocean_proximity == filters.ocean_proximity)
+
+    created_from, created_to = filters.created_from, filters.created_to
+    ranges = [
+        (PredictionLog.predicted_price, filters.min_price, filters.max_price),
+        (PredictionLog.latitude, filters.min_latitude, filters.max_latitude),
+        (PredictionLog.longitude, filters.min_longitude, filters.max_longitude),
+        (
+            PredictionLog.created_at,
+            created_from and _naive_utc(created_from),
+            created_to and _naive_utc(created_to),
+        ),
+    ]
+    for column, low, high in ranges:
+        if low is not None:
+            stmt = stmt.where(column >= low)
+        if high is not None:
+            stmt = stmt.where(column <= high)
+    return stmt
+
+
+def _by_batch_id_stmt(batch_id: str) -> Select:
+    batch_pk = select(PredictionBatch.id).where(PredictionBatch.batch_id == batch_id)
+    return (
+        select(PredictionLog)
+        .where(PredictionLog.prediction_batch_id == batch_pk.scalar_subquery())
+        .order_by(PredictionLog.id)
+    )
+
+
+def _recent_stmt(limit: int) -> Select:
+    return select(PredictionLog).order_by(PredictionLog.created_at.desc()).limit(limit)
+
+
+def _count_stmt(api_key_id: int | None = None) -> Select:
+    stmt = select(func.count(PredictionLog.id))
+    if api_key_id is not None:
+        stmt = stmt.where(PredictionLog.api_key_id == api_key_id)
+    return stmt
 
 
 class PredictionLogRepository:
@@ -21,18 +254,18 @@ class PredictionLogRepository:
         input_features: dict[str, Any],
         predicted_price: float,
         response_time_ms: int | None = None,
-        request_type: str = "single",
-        batch_id: str | None = None,
+        model_version: str | None = None,
     ) -> PredictionLog:
         log = PredictionLog(
             api_key_id=api_key_id,
-            input_features=input_features,
             predicted_price=predicted_price,
-            response_time_ms=response_time_ms,
-            request_type=request_type,
-            batch_id=batch_id,
+            own_response_time_ms=response_time_ms,
+            own_model_version=model_version,
+            created_at=datetime.now(UTC),
+            **feature_columns(input_features),
         )
         self.session.add(log)
+        self._bump_stats([{"api_key_id": api_key_id, "created_at": log.created_at}])
         self.session.commit()
         self.session.refresh(log)
         return log
@@ -42,64 +275,310 @@ class PredictionLogRepository:
         api_key_id: int,
         predictions: list[tuple[dict[str, Any], float]],
         response_time_ms: int | None = None,
+        model_version: str | None = None,
     ) -> list[PredictionLog]:
-        batch_id = str(uuid.uuid4())
+        created_at = datetime.now(UTC)
+        batch = PredictionBatch(
+            batch_id=str(uuid.uuid4()),
+            api_key_id=api_key_id,
+            response_time_ms=response_time_ms,
+            model_version=model_version,
+            created_at=created_at,
+        )
         logs = []
 
         for input_features, predicted_price in predictions:
             log = PredictionLog(
                 api_key_id=api_key_id,
-                input_features=input_features,
                 predicted_price=predicted_price,
-                response_time_ms=response_time_ms,
-                request_type="batch",
-                batch_id=batch_id,
+                batch=batch,
+                created_at=created_at,
+                **feature_columns(input_features),
             )
             self.session.add(log)
             logs.append(log)
 
+        self.session.flush()
+        self._bump_stats(
+            [{"api_key_id": api_key_id, "created_at": log.created_at} for log in logs]
+        )
         self.session.commit()
         for log in logs:
             self.session.refresh(log)
 
         return logs
 
+    def insert_batch(
+        self,
+        api_key_id: int,
+        predictions: list[tuple[dict[str, Any], float]],
+        response_time_ms: int | None = None,
+        model_version: str | None = None,
+    ) -> BatchInsertResult:
+        """Bulk-insert a batch with Core, skipping ORM objects and refreshes.
+
+        One prediction_batches header holds the fields shared by the batch.
+        Ids come back in input order from ``RETURNING`` where the dialect
+        supports it for executemany, otherwise from a lookup by batch.
+        """
+        batch_id = str(uuid.uuid4())
+        if not predictions:
+            return BatchInsertResult(batch_id, [])
+
+        created_at = datetime.now(UTC)
+        header = self.session.execute(
+            insert(prediction_batches),
+            {
+                "batch_id": batch_id,
+                "api_key_id": api_key_id,
+                "response_time_ms": response_time_ms,
+                "model_version": model_version,
+                "created_at": created_at,
+            },
+        )
+        batch_pk = header.inserted_primary_key[0]
+        rows = _batch_rows(api_key_id, predictions, batch_pk, created_at)
+
+        stmt = _insert_returning_ids(self.session.get_bind().dialect)
+        if stmt is not None:
+            ids = list(self.session.execute(stmt, rows).scalars())
+        else:
+            self.session.execute(insert(prediction_logs), rows)
+            ids = list(self.session.execute(_batch_ids_stmt(batch_pk)).scalars())
+        self._bump_stats(rows)
+        self.session.commit()
+        return BatchInsertResult(batch_id, ids)
+
+    def bulk_create(self, rows: list[dict[str, Any]], commit: bool = True) -> int:
+        """Insert ``log_row`` rows with one Core executemany, without refresh.
+
+        Rows of one batch may arrive over several flushes, so the header is
+        looked up by batch_id before one is created.
+        """
+        if not rows:
+            return 0
+        rows = _stored_rows(rows, self._batch_pks(_batch_headers(rows)))
+        self.session.execute(insert(prediction_logs), rows)
+        self._bump_stats(rows)
+        if commit:
+            self.session.commit()
+        return len(rows)
+
+    def _batch_pks(self, headers: dict[str, dict[str, Any]]) -> dict[str, int]:
+        if not headers:
+            return {}
+        stmt = _batch_pks_stmt(list(headers))
+        batch_pks = dict(self.session.execute(stmt).all())
+        missing = [headers[key] for key in headers if key not in batch_pks]
+        if missing:
+            self.session.execute(insert(prediction_batches), missing)
+            batch_pks = dict(self.session.execute(stmt).all())
+        return batch_pks
+
+    def _bump_stats(self, rows: list[dict[str, Any]]) -> None:
+        # Runs in the caller's transaction, so counters commit with the logs
+        deltas = stats_deltas(rows)
+        stmt = upsert_stats_stmt(self.session.get_bind().dialect)
+        if stmt is not None:
+            self.session.execute(stmt, deltas)
+            return
+        for delta in deltas:
+            if not self.session.execute(update_stats_stmt(delta)).rowcount:
+                self.session.execute(insert(prediction_stats), [delta])
+
     def get_by_id(self, log_id: int) -> PredictionLog | None:
         stmt = select(PredictionLog).where(PredictionLog.id == log_id)
         return self.session.execute(stmt).scalar_one_or_none()
 
     def get_by_api_key(
-        self, api_key_id: int, skip: int = 0, limit: int = 100
+        self,
+        api_key_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after: LogPosition | None = None,
     ) -> list[PredictionLog]:
-        stmt = (
-            select(PredictionLog)
-            .where(PredictionLog.api_key_id == api_key_id)
-            .order_by(PredictionLog.created_at.desc())
-            .offset(skip)
-            .limit(limit)
-        )
+        """Logs newest first, starting after the ``(created_at, id)`` of ``after``.
+
+        Paging with ``after`` seeks on the (api_key_id, created_at, id) index,
+        so deep pages cost the same as the first; ``skip`` still scans.
+        """
+        stmt = _by_api_key_stmt(api_key_id, skip, limit, after)
+        return list(self.session.execute(stmt).scalars().all())
+
+    def search(
+        self,
+        api_key_id: int,
+        filters: LogSearchFilters,
+        limit: int = 100,
+        after: LogPosition | None = None,
+    ) -> list[PredictionLog]:
+        """A key's logs matching ``filters``, newest first, paged like get_by_api_key.
+
+        Price, ocean proximity and coordinates are matched on their typed,
+        indexed columns rather than inside input_features.
+        """
+        stmt = _search_stmt(api_key_id, filters, limit, after)
         return list(self.session.execute(stmt).scalars().all())
 
     def get_by_batch_id(self, batch_id: str) -> list[PredictionLog]:
-        stmt = (
-            select(PredictionLog)
-            .where(PredictionLog.batch_id == batch_id)
-            .order_by(PredictionLog.created_at)
-        )
+        stmt = _by_batch_id_stmt(batch_id)
         return list(self.session.execute(stmt).scalars().all())
 
     def get_recent(self, limit: int = 100) -> list[PredictionLog]:
-        stmt = (
-            select(PredictionLog).order_by(PredictionLog.created_at.desc()).limit(limit)
-        )
-        return list(self.session.execute(stmt).scalars().all())
+        return list(self.session.execute(_recent_stmt(limit)).scalars().all())
 
     def count_by_api_key(self, api_key_id: int) -> int:
-        stmt = select(func.count(PredictionLog.id)).where(
-            PredictionLog.api_key_id == api_key_id
-        )
-        return self.session.execute(stmt).scalar() or 0
+        return self.session.execute(_count_stmt(api_key_id)).scalar() or 0
 
     def count_all(self) -> int:
-        stmt = select(func.count(PredictionLog.id))
-        return self.session.execute(stmt).scalar() or 0
+        return self.session.execute(_count_stmt()).scalar() or 0
+
+    def stats_count_by_api_key(self, api_key_id: int) -> int:
+        """Prediction count from the prediction_stats counters."""
+        return self.session.execute(stats_count_stmt(api_key_id)).scalar()
+
+    def stats_count_all(self) -> int:
+        return self.session.execute(stats_count_stmt()).scalar()
+
+
+class AsyncPredictionLogRepository:
+    """PredictionLogRepository for an AsyncSession (aiosqlite / asyncpg)."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def create(
+        self,
+        api_key_id: int,
+        input_features: dict[str, Any],
+        predicted_price: float,
+        response_time_ms: int | None = None,
+        model_version: str | None = None,
+    ) -> PredictionLog:
+        log = PredictionLog(
+            api_key_id=api_key_id,
+            predicted_price=predicted_price,
+            own_response_time_ms=response_time_ms,
+            own_model_version=model_version,
+            created_at=datetime.now(UTC),
+            **feature_columns(input_features),
+        )
+        self.session.add(log)
+        await self._bump_stats(
+            [{"api_key_id": api_key_id, "created_at": log.created_at}]
+        )
+        await self.session.commit()
+        await self.session.refresh(log)
+        return log
+
+    async def insert_batch(
+        self,
+        api_key_id: int,
+        predictions: list[tuple[dict[str, Any], float]],
+        response_time_ms: int | None = None,
+        model_version: str | None = None,
+    ) -> BatchInsertResult:
+        """Bulk-insert a batch with Core; see PredictionLogRepository.insert_batch."""
+        batch_id = str(uuid.uuid4())
+        if not predictions:
+            return BatchInsertResult(batch_id, [])
+
+        created_at = datetime.now(UTC)
+        header = await self.session.execute(
+            insert(prediction_batches),
+            {
+                "batch_id": batch_id,
+                "api_key_id": api_key_id,
+                "response_time_ms": response_time_ms,
+                "model_version": model_version,
+                "created_at": created_at,
+            },
+        )
+        batch_pk = header.inserted_primary_key[0]
+        rows = _batch_rows(api_key_id, predictions, batch_pk, created_at)
+
+        stmt = _insert_returning_ids(self.session.get_bind().dialect)
+        if stmt is not None:
+            ids = list((await self.session.execute(stmt, rows)).scalars())
+        else:
+            await self.session.execute(insert(prediction_logs), rows)
+            result = await self.session.execute(_batch_ids_stmt(batch_pk))
+            ids = list(result.scalars())
+        await self._bump_stats(rows)
+        await self.session.commit()
+        return BatchInsertResult(batch_id, ids)
+
+    async def bulk_create(self, rows: list[dict[str, Any]], commit: bool = True) -> int:
+        """Insert ``log_row`` rows; see PredictionLogRepository.bulk_create."""
+        if not rows:
+            return 0
+        rows = _stored_rows(rows, await self._batch_pks(_batch_headers(rows)))
+        await self.session.execute(insert(prediction_logs), rows)
+        await self._bump_stats(rows)
+        if commit:
+            await self.session.commit()
+        return len(rows)
+
+    async def _batch_pks(self, headers: dict[str, dict[str, Any]]) -> dict[str, int]:
+        if not headers:
+            return {}
+        stmt = _batch_pks_stmt(list(headers))
+        batch_pks = dict((await self.session.execute(stmt)).all())
+        missing = [headers[key] for key in headers if key not in batch_pks]
+        if missing:
+            await self.session.execute(insert(prediction_batches), missing)
+            batch_pks = dict((await self.session.execute(stmt)).all())
+        return batch_pks
+
+    async def _bump_stats(self, rows: list[dict[str, Any]]) -> None:
+        deltas = stats_deltas(rows)
+        stmt = upsert_stats_stmt(self.session.get_bind().dialect)
+        if stmt is not None:
+            await self.session.execute(stmt, deltas)
+            return
+        for delta in deltas:
+            if not (await self.session.execute(update_stats_stmt(delta))).rowcount:
+                await self.session.execute(insert(prediction_stats), [delta])
+
+    async def get_by_id(self, log_id: int) -> PredictionLog | None:
+        stmt = select(PredictionLog).where(PredictionLog.id == log_id)
+        return (await self.session.execute(stmt)).scalar_one_or_none()
+
+    async def get_by_api_key(
+        self,
+        api_key_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after: LogPosition | None = None,
+    ) -> list[PredictionLog]:
+        stmt = _by_api_key_stmt(api_key_id, skip, limit, after)
+        return list((await self.session.execute(stmt)).scalars().all())
+
+    async def search(
+        self,
+        api_key_id: int,
+        filters: LogSearchFilters,
+        limit: int = 100,
+        after: LogPosition | None = None,
+    ) -> list[PredictionLog]:
+        stmt = _search_stmt(api_key_id, filters, limit, after)
+        return list((await self.session.execute(stmt)).scalars().all())
+
+    async def get_by_batch_id(self, batch_id: str) -> list[PredictionLog]:
+        stmt = _by_batch_id_stmt(batch_id)
+        return list((await self.session.execute(stmt)).scalars().all())
+
+    async def get_recent(self, limit: int = 100) -> list[PredictionLog]:
+        return list((await self.session.execute(_recent_stmt(limit))).scalars().all())
+
+    async def count_by_api_key(self, api_key_id: int) -> int:
+        return (await self.session.execute(_count_stmt(api_key_id))).scalar() or 0
+
+    async def count_all(self) -> int:
+        return (await self.session.execute(_count_stmt())).scalar() or 0
+
+    async def stats_count_by_api_key(self, api_key_id: int) -> int:
+        return (await self.session.execute(stats_count_stmt(api_key_id))).scalar()
+
+    async def stats_count_all(self) -> int:
+        return (await self.session.execute(stats_count_stmt())).scalar()
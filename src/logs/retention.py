@@ -0,0 +1,346 @@
+"""Retention for prediction logs: archive expired days, then delete them.
+
+Logs older than ``LOG_RETENTION_DAYS`` (whole UTC days) are appended to one
+gzip-compressed NDJSON file per day under ``LOG_ARCHIVE_DIR`` and removed
+from prediction_logs in chunks of ``LOG_RETENTION_CHUNK_ROWS``, each in its
+own short transaction. Archives stay readable through /logs/archive.
+A pass holds an exclusive lock in ``LOG_ARCHIVE_DIR``, so of several workers
+(or a worker and this CLI) only one archives at a time; the others skip.
+
+Usage:
+    python -m src.logs.retention [--days 90] [--archive-dir DIR] [--chunk-rows N]
+"""
+
+import argparse
+import asyncio
+import fcntl
+import gzip
+import json
+import logging
+import os
+import sys
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import UTC, date, datetime, timedelta
+from itertools import groupby
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from sqlalchemy import Delete, Select, delete, exists
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.core.database import SessionLocal
+from src.core.executors import get_db_executor
+from src.core.metrics import metrics
+from src.logs.repository import log_record, log_view_stmt, prediction_batches
+from src.logs.stats import utc_day
+from src.models import PredictionLog
+
+logger = logging.getLogger(__name__)
+
+prediction_logs = PredictionLog.__table__
+
+archived_counter = metrics.counter(
+    "prediction_log_archived", "Audit log rows moved to the archive"
+)
+retention_ms_hist = metrics.histogram(
+    "prediction_log_retention_ms", "Duration of one retention run"
+)
+retention_skipped = metrics.counter(
+    "prediction_log_retention_skipped",
+    "Retention passes skipped while another process held the archive lock",
+)
+
+ARCHIVE_PREFIX = "prediction_logs-"
+ARCHIVE_SUFFIX = ".ndjson.gz"
+LOCK_NAME = ".retention.lock"
+
+
+class RetentionResult(NamedTuple):
+    archived_rows: int
+    days: list[date]
+    # Another process was running a pass on the same archive directory
+    skipped: bool = False
+
+
+def archive_path(archive_dir: str | Path, day: date) -> Path:
+    return Path(archive_dir) / f"{ARCHIVE_PREFIX}{day.isoformat()}{ARCHIVE_SUFFIX}"
+
+
+def archived_days(archive_dir: str | Path) -> list[date]:
+    """Days with an archive file, oldest first."""
+    days = []
+    for path in Path(archive_dir).glob(f"{ARCHIVE_PREFIX}*{ARCHIVE_SUFFIX}"):
+        try:
+            name = path.name.removeprefix(ARCHIVE_PREFIX).removesuffix(ARCHIVE_SUFFIX)
+            days.append(date.fromisoformat(name))
+        except ValueError:
+            continue
+    return sorted(days)
+
+
+def read_archive(
+    archive_dir: str | Path, day: date, api_key_id: int, skip: int = 0, limit: int = 100
+) -> list[dict[str, Any]] | None:
+    """One key's archived logs for ``day`` in id order, or None without archive.
+
+    A run interrupted between archiving and deleting a chunk archives it
+    again, so rows are de-duplicated by id.
+    """
+    path = archive_path(archive_dir, day)
+    if not path.exists():
+        return None
+    rows: list[dict[str, Any]] = []
+    seen: set[int] = set()
+    with gzip.open(path, "rt", encoding="utf-8") as archive:
+        for line in archive:
+            row = json.loads(line)
+            if row["api_key_id"] != api_key_id or row["id"] in seen:
+                continue
+            seen.add(row["id"])
+            if len(seen) > skip:
+                rows.append(row)
+                if len(rows) >= limit:
+                    break
+    return rows
+
+
+def _encode(row: dict[str, Any]) -> str:
+    return json.dumps(
+        {
+            key: value.isoformat() if isinstance(value, datetime) else value
+            for key, value in row.items()
+        }
+    )
+
+
+def _append(path: Path, rows: list[dict[str, Any]]) -> None:
+    # Each append is a new gzip member; readers see one continuous stream.
+    # Synced to disk before the rows are deleted from the database.
+    with open(path, "ab") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="ab") as archive:
+            archive.write("".join(_encode(row) + "\n" for row in rows).encode())
+        raw.flush()
+        os.fsync(raw.fileno())
+
+
+@contextmanager
+def _archive_lock(archive_dir: Path) -> Iterator[bool]:
+    """Hold the archive directory's lock; yields False if another process has it.
+
+    Two concurrent passes would archive the same rows, and appends from
+    separate processes can interleave inside a gzip member.
+    """
+    with open(archive_dir / LOCK_NAME, "a") as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _expired_chunk_stmt(cutoff: datetime, after_id: int, limit: int) -> Select:
+    # Walks the primary key, so the whole pass reads the table once
+    return (
+        log_view_stmt()
+        .where(prediction_logs.c.id > after_id, prediction_logs.c.created_at < cutoff)
+        .order_by(prediction_logs.c.id)
+        .limit(limit)
+    )
+
+
+def _emptied_batches_stmt(cutoff: datetime) -> Delete:
+    # A batch header goes once none of its logs remain
+    has_logs = exists().where(
+        prediction_logs.c.prediction_batch_id == prediction_batches.c.id
+    )
+    return delete(prediction_batches).where(
+        prediction_batches.c.created_at < cutoff, ~has_logs
+    )
+
+
+def _by_day(
+    rows: list[dict[str, Any]],
+) -> Iterator[tuple[date, list[dict[str, Any]]]]:
+    def key(row: dict[str, Any]) -> date:
+        return utc_day(row["created_at"])
+
+    for day, day_rows in groupby(sorted(rows, key=key), key=key):
+        yield day, list(day_rows)
+
+
+def retention_cutoff(retention_days: int, now: datetime | None = None) -> datetime:
+    """Start of the oldest UTC day that is kept (naive, like stored timestamps)."""
+    today = (now or datetime.now(UTC)).astimezone(UTC).date()
+    return datetime.combine(today - timedelta(days=retention_days), datetime.min.time())
+
+
+def _archive_locked(
+    session_factory: Callable[[], Session],
+    archive_dir: Path,
+    cutoff: datetime,
+    chunk_rows: int,
+) -> RetentionResult:
+    archived, days, last_id = 0, set(), 0
+    while True:
+        with session_factory() as session:
+            stmt = _expired_chunk_stmt(cutoff, last_id, chunk_rows)
+            rows = [log_record(row) for row in session.execute(stmt).mappings()]
+            if not rows:
+                break
+            for day, day_rows in _by_day(rows):
+                _append(archive_path(archive_dir, day), day_rows)
+                days.add(day)
+            # Every expired row in this id range was read above
+            session.execute(
+                delete(prediction_logs).where(
+                    prediction_logs.c.id.between(rows[0]["id"], rows[-1]["id"]),
+                    prediction_logs.c.created_at < cutoff,
+                )
+            )
+            session.commit()
+        archived += len(rows)
+        archived_counter.inc(len(rows))
+        last_id = rows[-1]["id"]
+
+    if archived:
+        with session_factory() as session:
+            session.execute(_emptied_batches_stmt(cutoff))
+            session.commit()
+    return RetentionResult(archived, sorted(days))
+
+
+def archive_expired_logs(
+    session_factory: Callable[[], Session],
+    archive_dir: str | Path,
+    retention_days: int,
+    chunk_rows: int = 5000,
+    now: datetime | None = None,
+) -> RetentionResult:
+    """Move logs from days before the retention window into the archive.
+
+    prediction_stats counters are left alone, so /logs/stats keeps counting
+    archived predictions.
+    """
+    cutoff = retention_cutoff(retention_days, now)
+    archive_dir = Path(archive_dir)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+
+    with _archive_lock(archive_dir) as locked:
+        if not locked:
+            retention_skipped.inc()
+            return RetentionResult(0, [], skipped=True)
+        return _archive_locked(session_factory, archive_dir, cutoff, chunk_rows)
+
+
+class LogRetention:
+    """Background task running the retention pass every ``interval`` seconds."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        archive_dir: str | Path,
+        retention_days: int,
+        chunk_rows: int,
+    ) -> None:
+        self.session_factory = session_factory
+        self.archive_dir = Path(archive_dir)
+        self.retention_days = retention_days
+        self.chunk_rows = chunk_rows
+        self._task: asyncio.Task | None = None
+
+    async def run_once(self) -> RetentionResult:
+        start = time.perf_counter()
+        result = await get_db_executor().run(
+            archive_expired_logs,
+            self.session_factory,
+            self.archive_dir,
+            self.retention_days,
+            self.chunk_rows,
+        )
+        retention_ms_hist.observe((time.perf_counter() - start) * 1000)
+        if result.skipped:
+            logger.info("Prediction log retention already running elsewhere")
+        elif result.archived_rows:
+            logger.info(
+                f"Archived {result.archived_rows} prediction logs "
+                f"from {len(result.days)} day(s)"
+            )
+        return result
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception as e:
+                logger.error(f"Prediction log retention failed: {e}")
+            await asyncio.sleep(interval)
+
+    def start(self, interval: float) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run(interval))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+_retention: LogRetention | None = None
+
+
+def get_log_retention() -> LogRetention | None:
+    """Return the process-wide retention task, or None when retention is off."""
+    global _retention
+    if settings.LOG_RETENTION_DAYS <= 0:
+        return None
+    if _retention is None:
+        _retention = LogRetention(
+            session_factory=SessionLocal,
+            archive_dir=settings.LOG_ARCHIVE_DIR,
+            retention_days=settings.LOG_RETENTION_DAYS,
+            chunk_rows=settings.LOG_RETENTION_CHUNK_ROWS,
+        )
+    return _retention
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Archive and delete prediction logs older than the window."
+    )
+    parser.add_argument("--days", type=int, default=settings.LOG_RETENTION_DAYS)
+    parser.add_argument("--archive-dir", default=settings.LOG_ARCHIVE_DIR)
+    parser.add_argument(
+        "--chunk-rows", type=int, default=settings.LOG_RETENTION_CHUNK_ROWS
+    )
+    args = parser.parse_args(argv)
+    if args.days <= 0:
+        parser.error("--days (or LOG_RETENTION_DAYS) must be positive")
+
+    logging.basicConfig(
+        stream=sys.stderr, level=settings.LOG_LEVEL, format="%(asctime)s %(message)s"
+    )
+    result = archive_expired_logs(
+        SessionLocal, args.archive_dir, args.days, args.chunk_rows
+    )
+    if result.skipped:
+        parser.exit(1, f"Another retention pass holds {args.archive_dir}\n")
+    print(
+        f"Archived {result.archived_rows:,} rows from {len(result.days)} day(s) "
+        f"before {retention_cutoff(args.days).date()} to {args.archive_dir}"
+    )
+
+
+if __name__ == "__main__":
+    main()
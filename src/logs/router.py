@@ -1,37 +1,83 @@
 """Prediction logs API routes."""
 
+import asyncio
 import logging
+from datetime import date, datetime
+from typing import Literal
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 
 from src.auth.dependencies import CurrentUserDep
-from src.logs.dependencies import PredictionLogRepoDep
+from src.config import settings
+from src.core.exceptions import InvalidCursorError
+from src.logs.dependencies import ExportSessionFactoryDep, PredictionLogRepoDep
+from src.logs.export import MEDIA_TYPES, export_stmt, stream_export
+from src.logs.pagination import LogPosition, decode_cursor, encode_cursor
+from src.logs.repository import LogSearchFilters
+from src.logs.retention import archived_days, read_archive
 from src.logs.schema import (
+    ArchivedDaysResponse,
+    ArchivedLogListResponse,
     PredictionLogListResponse,
     PredictionLogResponse,
     PredictionStatsResponse,
 )
+from src.predictions.schema import OceanProximity
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _decode_cursor(cursor: str | None) -> LogPosition | None:
+    try:
+        return decode_cursor(cursor) if cursor else None
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
+
+
+def _page(logs: list, limit: int) -> tuple[list, str | None]:
+    # Callers fetch one extra row to tell whether another page exists
+    if len(logs) <= limit:
+        return logs, None
+    logs = logs[:limit]
+    return logs, encode_cursor(logs[-1].created_at, logs[-1].id)
+
+
 @router.get(
     "", response_model=PredictionLogListResponse, summary="Get My Prediction Logs"
 )
 async def get_my_logs(
     current_user: CurrentUserDep,
     repo: PredictionLogRepoDep,
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = None,
+    include_total: bool = False,
 ) -> PredictionLogListResponse:
-    logs = repo.get_by_api_key(current_user["id"], skip=skip, limit=limit)
-    total = repo.count_by_api_key(current_user["id"])
+    """Logs newest first.
+
+    Pass the returned ``next_cursor`` as ``cursor`` to fetch the next page;
+    unlike ``skip``, its cost does not grow with the page number. The total
+    needs a full count of the key's logs, so it is only computed on request.
+    """
+    after = _decode_cursor(cursor)
+    logs, next_cursor = _page(
+        await repo.get_by_api_key(
+            current_user["id"], skip=skip, limit=limit + 1, after=after
+        ),
+        limit,
+    )
+
+    total = await repo.count_by_api_key(current_user["id"]) if include_total else None
     return PredictionLogListResponse(
         logs=[PredictionLogResponse.model_validate(log) for log in logs],
         total=total,
         skip=skip,
         limit=limit,
+        next_cursor=next_cursor,
     )
 
 
@@ -43,9 +89,121 @@ async def get_my_logs(
 async def get_stats(
     current_user: CurrentUserDep, repo: PredictionLogRepoDep
 ) -> PredictionStatsResponse:
+    """Counts from the prediction_stats counters, not a scan of the logs."""
     return PredictionStatsResponse(
-        total_predictions=repo.count_all(),
-        predictions_by_user=repo.count_by_api_key(current_user["id"]),
+        total_predictions=await repo.stats_count_all(),
+        predictions_by_user=await repo.stats_count_by_api_key(current_user["id"]),
+    )
+
+
+@router.get(
+    "/search",
+    response_model=PredictionLogListResponse,
+    summary="Search My Prediction Logs",
+)
+async def search_my_logs(
+    current_user: CurrentUserDep,
+    repo: PredictionLogRepoDep,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    ocean_proximity: OceanProximity | None = None,
+    min_latitude: float | None = Query(None, ge=-90, le=90),
+    max_latitude: float | None = Query(None, ge=-90, le=90),
+    min_longitude: float | None = Query(None, ge=-180, le=180),
+    max_longitude: float | None = Query(None, ge=-180, le=180),
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = None,
+) -> PredictionLogListResponse:
+    """Filter logs by price range, ocean proximity, bounding box and time.
+
+    Bounds are inclusive and may be combined; results are newest first and
+    paged with ``next_cursor`` like GET /logs.
+    """
+    filters = LogSearchFilters(
+        min_price=min_price,
+        max_price=max_price,
+        ocean_proximity=ocean_proximity.value if ocean_proximity else None,
+        min_latitude=min_latitude,
+        max_latitude=max_latitude,
+        min_longitude=min_longitude,
+        max_longitude=max_longitude,
+        created_from=created_from,
+        created_to=created_to,
+    )
+    logs, next_cursor = _page(
+        await repo.search(
+            current_user["id"], filters, limit=limit + 1, after=_decode_cursor(cursor)
+        ),
+        limit,
+    )
+    return PredictionLogListResponse(
+        logs=[PredictionLogResponse.model_validate(log) for log in logs],
+        skip=0,
+        limit=limit,
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/export", summary="Export My Prediction Logs")
+async def export_my_logs(
+    current_user: CurrentUserDep,
+    session_factory: ExportSessionFactoryDep,
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> StreamingResponse:
+    """All matching logs oldest first, streamed as NDJSON or CSV.
+
+    Rows are read from a server-side cursor ``LOG_EXPORT_CHUNK_ROWS`` at a
+    time, so the response can cover any time range.
+    """
+    stmt = export_stmt(current_user["id"], created_from, created_to)
+    return StreamingResponse(
+        stream_export(session_factory, stmt, fmt, settings.LOG_EXPORT_CHUNK_ROWS),
+        media_type=MEDIA_TYPES[fmt],
+        headers={
+            "Content-Disposition": f'attachment; filename="prediction_logs.{fmt}"'
+        },
+    )
+
+
+@router.get(
+    "/archive",
+    response_model=ArchivedDaysResponse,
+    summary="List Archived Days",
+)
+async def list_archived_days(current_user: CurrentUserDep) -> ArchivedDaysResponse:
+    """UTC days whose logs were moved out of the database by retention."""
+    days = await asyncio.to_thread(archived_days, settings.LOG_ARCHIVE_DIR)
+    return ArchivedDaysResponse(days=days)
+
+
+@router.get(
+    "/archive/{day}",
+    response_model=ArchivedLogListResponse,
+    summary="Get My Archived Prediction Logs",
+)
+async def get_my_archived_logs(
+    day: date,
+    current_user: CurrentUserDep,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+) -> ArchivedLogListResponse:
+    """Read-only view of one archived day, oldest first."""
+    rows = await asyncio.to_thread(
+        read_archive, settings.LOG_ARCHIVE_DIR, day, current_user["id"], skip, limit
+    )
+    if rows is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="No archive for this day"
+        )
+    return ArchivedLogListResponse(
+        day=day,
+        logs=[PredictionLogResponse.model_validate(row) for row in rows],
+        skip=skip,
+        limit=limit,
     )
 
 
@@ -59,7 +217,7 @@ async def get_log_by_id(
     current_user: CurrentUserDep,
     repo: PredictionLogRepoDep,
 ) -> PredictionLogResponse:
-    log = repo.get_by_id(log_id)
+    log = await repo.get_by_id(log_id)
 
     if not log:
         raise HTTPException(
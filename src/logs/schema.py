@@ -1,6 +1,6 @@
 """Pydantic schemas for prediction logs."""
 
-from datetime import datetime
+from datetime import date, datetime
 from typing import Any
 
 from pydantic import BaseModel
@@ -14,18 +14,31 @@ class PredictionLogResponse(BaseModel):
     response_time_ms: int | None = None
     request_type: str
     batch_id: str | None = None
+    model_version: str | None = None
     created_at: datetime
 
-    model_config = {"from_attributes": True}
+    model_config = {"from_attributes": True, "protected_namespaces": ()}
 
 
 class PredictionLogListResponse(BaseModel):
     logs: list[PredictionLogResponse]
-    total: int
+    total: int | None = None  # only counted when include_total=true
     skip: int
     limit: int
+    next_cursor: str | None = None
 
 
 class PredictionStatsResponse(BaseModel):
     total_predictions: int
     predictions_by_user: int
+
+
+class ArchivedDaysResponse(BaseModel):
+    days: list[date]
+
+
+class ArchivedLogListResponse(BaseModel):
+    day: date
+    logs: list[PredictionLogResponse]
+    skip: int
+    limit: int
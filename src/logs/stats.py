@@ -0,0 +1,204 @@
+"""Per-key, per-day prediction counters behind /logs/stats.
+
+Every log insert bumps ``prediction_stats`` in the same transaction, so the
+stats endpoint sums a few counter rows instead of counting prediction_logs.
+Besides one row per key and day, each day has a total row under
+``TOTAL_API_KEY_ID``, and logs without a key count under ``UNKEYED_API_KEY_ID``
+(deleting a key folds its rows into those). ``rebuild_stats`` reconciles the
+counters with the raw table:
+
+    python -m src.logs.stats
+"""
+
+import logging
+from collections import Counter
+from datetime import UTC, date, datetime
+from typing import Any
+
+from sqlalchemy import (
+    Date,
+    Executable,
+    Insert,
+    Select,
+    and_,
+    cast,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    select,
+    text,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Dialect
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import Update
+
+from src.core.database import SessionLocal
+from src.models import PredictionLog, PredictionStat
+
+logger = logging.getLogger(__name__)
+
+prediction_stats = PredictionStat.__table__
+
+# Counter rows that belong to no live key: logs without a key (or whose key
+# was deleted), and each day's total over all logs
+UNKEYED_API_KEY_ID = 0
+TOTAL_API_KEY_ID = -1
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def utc_day(timestamp: datetime) -> date:
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(UTC)
+    return timestamp.date()
+
+
+def stats_deltas(rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Counter increments for log rows carrying api_key_id and created_at.
+
+    Sorted by key, so concurrent transactions lock counter rows in one order.
+    """
+    counts = Counter(
+        (row["api_key_id"] or UNKEYED_API_KEY_ID, utc_day(row["created_at"]))
+        for row in rows
+    )
+    totals = Counter(utc_day(row["created_at"]) for row in rows)
+    counts.update({(TOTAL_API_KEY_ID, day): count for day, count in totals.items()})
+    return [
+        {"api_key_id": api_key_id, "day": day, "prediction_count": count}
+        for (api_key_id, day), count in sorted(counts.items())
+    ]
+
+
+def upsert_stats_stmt(dialect: Dialect) -> Insert | None:
+    """Statement adding ``prediction_count`` to existing rows, or None."""
+    dialect_insert = _UPSERT_INSERTS.get(dialect.name)
+    if dialect_insert is None:
+        return None
+    stmt = dialect_insert(prediction_stats)
+    return stmt.on_conflict_do_update(
+        index_elements=[prediction_stats.c.api_key_id, prediction_stats.c.day],
+        set_={
+            "prediction_count": prediction_stats.c.prediction_count
+            + stmt.excluded.prediction_count
+        },
+    )
+
+
+def update_stats_stmt(delta: dict[str, Any]) -> Update:
+    # Fallback for dialects without upsert; insert when no row was updated
+    return (
+        update(prediction_stats)
+        .where(
+            prediction_stats.c.api_key_id == delta["api_key_id"],
+            prediction_stats.c.day == delta["day"],
+        )
+        .values(
+            prediction_count=prediction_stats.c.prediction_count
+            + delta["prediction_count"]
+        )
+    )
+
+
+def stats_count_stmt(api_key_id: int | None = None) -> Select:
+    """Count for one key, or over all logs from the per-day total rows."""
+    stmt = select(func.coalesce(func.sum(prediction_stats.c.prediction_count), 0))
+    if api_key_id is None:
+        api_key_id = TOTAL_API_KEY_ID
+    return stmt.where(prediction_stats.c.api_key_id == api_key_id)
+
+
+def fold_key_stats_stmts(api_key_id: int) -> list[Executable]:
+    """Statements moving a deleted key's counters into the unkeyed rows.
+
+    Its logs lose their api_key_id with the key, so this keeps the counters
+    matching what ``rebuild_stats`` would compute. The day totals are unchanged.
+    """
+    folded = prediction_stats.alias("folded")
+    folded_same_day = and_(
+        folded.c.api_key_id == api_key_id, folded.c.day == prediction_stats.c.day
+    )
+    unkeyed_same_day = and_(
+        folded.c.api_key_id == UNKEYED_API_KEY_ID,
+        folded.c.day == prediction_stats.c.day,
+    )
+    return [
+        # Days with an unkeyed row: add the key's count to it
+        update(prediction_stats)
+        .where(
+            prediction_stats.c.api_key_id == UNKEYED_API_KEY_ID,
+            exists().where(folded_same_day),
+        )
+        .values(
+            prediction_count=prediction_stats.c.prediction_count
+            + select(folded.c.prediction_count).where(folded_same_day).scalar_subquery()
+        ),
+        # Other days: the key's row becomes the unkeyed row
+        update(prediction_stats)
+        .where(
+            prediction_stats.c.api_key_id == api_key_id,
+            ~exists().where(unkeyed_same_day),
+        )
+        .values(api_key_id=UNKEYED_API_KEY_ID),
+        delete(prediction_stats).where(prediction_stats.c.api_key_id == api_key_id),
+    ]
+
+
+def _day_expr(dialect: Dialect) -> Any:
+    # SQLite stores dates as 'YYYY-MM-DD' text, which date() produces
+    if dialect.name == "sqlite":
+        return func.date(PredictionLog.created_at)
+    return cast(PredictionLog.created_at, Date)
+
+
+def rebuild_stats(session: Session) -> int:
+    """Recompute the counters from prediction_logs; returns the counter rows.
+
+    Counters for days before the oldest log are kept: retention archives
+    whole days and leaves their counters in place. On PostgreSQL the table
+    is locked first, so inserts racing the rebuild bump the new counters
+    after it commits instead of being lost.
+    """
+    dialect = session.get_bind().dialect
+    if dialect.name == "postgresql":
+        session.execute(text("LOCK TABLE prediction_stats IN EXCLUSIVE MODE"))
+
+    oldest = session.execute(select(func.min(PredictionLog.created_at))).scalar()
+    if oldest is not None:
+        api_key_id = func.coalesce(PredictionLog.api_key_id, UNKEYED_API_KEY_ID)
+        day = _day_expr(dialect)
+        counts = union_all(
+            select(api_key_id, day, func.count(PredictionLog.id)).group_by(
+                api_key_id, day
+            ),
+            select(
+                literal(TOTAL_API_KEY_ID), day, func.count(PredictionLog.id)
+            ).group_by(day),
+        )
+        session.execute(
+            delete(prediction_stats).where(prediction_stats.c.day >= utc_day(oldest))
+        )
+        session.execute(
+            insert(prediction_stats).from_select(
+                ["api_key_id", "day", "prediction_count"], counts
+            )
+        )
+    session.commit()
+    return session.execute(select(func.count()).select_from(prediction_stats)).scalar()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    with SessionLocal() as session:
+        rows = rebuild_stats(session)
+    logger.info(f"Rebuilt prediction_stats: {rows} counter rows")
+
+
+if __name__ == "__main__":
+    main()
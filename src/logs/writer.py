@@ -0,0 +1,342 @@
+"""Write-behind pipeline that bulk-inserts prediction audit logs off the request path."""
+
+import asyncio
+import fcntl
+import json
+import logging
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Literal
+
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.core.database import SessionLocal
+from src.core.exceptions import ExecutorSaturatedError
+from src.core.executors import get_db_executor
+from src.core.metrics import metrics
+from src.logs.repository import PredictionLogRepository
+
+logger = logging.getLogger(__name__)
+
+queue_depth_gauge = metrics.gauge(
+    "prediction_log_queue_depth", "Audit log rows waiting to be written"
+)
+flush_rows_hist = metrics.histogram(
+    "prediction_log_flush_rows", "Audit log rows inserted per flush"
+)
+flush_ms_hist = metrics.histogram(
+    "prediction_log_flush_ms", "Time to bulk-insert one flush of audit logs"
+)
+dropped_counter = metrics.counter(
+    "prediction_log_dropped", "Audit log rows discarded (queue full or write failed)"
+)
+spilled_counter = metrics.counter(
+    "prediction_log_spilled", "Audit log rows spilled to disk for a later replay"
+)
+flush_failures = metrics.counter(
+    "prediction_log_flush_failures", "Flushes whose bulk insert failed"
+)
+
+OverflowPolicy = Literal["block", "drop", "spill"]
+
+
+def log_row(
+    api_key_id: int,
+    input_features: dict[str, Any],
+    predicted_price: float,
+    response_time_ms: int | None = None,
+    request_type: str = "single",
+    batch_id: str | None = None,
+    model_version: str | None = None,
+) -> dict[str, Any]:
+    """Build a row for ``bulk_create``, timestamped now rather than at flush time."""
+    return {
+        "api_key_id": api_key_id,
+        "input_features": input_features,
+        "predicted_price": predicted_price,
+        "response_time_ms": response_time_ms,
+        "request_type": request_type,
+        "batch_id": batch_id,
+        "model_version": model_version,
+        "created_at": datetime.now(UTC),
+    }
+
+
+def _encode(row: dict[str, Any]) -> str:
+    return json.dumps({**row, "created_at": row["created_at"].isoformat()})
+
+
+def _decode(line: str) -> dict[str, Any]:
+    row = json.loads(line)
+    row["created_at"] = datetime.fromisoformat(row["created_at"])
+    return row
+
+
+class LogWriter:
+    """Bounded queue of audit log rows drained by one background task.
+
+    Rows are flushed with a single bulk insert once ``flush_rows`` are queued
+    or ``flush_interval_ms`` after the first queued row, whichever comes first.
+    When the queue is full, ``policy`` decides what happens to new rows:
+
+    - ``block``: wait up to ``block_timeout_ms`` for space, then raise
+      ExecutorSaturatedError so the request is rejected (backpressure).
+    - ``drop``: discard the rows and count them.
+    - ``spill``: append them to ``spill_path`` as NDJSON; the file is replayed
+      once the queue has drained. Failed flushes are spilled as well. Workers
+      may share one spill file: appends and replays take ``flock`` locks on
+      sidecar files, so each spilled row is replayed by exactly one of them.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        max_queue: int,
+        flush_rows: int,
+        flush_interval_ms: float,
+        policy: OverflowPolicy = "block",
+        block_timeout_ms: float = 1000,
+        spill_path: str | Path | None = None,
+    ) -> None:
+        if policy == "spill" and spill_path is None:
+            raise ValueError("spill policy requires a spill_path")
+        self.session_factory = session_factory
+        self.max_queue = max_queue
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval_ms / 1000
+        self.policy = policy
+        self.block_timeout = block_timeout_ms / 1000
+        self.spill_path = Path(spill_path) if spill_path is not None else None
+        self._queue: asyncio.Queue[dict[str, Any]] | None = None
+        self._task: asyncio.Task | None = None
+        self._flushing: asyncio.Task | None = None
+        self._batch: list[dict[str, Any]] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._spill_pending = False
+
+    def _ensure_started(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._loop = loop
+            self._task = loop.create_task(self._run())
+            self._spill_pending = self._has_spill()
+        return self._queue
+
+    async def start(self) -> None:
+        """Start the flush task, replaying rows spilled by an earlier run."""
+        self._ensure_started()
+
+    async def submit(self, rows: list[dict[str, Any]]) -> None:
+        """Queue rows for writing, applying the overflow policy if full."""
+        queue = self._ensure_started()
+        for index, row in enumerate(rows):
+            try:
+                queue.put_nowait(row)
+                continue
+            except asyncio.QueueFull:
+                pass
+
+            if self.policy == "block":
+                try:
+                    await asyncio.wait_for(queue.put(row), self.block_timeout)
+                    continue
+                except TimeoutError as e:
+                    dropped_counter.inc(len(rows) - index)
+                    raise ExecutorSaturatedError("Audit log queue is full") from e
+            elif self.policy == "spill":
+                self._spill(rows[index:])
+            else:
+                dropped_counter.inc(len(rows) - index)
+            break
+        queue_depth_gauge.set(queue.qsize())
+
+    async def stop(self) -> None:
+        """Stop the flush task and write everything still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._flushing is not None:
+            await asyncio.gather(self._flushing, return_exceptions=True)
+
+        if self._queue is not None:
+            # Rows the cancelled task had already taken off the queue come first
+            rows, self._batch = self._batch, []
+            while not self._queue.empty():
+                rows.append(self._queue.get_nowait())
+            for start in range(0, len(rows), self.flush_rows):
+                await self._flush(rows[start : start + self.flush_rows])
+            if self._spill_pending:
+                await self._run_db(self._replay_spill)
+        queue_depth_gauge.set(0)
+        self._task = None
+        self._flushing = None
+        self._queue = None
+        self._loop = None
+
+    async def _collect(self, queue: asyncio.Queue, rows: list[dict[str, Any]]) -> None:
+        rows.append(await queue.get())
+        deadline = time.perf_counter() + self.flush_interval
+        while len(rows) < self.flush_rows:
+            if not queue.empty():
+                rows.append(queue.get_nowait())
+                continue
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                rows.append(await asyncio.wait_for(queue.get(), timeout))
+            except TimeoutError:
+                break
+
+    async def _run(self) -> None:
+        queue = self._queue
+        if self._spill_pending:
+            await self._run_db(self._replay_spill)
+        while True:
+            await self._collect(queue, self._batch)
+            rows, self._batch = self._batch, []
+            queue_depth_gauge.set(queue.qsize())
+            # Shielded so shutdown waits for a flush instead of losing its rows
+            self._flushing = asyncio.get_running_loop().create_task(self._flush(rows))
+            await asyncio.shield(self._flushing)
+            if self._spill_pending and queue.empty():
+                await self._run_db(self._replay_spill)
+
+    async def _run_db(self, fn: Callable[..., Any], *args: Any) -> Any:
+        # The flusher must not lose rows to a momentarily busy db executor
+        while True:
+            try:
+                return await get_db_executor().run(fn, *args)
+            except ExecutorSaturatedError:
+                await asyncio.sleep(0.05)
+
+    async def _flush(self, rows: list[dict[str, Any]]) -> None:
+        start = time.perf_counter()
+        try:
+            await self._run_db(self._insert, rows)
+        except Exception as e:
+            flush_failures.inc()
+            if self.spill_path is not None:
+                logger.error(f"Audit log flush failed, spilling {len(rows)} rows: {e}")
+                self._spill(rows)
+            else:
+                logger.error(f"Audit log flush failed, dropping {len(rows)} rows: {e}")
+                dropped_counter.inc(len(rows))
+            return
+        flush_rows_hist.observe(len(rows))
+        flush_ms_hist.observe((time.perf_counter() - start) * 1000)
+
+    def _insert(self, rows: list[dict[str, Any]]) -> int:
+        with self.session_factory() as session:
+            return PredictionLogRepository(session).bulk_create(rows)
+
+    def _has_spill(self) -> bool:
+        if self.spill_path is None:
+            return False
+        return self.spill_path.exists() or self._replay_path.exists()
+
+    @property
+    def _replay_path(self) -> Path:
+        return self.spill_path.with_name(self.spill_path.name + ".replaying")
+
+    @contextmanager
+    def _file_lock(self, suffix: str, blocking: bool = True) -> Iterator[bool]:
+        """Hold an flock on ``<spill_path><suffix>``; yields False if it is taken.
+
+        ``flock`` locks belong to the open file, so this excludes other threads
+        of this process as well as other workers sharing the spill file.
+        """
+        lock_path = self.spill_path.with_name(self.spill_path.name + suffix)
+        with open(lock_path, "a") as lock_file:
+            flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+            try:
+                fcntl.flock(lock_file, flags)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _spill(self, rows: list[dict[str, Any]]) -> None:
+        # Appends exclude the rename in _replay_spill, so no row lands in a
+        # file that is already being replayed
+        with self._file_lock(".lock"), open(self.spill_path, "a") as f:
+            f.writelines(_encode(row) + "\n" for row in rows)
+        spilled_counter.inc(len(rows))
+        self._spill_pending = True
+
+    def _replay_spill(self) -> int:
+        """Insert spilled rows in one transaction, so a failure can be retried.
+
+        Only one worker replays at a time; the others keep their replay pending
+        and try again later.
+        """
+        with self._file_lock(".replay.lock", blocking=False) as acquired:
+            if not acquired:
+                return 0
+            return self._replay_spill_locked()
+
+    def _replay_spill_locked(self) -> int:
+        replay_path = self._replay_path
+        with self._file_lock(".lock"):
+            self._spill_pending = False
+            if not replay_path.exists():
+                if not self.spill_path.exists():
+                    return 0
+                self.spill_path.rename(replay_path)
+
+        try:
+            with self.session_factory() as session, open(replay_path) as f:
+                repo = PredictionLogRepository(session)
+                total = 0
+                rows = []
+                for line in f:
+                    rows.append(_decode(line))
+                    if len(rows) >= self.flush_rows:
+                        total += repo.bulk_create(rows, commit=False)
+                        rows = []
+                total += repo.bulk_create(rows, commit=False)
+                session.commit()
+        except Exception as e:
+            logger.error(f"Replaying spilled audit logs failed: {e}")
+            self._spill_pending = True
+            return 0
+
+        replay_path.unlink()
+        logger.info(f"Replayed {total} spilled audit log rows")
+        return total
+
+
+_writer: LogWriter | None = None
+
+
+def get_log_writer() -> LogWriter | None:
+    """Return the process-wide log writer, or None when write-behind is disabled."""
+    global _writer
+    if not settings.LOG_WRITE_BEHIND_ENABLED:
+        return None
+    if _writer is None:
+        _writer = LogWriter(
+            session_factory=SessionLocal,
+            max_queue=settings.LOG_QUEUE_SIZE,
+            flush_rows=settings.LOG_FLUSH_ROWS,
+            flush_interval_ms=settings.LOG_FLUSH_INTERVAL_MS,
+            policy=settings.LOG_QUEUE_FULL_POLICY,
+            block_timeout_ms=settings.LOG_QUEUE_BLOCK_TIMEOUT_MS,
+            spill_path=(
+                settings.LOG_SPILL_PATH
+                if settings.LOG_QUEUE_FULL_POLICY == "spill"
+                else None
+            ),
+        )
+    return _writer
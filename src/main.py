@@ -11,46 +11,134 @@ from fastapi.exceptions import HTTPException, RequestValidationError
 from fastapi.openapi.utils import get_openapi
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import sessionmaker
 from starlette.middleware.cors import CORSMiddleware
 from starlette.responses import JSONResponse
 
+from src.admin.router import router as admin_router
+from src.auth.key_filter import get_key_filter
 from src.auth.router import router as auth_router
 from src.config import fastapi_app_config, settings
-from src.core.database import init_db
+from src.core.database import SessionLocal, async_engine, engine, init_db
+from src.core.executors import shutdown_executors
 from src.core.logging import setup_logging
+from src.core.quotas import get_quota_manager
 from src.core.rate_limiter import limiter
+from src.core.startup import startup_report
 from src.health.router import router as health_router
+from src.logs.retention import get_log_retention
 from src.logs.router import router as logs_router
-from src.ml.model import load_model
+from src.logs.writer import get_log_writer
+from src.ml.inference import shutdown_process_pool
+from src.ml.manager import get_model_manager
+from src.predictions.batcher import get_batcher
 from src.predictions.router import router as predictions_router
+from src.predictions.warmup import warm_up
 
 logger = logging.getLogger(__name__)
 
 
+def _session_factory(app: FastAPI) -> sessionmaker:
+    """Sessions for startup and background work outside requests.
+
+    Tests that override get_db set ``app.state.session_factory`` to the
+    sessionmaker of their own database.
+    """
+    return getattr(app.state, "session_factory", SessionLocal)
+
+
+def _startup_bind(app: FastAPI) -> Engine | AsyncEngine:
+    """The engine startup warm-up runs on."""
+    if hasattr(app.state, "session_factory"):
+        return app.state.session_factory.kw["bind"]
+    return async_engine or engine
+
+
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application startup and shutdown handler."""
+    startup_report.begin()
     setup_logging()
     logger.info(f"Starting {settings.PROJECT_NAME} v{settings.VERSION}")
     logger.info(f"Environment: {settings.ENVIRONMENT}")
 
     if settings.is_development:
         logger.info("Development mode: Auto-creating database tables...")
-        init_db()
+        with startup_report.phase("database"):
+            init_db()
         logger.info("Database tables created")
     else:
         logger.info("Production mode: Run 'alembic upgrade head' for migrations")
 
     logger.info("Loading ML model...")
+    model_manager = get_model_manager()
     try:
-        load_model()
-        logger.info("ML model loaded successfully")
+        with startup_report.phase("model_load"):
+            handle = model_manager.current
+        logger.info(f"ML model {handle.version} loaded successfully")
     except Exception as e:
         logger.error(f"Failed to load ML model: {e}")
         raise
+    model_manager.start_watching(settings.MODEL_RELOAD_POLL_SECONDS)
+
+    # Built now so an invalid QUOTA_* setting fails startup, not requests
+    get_quota_manager()
+
+    key_filter = get_key_filter()
+    if key_filter is not None:
+        key_filter.session_factory = _session_factory(app)
+        try:
+            keys = await key_filter.load()
+            logger.info(f"API key filter loaded with {keys} keys")
+        except Exception as e:
+            # An unloaded filter lets every key through to the database
+            logger.warning(f"API key filter not loaded: {e}")
+        key_filter.start(settings.API_KEY_FILTER_REFRESH_SECONDS)
+
+    log_writer = get_log_writer()
+    if log_writer is not None:
+        await log_writer.start()
+        logger.info(f"Write-behind audit logging ({settings.LOG_QUEUE_FULL_POLICY})")
+
+    log_retention = get_log_retention()
+    if log_retention is not None:
+        log_retention.start(settings.LOG_RETENTION_INTERVAL_SECONDS)
+        logger.info(
+            f"Archiving prediction logs after {settings.LOG_RETENTION_DAYS} days"
+        )
+
+    if settings.WARMUP_REQUESTS > 0:
+        try:
+            with startup_report.phase("warmup"):
+                await warm_up(settings.WARMUP_REQUESTS, _startup_bind(app))
+        except Exception as e:
+            # A failed warm-up only costs latency; the model itself is loaded
+            logger.warning(f"Warm-up failed, first requests may be slow: {e}")
+            startup_report.warmup_error = str(e)
+
+    startup_report.ready = True
+    logger.info(f"Startup complete in {startup_report.summary()}")
 
     yield
 
+    startup_report.ready = False
     logger.info("Shutting down application...")
+    await model_manager.stop_watching()
+    batcher = get_batcher()
+    if batcher is not None:
+        await batcher.stop()
+    if log_retention is not None:
+        await log_retention.stop()
+    if key_filter is not None:
+        await key_filter.stop()
+    if log_writer is not None:
+        # Flush queued audit logs while the db executor is still up
+        await log_writer.stop()
+    shutdown_process_pool()
+    shutdown_executors()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 
 app = FastAPI(lifespan=lifespan, **fastapi_app_config)
@@ -134,6 +222,7 @@ async def http_exception_handler(request: Request, exc: HTTPException) -> JSONRe
     return JSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail, "correlation_id": correlation_id},
+        headers=getattr(exc, "headers", None),
     )
 
 
@@ -177,6 +266,7 @@ app.include_router(health_router, tags=["Health"])
 app.include_router(auth_router, prefix="/auth", tags=["Authentication"])
 app.include_router(predictions_router, prefix="/predict", tags=["Predictions"])
 app.include_router(logs_router, prefix="/logs", tags=["Prediction Logs"])
+app.include_router(admin_router, prefix="/admin", tags=["Admin"])
 
 
 @app.get("/", include_in_schema=False)
@@ -1,6 +1,22 @@
 """Machine Learning module for model loading and preprocessing."""
 
-from src.ml.model import load_model
-from src.ml.preprocessing import prepare_batch_features, prepare_features
+from src.ml.forest import CompiledForest
+from src.ml.model import load_engine, load_model
+from src.ml.preprocessing import (
+    encode_features,
+    encode_frame,
+    encode_one,
+    prepare_batch_features,
+    prepare_features,
+)
 
-__all__ = ["load_model", "prepare_features", "prepare_batch_features"]
+__all__ = [
+    "CompiledForest",
+    "encode_features",
+    "encode_frame",
+    "encode_one",
+    "load_engine",
+    "load_model",
+    "prepare_features",
+    "prepare_batch_features",
+]
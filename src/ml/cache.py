@@ -0,0 +1,126 @@
+"""Bounded LRU/TTL cache for model predictions."""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from src.config import settings
+from src.core.metrics import metrics
+
+# Approximate footprint of one entry: 16-byte key object, (value, expiry)
+# tuple of floats and the OrderedDict link.
+ENTRY_BYTES = 200
+
+cache_hits = metrics.counter("prediction_cache_hits", "Rows served from cache")
+cache_misses = metrics.counter("prediction_cache_misses", "Rows sent to the model")
+cache_evictions = metrics.counter(
+    "prediction_cache_evictions", "Entries evicted by size, TTL or model change"
+)
+cache_entries = metrics.gauge("prediction_cache_entries", "Entries currently cached")
+
+
+def row_keys(X: np.ndarray) -> list[bytes]:
+    """Hash each encoded row into a compact 16-byte key.
+
+    Rows are canonicalized to float32 (the precision the forest compares at)
+    with -0.0 folded into 0.0, so inputs the model cannot tell apart share a key.
+    """
+    canonical = np.ascontiguousarray(X, dtype=np.float32) + np.float32(0.0)
+    return [
+        hashlib.blake2b(row.tobytes(), digest_size=16).digest() for row in canonical
+    ]
+
+
+class PredictionCache:
+    """LRU cache of predictions with TTL expiry, scoped to one model version."""
+
+    def __init__(self, max_bytes: int, ttl_seconds: float) -> None:
+        self.max_entries = max(1, max_bytes // ENTRY_BYTES)
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[bytes, tuple[float, float]] = OrderedDict()
+        self._model_version: str | None = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _check_model(self, model_version: str) -> None:
+        if model_version != self._model_version:
+            cache_evictions.inc(len(self._entries))
+            self._entries.clear()
+            self._model_version = model_version
+
+    def lookup(
+        self, X: np.ndarray, model_version: str
+    ) -> tuple[np.ndarray, list[bytes], np.ndarray]:
+        """Look up every row of X.
+
+        Returns (values, keys, miss_mask); values are NaN where the row missed.
+        """
+        keys = row_keys(X)
+        values = np.full(len(keys), np.nan, dtype=np.float64)
+        now = time.monotonic()
+
+        with self._lock:
+            self._check_model(model_version)
+            for i, key in enumerate(keys):
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                value, expires_at = entry
+                if expires_at <= now:
+                    del self._entries[key]
+                    cache_evictions.inc()
+                    continue
+                self._entries.move_to_end(key)
+                values[i] = value
+            cache_entries.set(len(self._entries))
+
+        miss_mask = np.isnan(values)
+        n_misses = int(miss_mask.sum())
+        cache_misses.inc(n_misses)
+        cache_hits.inc(len(keys) - n_misses)
+        return values, keys, miss_mask
+
+    def store(self, keys: list[bytes], values: np.ndarray, model_version: str) -> None:
+        """Insert predictions, evicting least recently used entries over capacity."""
+        expires_at = time.monotonic() + self.ttl_seconds
+
+        with self._lock:
+            if model_version != self._model_version:
+                # Finished on a model that has since been swapped out
+                return
+            for key, value in zip(keys, values, strict=True):
+                self._entries[key] = (float(value), expires_at)
+                self._entries.move_to_end(key)
+
+            overflow = len(self._entries) - self.max_entries
+            for _ in range(max(0, overflow)):
+                self._entries.popitem(last=False)
+            if overflow > 0:
+                cache_evictions.inc(overflow)
+            cache_entries.set(len(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            cache_entries.set(0)
+
+
+_cache: PredictionCache | None = None
+
+
+def get_prediction_cache() -> PredictionCache | None:
+    """Return the process-wide cache, or None when caching is disabled."""
+    global _cache
+    if not settings.PREDICTION_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = PredictionCache(
+            max_bytes=settings.PREDICTION_CACHE_MAX_BYTES,
+            ttl_seconds=settings.PREDICTION_CACHE_TTL_SECONDS,
+        )
+    return _cache
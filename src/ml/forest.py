@@ -0,0 +1,175 @@
+"""Array-backed compiled forest for fast RandomForestRegressor inference."""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.core.exceptions import ModelLoadError
+
+logger = logging.getLogger(__name__)
+
+_NODE_ARRAYS = ("feature", "threshold", "left", "value", "roots")
+
+
+class CompiledForest:
+    """Flattened, vectorized representation of a fitted RandomForestRegressor.
+
+    All trees are packed into contiguous node arrays with global child indices,
+    so a whole batch is evaluated against every tree in one traversal loop of
+    ``max_depth`` steps. Nodes are renumbered breadth-first so that the right
+    child always follows the left one, and leaves point to themselves with an
+    infinite threshold, which lets every step be a single branch-free
+    ``left[node] + (x > threshold[node])`` without masking.
+
+    Inputs are cast to float32 exactly like sklearn does before walking the
+    trees, while thresholds and leaf values stay float64: narrowing those could
+    flip a split or change the mean, so outputs match ``model.predict`` bit for
+    bit.
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        value: np.ndarray,
+        roots: np.ndarray,
+        max_depth: int,
+        n_features: int,
+    ) -> None:
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.n_features_in_ = n_features
+
+    @classmethod
+    def from_estimator(cls, model: Any) -> "CompiledForest":
+        """Compile a fitted single-output RandomForestRegressor."""
+        estimators = getattr(model, "estimators_", None)
+        if not estimators:
+            raise ModelLoadError("Model is not a fitted tree ensemble")
+        if getattr(model, "n_outputs_", 1) != 1:
+            raise ModelLoadError("Only single-output forests can be compiled")
+
+        features, thresholds, lefts, values, roots = [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for estimator in estimators:
+            tree = estimator.tree_
+            order, left = _breadth_first_layout(tree.children_left, tree.children_right)
+            is_leaf = tree.children_left[order] == -1
+
+            features.append(np.where(is_leaf, 0, tree.feature[order]))
+            thresholds.append(np.where(is_leaf, np.inf, tree.threshold[order]))
+            lefts.append(left + offset)
+            values.append(tree.value[order, 0, 0])
+            roots.append(offset)
+
+            max_depth = max(max_depth, int(tree.max_depth))
+            offset += len(order)
+
+        logger.info(
+            f"Compiled forest: {len(estimators)} trees, {offset} nodes, "
+            f"max depth {max_depth}"
+        )
+        return cls(
+            feature=np.concatenate(features).astype(np.int32),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            left=np.concatenate(lefts).astype(np.int32),
+            value=np.concatenate(values).astype(np.float64),
+            roots=np.asarray(roots, dtype=np.int32),
+            max_depth=max_depth,
+            n_features=int(model.n_features_in_),
+        )
+
+    def save(self, directory: str | Path) -> None:
+        """Write node arrays as raw .npy files that can be memory-mapped."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in _NODE_ARRAYS:
+            np.save(directory / f"{name}.npy", getattr(self, name))
+        meta = {"max_depth": self.max_depth, "n_features": self.n_features_in_}
+        (directory / "meta.json").write_text(json.dumps(meta))
+
+    @classmethod
+    def load(
+        cls, directory: str | Path, mmap_mode: str | None = "r"
+    ) -> "CompiledForest":
+        """Load a saved forest; with mmap_mode the OS page cache is shared."""
+        directory = Path(directory)
+        meta = json.loads((directory / "meta.json").read_text())
+        arrays = {
+            name: np.load(directory / f"{name}.npy", mmap_mode=mmap_mode)
+            for name in _NODE_ARRAYS
+        }
+        return cls(**arrays, max_depth=meta["max_depth"], n_features=meta["n_features"])
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.feature)
+
+    def apply(self, X: Any) -> np.ndarray:
+        """Return global leaf indices with shape (n_trees, n_samples)."""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"Expected input of shape (n, {self.n_features_in_}), got {X.shape}"
+            )
+
+        n_samples = X.shape[0]
+        flat_X = X.ravel()
+        row_base = (np.arange(n_samples, dtype=np.intp) * self.n_features_in_)[None, :]
+        nodes = np.repeat(self.roots[:, None], n_samples, axis=1)
+
+        for _ in range(self.max_depth):
+            go_right = flat_X[row_base + self.feature[nodes]] > self.threshold[nodes]
+            nodes = self.left[nodes] + go_right
+
+        return nodes
+
+    def predict(self, X: Any) -> np.ndarray:
+        """Predict with the same accumulation order as sklearn's forest."""
+        leaf_values = self.value[self.apply(X)]
+        y_hat = np.zeros(leaf_values.shape[1], dtype=np.float64)
+        for tree_values in leaf_values:
+            y_hat += tree_values
+        y_hat /= self.n_trees
+        return y_hat
+
+
+def _breadth_first_layout(
+    children_left: np.ndarray, children_right: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Order a tree's nodes so that siblings are adjacent.
+
+    Returns the original node ids in their new order and, for each new position,
+    the new id of its left child (right child is ``left + 1``; leaves point to
+    themselves).
+    """
+    levels = []
+    frontier = np.array([0], dtype=np.intp)
+    while frontier.size:
+        levels.append(frontier)
+        internal = frontier[children_left[frontier] != -1]
+        frontier = np.stack(
+            (children_left[internal], children_right[internal]), axis=1
+        ).ravel()
+
+    order = np.concatenate(levels)
+    new_id = np.empty_like(order)
+    new_id[order] = np.arange(len(order))
+
+    old_left = children_left[order]
+    left = np.where(old_left == -1, np.arange(len(order)), new_id[old_left])
+    return order, left
@@ -0,0 +1,183 @@
+"""Inference backends: thread executor or a pool of worker processes."""
+
+import asyncio
+import logging
+import multiprocessing
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.config import settings
+from src.core.exceptions import ExecutorSaturatedError
+from src.core.executors import get_inference_executor
+from src.core.metrics import metrics
+from src.ml.forest import CompiledForest
+
+logger = logging.getLogger(__name__)
+
+pool_pending = metrics.gauge(
+    "process_pool_pending", "Inference tasks submitted to worker processes"
+)
+pool_rejected = metrics.counter(
+    "process_pool_rejected", "Inference tasks rejected because the pool was full"
+)
+
+# Per-worker cache of memory-mapped forests, keyed by artifact directory
+_worker_forests: dict[str, CompiledForest] = {}
+
+
+def _worker_predict(artifact_dir: str, X: np.ndarray) -> np.ndarray:
+    forest = _worker_forests.get(artifact_dir)
+    if forest is None:
+        forest = CompiledForest.load(artifact_dir, mmap_mode="r")
+        if len(_worker_forests) >= 2:
+            _worker_forests.pop(next(iter(_worker_forests)))
+        _worker_forests[artifact_dir] = forest
+    return forest.predict(X)
+
+
+def process_memory(pid: int) -> dict[str, int]:
+    """RSS and PSS in KiB for a process (Linux /proc; zeros elsewhere)."""
+    usage = {"pid": pid, "rss_kb": 0, "pss_kb": 0}
+    try:
+        for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines():
+            key, _, value = line.partition(":")
+            if key in ("Rss", "Pss"):
+                usage[f"{key.lower()}_kb"] = int(value.split()[0])
+    except OSError:
+        pass
+    return usage
+
+
+_exported: dict[str, str] = {}
+
+
+def export_forest(forest: CompiledForest, model_version: str) -> str:
+    """Write the forest's node arrays once per model version for memory-mapping."""
+    if model_version in _exported:
+        return _exported[model_version]
+
+    target = Path(settings.MODEL_MMAP_DIR) / model_version
+    if not (target / "meta.json").exists():
+        target.parent.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(dir=target.parent, prefix=".staging-"))
+        forest.save(staging)
+        try:
+            staging.rename(target)
+        except OSError:
+            # Another process exported the same version first
+            shutil.rmtree(staging, ignore_errors=True)
+    _exported[model_version] = str(target)
+    return str(target)
+
+
+class ProcessInferencePool:
+    """Pool of worker processes scoring against one memory-mapped forest.
+
+    Workers open the exported ``.npy`` node arrays with ``mmap_mode="r"``, so
+    the tree arrays live in the OS page cache once no matter how many workers
+    run. Feature matrices and predictions cross the process boundary as
+    pickled arrays (a single buffer copy each way).
+    """
+
+    def __init__(self, n_workers: int, max_queue: int) -> None:
+        self.n_workers = n_workers
+        self.max_queue = max_queue
+        self._pool = ProcessPoolExecutor(
+            max_workers=n_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> None:
+        with self._lock:
+            if self._pending >= self.n_workers + self.max_queue:
+                pool_rejected.inc()
+                raise ExecutorSaturatedError("Inference process pool is saturated")
+            self._pending += 1
+            pool_pending.set(self._pending)
+
+    def _release(self, _: Any = None) -> None:
+        with self._lock:
+            self._pending -= 1
+            pool_pending.set(self._pending)
+
+    async def predict(self, artifact_dir: str, X: np.ndarray) -> np.ndarray:
+        self._reserve()
+        future = self._pool.submit(_worker_predict, artifact_dir, X)
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def warm(self, artifact_dir: str, n_features: int) -> None:
+        """Start every worker and map the forest before taking traffic."""
+        X = np.zeros((1, n_features))
+        futures = [
+            self._pool.submit(_worker_predict, artifact_dir, X)
+            for _ in range(self.n_workers * 2)
+        ]
+        for future in futures:
+            future.result()
+
+    def worker_pids(self) -> list[int]:
+        # ProcessPoolExecutor has no public accessor for its worker processes
+        return sorted(self._pool._processes or {})
+
+    def memory_report(self) -> list[dict[str, int]]:
+        return [process_memory(pid) for pid in self.worker_pids()]
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+_pool: ProcessInferencePool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_process_pool() -> ProcessInferencePool | None:
+    """Return the worker pool when INFERENCE_BACKEND=process, else None."""
+    global _pool
+    if settings.INFERENCE_BACKEND != "process":
+        return None
+    with _pool_lock:
+        if _pool is None:
+            n_workers = settings.inference_concurrency
+            _pool = ProcessInferencePool(n_workers, settings.INFERENCE_QUEUE_SIZE)
+            logger.info(f"Started inference process pool with {n_workers} workers")
+        return _pool
+
+
+def shutdown_process_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
+
+
+async def run_inference(model: Any, model_version: str, X: np.ndarray) -> np.ndarray:
+    """Score X on the configured backend without blocking the event loop."""
+    pool = get_process_pool()
+    if pool is not None and isinstance(model, CompiledForest):
+        return await pool.predict(export_forest(model, model_version), X)
+    return await get_inference_executor().run(model.predict, X)
+
+
+def start_process_pool(model: Any, model_version: str) -> None:
+    """Spawn worker processes and map the forest when the process backend is on."""
+    pool = get_process_pool()
+    if pool is None:
+        return
+    if not isinstance(model, CompiledForest):
+        logger.warning("Process backend needs a compiled forest; using threads")
+        return
+    pool.warm(export_forest(model, model_version), model.n_features_in_)
+    for usage in pool.memory_report():
+        logger.info(
+            f"Inference worker {usage['pid']}: RSS {usage['rss_kb'] / 1024:.1f} MiB, "
+            f"PSS {usage['pss_kb'] / 1024:.1f} MiB"
+        )
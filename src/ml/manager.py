@@ -0,0 +1,227 @@
+"""Versioned model handles with background hot reload."""
+
+import asyncio
+import hashlib
+import io
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import joblib
+import numpy as np
+
+from src.config import settings
+from src.constants import ALL_FEATURE_COLUMNS
+from src.core.exceptions import ModelLoadError
+from src.core.metrics import metrics
+from src.ml.forest import CompiledForest
+from src.ml.inference import start_process_pool
+
+logger = logging.getLogger(__name__)
+
+reloads = metrics.counter("model_reloads", "Model versions swapped in at runtime")
+reload_failures = metrics.counter(
+    "model_reload_failures", "Reloads rejected by loading or validation"
+)
+reload_seconds = metrics.histogram(
+    "model_reload_seconds", "Load, validate and warm time per reload"
+)
+
+# Rows pushed through a new model before it takes traffic
+WARMUP_ROWS = 64
+
+
+@dataclass(frozen=True)
+class ModelHandle:
+    """One loaded model version. Requests keep their handle until they finish."""
+
+    version: str
+    model: Any
+    engine: Any
+    path: str
+    file_stat: tuple[int, int]
+    loaded_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+
+
+def _file_stat(path: Path) -> tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _validate(model: Any) -> None:
+    n_features = getattr(model, "n_features_in_", None)
+    if n_features != len(ALL_FEATURE_COLUMNS):
+        raise ModelLoadError(
+            f"Model expects {n_features} features, API sends {len(ALL_FEATURE_COLUMNS)}"
+        )
+    names = getattr(model, "feature_names_in_", None)
+    if names is not None and list(names) != ALL_FEATURE_COLUMNS:
+        raise ModelLoadError(f"Model feature names do not match: {list(names)}")
+
+
+def _build_engine(model: Any) -> Any:
+    if not settings.COMPILED_FOREST_ENABLED:
+        return model
+    try:
+        return CompiledForest.from_estimator(model)
+    except ModelLoadError as e:
+        logger.warning(f"Using sklearn estimator for inference: {e}")
+        return model
+
+
+def _warm(engine: Any) -> None:
+    X = np.zeros((WARMUP_ROWS, len(ALL_FEATURE_COLUMNS)))
+    X[:, len(ALL_FEATURE_COLUMNS) - 1] = 1.0
+    if not np.isfinite(engine.predict(X)).all():
+        raise ModelLoadError("Model returned non-finite predictions during warm-up")
+
+
+def load_handle(path: str | Path) -> ModelHandle:
+    """Load, validate and warm the artifact at path (blocking)."""
+    model_path = Path(path)
+    if not model_path.exists():
+        raise ModelLoadError(f"Model file not found: {model_path}")
+
+    try:
+        logger.info(f"Loading model from: {model_path}")
+        file_stat = _file_stat(model_path)
+        artifact = model_path.read_bytes()
+        model = joblib.load(io.BytesIO(artifact))
+    except Exception as e:
+        logger.error(f"Failed to load model: {e}")
+        raise ModelLoadError(f"Failed to load model: {e}") from e
+
+    _validate(model)
+    engine = _build_engine(model)
+    _warm(engine)
+    return ModelHandle(
+        version=hashlib.sha256(artifact).hexdigest()[:12],
+        model=model,
+        engine=engine,
+        path=str(model_path),
+        file_stat=file_stat,
+    )
+
+
+class ModelManager:
+    """Owns the model version currently serving traffic.
+
+    ``current`` is a plain attribute read, so a reload never blocks requests:
+    the new artifact is loaded, validated and warmed off the event loop and
+    then swapped in with a single assignment. Requests that captured the old
+    handle finish on it.
+    """
+
+    def __init__(self) -> None:
+        self._handle: ModelHandle | None = None
+        self._init_lock = threading.Lock()
+        self._reload_lock: asyncio.Lock | None = None
+        self._reload_loop: asyncio.AbstractEventLoop | None = None
+        self._watch_task: asyncio.Task | None = None
+        self._last_seen_stat: tuple[int, int] | None = None
+
+    @property
+    def current(self) -> ModelHandle:
+        """The serving handle, loading MODEL_PATH on first use."""
+        handle = self._handle
+        if handle is None:
+            with self._init_lock:
+                if self._handle is None:
+                    self._install(load_handle(settings.MODEL_PATH))
+                handle = self._handle
+        return handle
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._handle is not None
+
+    def _install(self, handle: ModelHandle) -> None:
+        # Map the new forest into worker processes before it takes traffic
+        start_process_pool(handle.engine, handle.version)
+        self._handle = handle
+        self._last_seen_stat = handle.file_stat
+
+    async def reload(self, force: bool = False) -> tuple[ModelHandle, bool]:
+        """Load MODEL_PATH in the background and swap it in.
+
+        Returns (handle, swapped). An artifact with the serving version's
+        content is not swapped unless ``force`` is set. On failure the old
+        handle keeps serving and ModelLoadError is raised.
+        """
+        loop = asyncio.get_running_loop()
+        if self._reload_loop is not loop:
+            self._reload_lock = asyncio.Lock()
+            self._reload_loop = loop
+
+        async with self._reload_lock:
+            previous = self._handle
+            start = time.perf_counter()
+            try:
+                handle = await asyncio.to_thread(load_handle, settings.MODEL_PATH)
+            except ModelLoadError:
+                reload_failures.inc()
+                raise
+
+            if (
+                previous is not None
+                and handle.version == previous.version
+                and not force
+            ):
+                self._last_seen_stat = handle.file_stat
+                return previous, False
+
+            await asyncio.to_thread(self._install, handle)
+            reload_seconds.observe(time.perf_counter() - start)
+            reloads.inc()
+            logger.info(
+                f"Model {handle.version} now serving "
+                f"(was {previous.version if previous else 'none'})"
+            )
+            return handle, True
+
+    async def _watch(self, interval: float) -> None:
+        path = Path(settings.MODEL_PATH)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                stat = _file_stat(path)
+            except OSError:
+                continue
+            if stat == self._last_seen_stat:
+                continue
+
+            # Remember the attempt so a bad artifact is retried only once rewritten
+            self._last_seen_stat = stat
+            logger.info(f"Detected change to {path}, reloading model")
+            try:
+                await self.reload()
+            except ModelLoadError as e:
+                logger.error(f"Keeping current model, reload failed: {e}")
+
+    def start_watching(self, interval: float) -> None:
+        """Poll MODEL_PATH every ``interval`` seconds and reload on change."""
+        if interval <= 0 or self._watch_task is not None:
+            return
+        self._watch_task = asyncio.get_running_loop().create_task(self._watch(interval))
+
+    async def stop_watching(self) -> None:
+        if self._watch_task is None:
+            return
+        self._watch_task.cancel()
+        try:
+            await self._watch_task
+        except asyncio.CancelledError:
+            pass
+        self._watch_task = None
+
+
+_manager = ModelManager()
+
+
+def get_model_manager() -> ModelManager:
+    """Return the process-wide model manager."""
+    return _manager
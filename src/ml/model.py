@@ -1,29 +1,24 @@
-"""ML model loading and caching."""
+"""ML model access for code that does not hold a model handle."""
 
-import logging
-from functools import lru_cache
-from pathlib import Path
+from typing import Any
 
-import joblib
+from src.ml.manager import get_model_manager
 
-from src.config import settings
-from src.core.exceptions import ModelLoadError
 
-logger = logging.getLogger(__name__)
+def load_model() -> Any:
+    """Return the serving sklearn estimator, loading it on first use."""
+    return get_model_manager().current.model
 
 
-@lru_cache(maxsize=1)
-def load_model():
-    """Load the ML model from disk. Cached to load only once."""
-    model_path = Path(settings.MODEL_PATH)
+def get_model_version() -> str:
+    """Content fingerprint of the serving model artifact."""
+    return get_model_manager().current.version
 
-    if not model_path.exists():
-        raise ModelLoadError(f"Model file not found: {model_path}")
 
-    try:
-        logger.info(f"Loading model from: {model_path}")
-        model = joblib.load(model_path)
-        return model
-    except Exception as e:
-        logger.error(f"Failed to load model: {e}")
-        raise ModelLoadError(f"Failed to load model: {e}") from e
+def load_engine() -> Any:
+    """Return the inference engine for the serving model.
+
+    The fitted forest is compiled once into flat node arrays. Falls back to the
+    sklearn estimator when compilation is disabled or the model is unsupported.
+    """
+    return get_model_manager().current.engine
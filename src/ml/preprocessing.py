@@ -1,9 +1,91 @@
 """Feature engineering and preprocessing for ML model input."""
 
+from itertools import chain
+from operator import attrgetter
+
+import numpy as np
 import pandas as pd
 
-from src.constants import ALL_FEATURE_COLUMNS, OCEAN_PROXIMITY_COLUMNS
-from src.predictions.schema import HouseFeatures
+from src.constants import ALL_FEATURE_COLUMNS, NUMERIC_FEATURES, OCEAN_PROXIMITY_COLUMNS
+from src.predictions.schema import HouseFeatures, OceanProximity
+
+N_FEATURES = len(ALL_FEATURE_COLUMNS)
+N_NUMERIC = len(NUMERIC_FEATURES)
+
+_numeric_values = attrgetter(*NUMERIC_FEATURES)
+
+# Column index of each category's one-hot slot, resolved once at import
+OCEAN_COLUMN_INDEX: dict[OceanProximity, int] = {
+    OceanProximity(col.removeprefix("ocean_proximity_")): ALL_FEATURE_COLUMNS.index(col)
+    for col in OCEAN_PROXIMITY_COLUMNS
+}
+
+if ALL_FEATURE_COLUMNS[:N_NUMERIC] != NUMERIC_FEATURES:
+    raise RuntimeError("Numeric features must lead ALL_FEATURE_COLUMNS")
+
+
+def encode_features(
+    features_list: list[HouseFeatures], out: np.ndarray | None = None
+) -> np.ndarray:
+    """Encode houses into a C-contiguous float64 matrix in model column order.
+
+    Pass ``out`` to reuse a preallocated ``(n, N_FEATURES)`` buffer.
+    """
+    n_rows = len(features_list)
+    if out is None:
+        X = np.zeros((n_rows, N_FEATURES), dtype=np.float64)
+    else:
+        if out.shape != (n_rows, N_FEATURES) or not out.flags["C_CONTIGUOUS"]:
+            raise ValueError(f"out must be C-contiguous ({n_rows}, {N_FEATURES})")
+        X = out
+        X[:, N_NUMERIC:] = 0.0
+
+    X[:, :N_NUMERIC] = np.fromiter(
+        chain.from_iterable(map(_numeric_values, features_list)),
+        dtype=np.float64,
+        count=n_rows * N_NUMERIC,
+    ).reshape(n_rows, N_NUMERIC)
+
+    one_hot_cols = np.fromiter(
+        (OCEAN_COLUMN_INDEX[f.ocean_proximity] for f in features_list),
+        dtype=np.intp,
+        count=n_rows,
+    )
+    X[np.arange(n_rows), one_hot_cols] = 1.0
+    return X
+
+
+def encode_one(features: HouseFeatures) -> np.ndarray:
+    """Encode a single house into a (1, N_FEATURES) matrix."""
+    X = np.zeros((1, N_FEATURES), dtype=np.float64)
+    X[0, :N_NUMERIC] = _numeric_values(features)
+    X[0, OCEAN_COLUMN_INDEX[features.ocean_proximity]] = 1.0
+    return X
+
+
+def encode_frame(df: pd.DataFrame) -> np.ndarray:
+    """Encode a raw housing.csv-shaped DataFrame into model column order.
+
+    Missing or non-numeric values become NaN and unknown ``ocean_proximity``
+    values leave the one-hot block empty; use ``valid_rows`` to mask them.
+    """
+    n_rows = len(df)
+    X = np.zeros((n_rows, N_FEATURES), dtype=np.float64)
+    for i, col in enumerate(NUMERIC_FEATURES):
+        X[:, i] = pd.to_numeric(df[col], errors="coerce").to_numpy(np.float64)
+
+    categories = {category.value: col for category, col in OCEAN_COLUMN_INDEX.items()}
+    one_hot_cols = df["ocean_proximity"].map(categories).to_numpy()
+    known = pd.notna(one_hot_cols)
+    X[np.flatnonzero(known), one_hot_cols[known].astype(np.intp)] = 1.0
+    return X
+
+
+def valid_rows(X: np.ndarray) -> np.ndarray:
+    """Boolean mask of encoded rows with finite numerics and one category."""
+    return np.isfinite(X[:, :N_NUMERIC]).all(axis=1) & (
+        X[:, N_NUMERIC:].sum(axis=1) == 1
+    )
 
 
 def prepare_features(features: HouseFeatures) -> pd.DataFrame:
@@ -0,0 +1,248 @@
+"""Offline batch scoring of housing.csv-shaped CSV/Parquet files.
+
+Usage:
+    python -m src.ml.scoring INPUT OUTPUT [--chunk-rows 100000] [--workers N]
+                             [--resume] [--model PATH]
+
+The input is read in chunks that are scored in parallel by a process pool
+(each worker loads the model once). Every finished chunk is written to
+``OUTPUT.parts/`` so an interrupted run can continue with ``--resume``; the
+parts are then assembled into OUTPUT in input order. Rows with missing or
+invalid features get an empty prediction.
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import resource
+import shutil
+import sys
+import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.config import settings
+from src.ml.model import load_engine
+from src.ml.preprocessing import encode_frame, valid_rows
+
+logger = logging.getLogger(__name__)
+
+PREDICTION_COLUMN = "predicted_price"
+MANIFEST = "manifest.json"
+
+
+def _file_format(path: Path) -> str:
+    return "parquet" if path.suffix.lower() in (".parquet", ".pq") else "csv"
+
+
+def _require_pyarrow() -> None:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise SystemExit("Parquet support requires pyarrow: pip install pyarrow") from e
+
+
+def read_chunks(path: Path, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """Yield the input file as DataFrames of at most chunk_rows rows."""
+    if _file_format(path) == "parquet":
+        _require_pyarrow()
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_rows)
+
+
+def _part_path(parts_dir: Path, index: int, fmt: str) -> Path:
+    return parts_dir / f"part-{index:06d}.{fmt}"
+
+
+def _init_worker(model_path: str) -> None:
+    settings.MODEL_PATH = model_path
+    # Workers score in-process; they must not start their own process pool
+    settings.INFERENCE_BACKEND = "thread"
+    load_engine()
+
+
+def score_chunk(df: pd.DataFrame, part_path: str) -> int:
+    """Score one chunk in a worker and write it atomically as a part file."""
+    X = encode_frame(df)
+    valid = valid_rows(X)
+    predictions = np.full(len(df), np.nan)
+    if valid.any():
+        predictions[valid] = load_engine().predict(np.ascontiguousarray(X[valid]))
+    df[PREDICTION_COLUMN] = predictions.round(8)
+
+    target = Path(part_path)
+    staging = target.with_name(f".{target.name}.tmp")
+    if target.suffix == ".parquet":
+        df.to_parquet(staging, index=False)
+    else:
+        df.to_csv(staging, index=False, header=False)
+    staging.rename(target)
+    return len(df)
+
+
+def _prepare_parts(
+    input_path: Path, output_path: Path, chunk_rows: int, resume: bool
+) -> Path:
+    """Create (or validate, when resuming) the part directory for a run."""
+    parts_dir = output_path.with_name(output_path.name + ".parts")
+    stat = input_path.stat()
+    manifest = {
+        "input": str(input_path.resolve()),
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+        "chunk_rows": chunk_rows,
+    }
+
+    manifest_path = parts_dir / MANIFEST
+    if resume and manifest_path.exists():
+        if json.loads(manifest_path.read_text()) != manifest:
+            raise SystemExit(
+                f"{parts_dir} was written for a different input or chunk size; "
+                "rerun without --resume"
+            )
+        return parts_dir
+
+    shutil.rmtree(parts_dir, ignore_errors=True)
+    parts_dir.mkdir(parents=True)
+    manifest_path.write_text(json.dumps(manifest))
+    return parts_dir
+
+
+def _assemble(parts: list[Path], output_path: Path, columns: list[str]) -> None:
+    """Concatenate part files into the final output in chunk order."""
+    staging = output_path.with_name(f".{output_path.name}.tmp")
+    if _file_format(output_path) == "parquet":
+        import pyarrow.parquet as pq
+
+        writer = None
+        for part in parts:
+            table = pq.read_table(part)
+            if writer is None:
+                writer = pq.ParquetWriter(staging, table.schema)
+            writer.write_table(table)
+        if writer is not None:
+            writer.close()
+    else:
+        with open(staging, "wb") as out:
+            out.write((",".join(columns) + "\n").encode())
+            for part in parts:
+                with open(part, "rb") as src:
+                    shutil.copyfileobj(src, out)
+    staging.replace(output_path)
+
+
+def _peak_rss_mb() -> tuple[float, float]:
+    # ru_maxrss is reported in KiB on Linux
+    parent = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    worker = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+    return parent, worker
+
+
+def score_file(
+    input_path: Path,
+    output_path: Path,
+    chunk_rows: int = 100_000,
+    workers: int | None = None,
+    resume: bool = False,
+    model_path: str | None = None,
+) -> dict[str, float]:
+    """Score input_path into output_path and return throughput statistics."""
+    if _file_format(input_path) == "parquet" or _file_format(output_path) == "parquet":
+        _require_pyarrow()
+
+    workers = workers or os.cpu_count() or 1
+    part_format = _file_format(output_path)
+    parts_dir = _prepare_parts(input_path, output_path, chunk_rows, resume)
+
+    start = time.perf_counter()
+    scored_rows = skipped_chunks = 0
+    parts: list[Path] = []
+    columns: list[str] = []
+    inflight: deque[Future] = deque()
+
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(model_path or settings.MODEL_PATH,),
+    )
+    with pool:
+        for index, chunk in enumerate(read_chunks(input_path, chunk_rows)):
+            if not columns:
+                columns = [*chunk.columns, PREDICTION_COLUMN]
+            part = _part_path(parts_dir, index, part_format)
+            parts.append(part)
+            if resume and part.exists():
+                skipped_chunks += 1
+                continue
+
+            # Keep at most two chunks per worker in flight to bound memory
+            while len(inflight) >= workers * 2:
+                scored_rows += inflight.popleft().result()
+            inflight.append(pool.submit(score_chunk, chunk, str(part)))
+            logger.info(f"Submitted chunk {index} ({len(chunk)} rows)")
+
+        while inflight:
+            scored_rows += inflight.popleft().result()
+
+    _assemble(parts, output_path, columns)
+    shutil.rmtree(parts_dir)
+
+    elapsed = time.perf_counter() - start
+    parent_mb, worker_mb = _peak_rss_mb()
+    return {
+        "chunks": len(parts),
+        "resumed_chunks": skipped_chunks,
+        "rows": scored_rows,
+        "seconds": elapsed,
+        "rows_per_second": scored_rows / elapsed if elapsed else 0.0,
+        "peak_rss_mb": parent_mb,
+        "peak_worker_rss_mb": worker_mb,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Score a housing CSV/Parquet file in parallel chunks."
+    )
+    parser.add_argument("input", type=Path)
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--chunk-rows", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--resume", action="store_true")
+    parser.add_argument("--model", default=None, help="Defaults to MODEL_PATH")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        stream=sys.stderr, level=settings.LOG_LEVEL, format="%(asctime)s %(message)s"
+    )
+    stats = score_file(
+        args.input,
+        args.output,
+        chunk_rows=args.chunk_rows,
+        workers=args.workers,
+        resume=args.resume,
+        model_path=args.model,
+    )
+    print(
+        f"Scored {stats['rows']:,} rows in {stats['chunks']} chunks "
+        f"({stats['resumed_chunks']} resumed) in {stats['seconds']:.1f}s: "
+        f"{stats['rows_per_second']:,.0f} rows/s, peak RSS "
+        f"{stats['peak_rss_mb']:.0f} MiB (parent) / "
+        f"{stats['peak_worker_rss_mb']:.0f} MiB (largest worker)"
+    )
+
+
+if __name__ == "__main__":
+    main()
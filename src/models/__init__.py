@@ -12,11 +12,15 @@ from src.models.common import (
     TimestampWithDeleteMixin,
     UpdatedAt,
 )
+from src.models.prediction_batch import PredictionBatch
 from src.models.prediction_log import PredictionLog
+from src.models.prediction_stat import PredictionStat
 
 __all__ = [
     "APIKey",
+    "PredictionBatch",
     "PredictionLog",
+    "PredictionStat",
     "IntPK",
     "StringPK",
     "CreatedAt",
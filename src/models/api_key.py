@@ -2,7 +2,7 @@
 
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, String
+from sqlalchemy import Boolean, Index, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.core.database import Base
@@ -13,14 +13,27 @@ if TYPE_CHECKING:
 
 
 class APIKey(Base, TimestampWithDeleteMixin):
-    """Stores API keys for authentication. Keys are hashed, never stored in plain text."""
+    """Stores API keys for authentication. Keys are hashed, never stored in plain text.
+
+    Keys are looked up by ``key_digest`` (HMAC-SHA256). Rows created before
+    it existed only have a bcrypt ``key_hash`` until their next successful use.
+    """
 
     __tablename__ = "api_keys"
+    __table_args__ = (
+        # max(updated_at): the API key filter's "has the table changed" check
+        Index("ix_api_keys_updated_at", "updated_at"),
+    )
 
     id: Mapped[IntPK]
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     description: Mapped[str | None] = mapped_column(String(500), nullable=True)
-    key_hash: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
+    key_hash: Mapped[str | None] = mapped_column(
+        String(255), nullable=True, unique=True
+    )
+    key_digest: Mapped[str | None] = mapped_column(
+        String(64), nullable=True, unique=True, index=True
+    )
     key_prefix: Mapped[str] = mapped_column(String(8), nullable=False, index=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, index=True)
 
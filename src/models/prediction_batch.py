@@ -0,0 +1,39 @@
+"""Prediction Batch model: the shared fields of one batch request."""
+
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from src.core.database import Base
+from src.models.common import IntPK
+
+if TYPE_CHECKING:
+    from src.models.prediction_log import PredictionLog
+
+
+class PredictionBatch(Base):
+    """Header row of a /predict/batch request.
+
+    Its prediction_logs rows point here instead of each repeating the key,
+    batch id, response time and model version.
+    """
+
+    __tablename__ = "prediction_batches"
+
+    id: Mapped[IntPK]
+    batch_id: Mapped[str] = mapped_column(String(36), nullable=False, unique=True)
+    api_key_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("api_keys.id", ondelete="SET NULL"), nullable=True
+    )
+    response_time_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    model_version: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+
+    logs: Mapped[list["PredictionLog"]] = relationship(
+        "PredictionLog", back_populates="batch"
+    )
+
+    def __repr__(self) -> str:
+        return f"<PredictionBatch(id={self.id}, batch_id='{self.batch_id}')>"
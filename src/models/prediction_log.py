@@ -2,38 +2,148 @@
 
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import Float, ForeignKey, Integer, String
-from sqlalchemy.dialects.sqlite import JSON
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import (
+    ColumnElement,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    case,
+    func,
+    select,
+)
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import InstrumentedAttribute, Mapped, mapped_column, relationship
 
+from src.constants import NUMERIC_FEATURES
 from src.core.database import Base
 from src.models.common import IntPK, TimestampMixin
+from src.models.prediction_batch import PredictionBatch
 
 if TYPE_CHECKING:
     from src.models.api_key import APIKey
 
+# Input features stored as typed columns, in HouseFeatures order
+FEATURE_COLUMNS: list[str] = [*NUMERIC_FEATURES, "ocean_proximity"]
+
+
+def _batch_field(cls: type, column: InstrumentedAttribute) -> ColumnElement:
+    return (
+        select(column)
+        .where(PredictionBatch.id == cls.prediction_batch_id)
+        .scalar_subquery()
+    )
+
 
 class PredictionLog(Base, TimestampMixin):
     """Stores prediction requests and results for audit trail and analytics."""
 
     __tablename__ = "prediction_logs"
+    __table_args__ = (
+        # Keyset pagination of a key's logs (GET /logs); as a prefix it also
+        # serves plain api_key_id lookups
+        Index(
+            "ix_prediction_logs_api_key_created_id", "api_key_id", "created_at", "id"
+        ),
+        # /logs/search filters
+        Index("ix_prediction_logs_api_key_price", "api_key_id", "predicted_price"),
+        Index(
+            "ix_prediction_logs_api_key_ocean_created",
+            "api_key_id",
+            "ocean_proximity",
+            "created_at",
+        ),
+        Index(
+            "ix_prediction_logs_api_key_lat_lon", "api_key_id", "latitude", "longitude"
+        ),
+    )
 
     id: Mapped[IntPK]
     api_key_id: Mapped[int] = mapped_column(
         Integer,
         ForeignKey("api_keys.id", ondelete="SET NULL"),
         nullable=True,
-        index=True,
     )
-    input_features: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
     predicted_price: Mapped[float] = mapped_column(Float, nullable=False)
-    response_time_ms: Mapped[int] = mapped_column(Integer, nullable=True)
-    request_type: Mapped[str] = mapped_column(
-        String(10), default="single", nullable=False
+    # Batch rows leave these empty and read them from their batch header
+    prediction_batch_id: Mapped[int | None] = mapped_column(
+        Integer,
+        ForeignKey("prediction_batches.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True,
+    )
+    own_response_time_ms: Mapped[int | None] = mapped_column(
+        "response_time_ms", Integer, nullable=True
+    )
+    own_model_version: Mapped[str | None] = mapped_column(
+        "model_version", String(64), nullable=True, index=True
     )
-    batch_id: Mapped[str | None] = mapped_column(String(36), nullable=True, index=True)
+    # Input features (see FEATURE_COLUMNS); the search filters use them too
+    longitude: Mapped[float | None] = mapped_column(Float, nullable=True)
+    latitude: Mapped[float | None] = mapped_column(Float, nullable=True)
+    housing_median_age: Mapped[float | None] = mapped_column(Float, nullable=True)
+    total_rooms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    total_bedrooms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    population: Mapped[float | None] = mapped_column(Float, nullable=True)
+    households: Mapped[float | None] = mapped_column(Float, nullable=True)
+    median_income: Mapped[float | None] = mapped_column(Float, nullable=True)
+    ocean_proximity: Mapped[str | None] = mapped_column(String(20), nullable=True)
 
     api_key: Mapped["APIKey"] = relationship("APIKey", back_populates="prediction_logs")
+    batch: Mapped[PredictionBatch | None] = relationship(
+        "PredictionBatch", back_populates="logs", lazy="joined"
+    )
+
+    @property
+    def input_features(self) -> dict[str, Any]:
+        return {name: getattr(self, name) for name in FEATURE_COLUMNS}
+
+    # Batch fields, also usable in queries (as correlated subqueries)
+    @hybrid_property
+    def request_type(self) -> str:
+        return "single" if self.prediction_batch_id is None else "batch"
+
+    @request_type.inplace.expression
+    @classmethod
+    def _request_type_expression(cls) -> ColumnElement[str]:
+        return case((cls.prediction_batch_id.is_(None), "single"), else_="batch")
+
+    @hybrid_property
+    def batch_id(self) -> str | None:
+        return self.batch.batch_id if self.batch is not None else None
+
+    @batch_id.inplace.expression
+    @classmethod
+    def _batch_id_expression(cls) -> ColumnElement[str | None]:
+        return _batch_field(cls, PredictionBatch.batch_id)
+
+    @hybrid_property
+    def response_time_ms(self) -> int | None:
+        if self.batch is not None:
+            return self.batch.response_time_ms
+        return self.own_response_time_ms
+
+    @response_time_ms.inplace.expression
+    @classmethod
+    def _response_time_ms_expression(cls) -> ColumnElement[int | None]:
+        return func.coalesce(
+            _batch_field(cls, PredictionBatch.response_time_ms),
+            cls.own_response_time_ms,
+        )
+
+    @hybrid_property
+    def model_version(self) -> str | None:
+        if self.batch is not None:
+            return self.batch.model_version
+        return self.own_model_version
+
+    @model_version.inplace.expression
+    @classmethod
+    def _model_version_expression(cls) -> ColumnElement[str | None]:
+        return func.coalesce(
+            _batch_field(cls, PredictionBatch.model_version), cls.own_model_version
+        )
 
     def __repr__(self) -> str:
         return f"<PredictionLog(id={self.id}, price=${self.predicted_price:,.2f})>"
@@ -0,0 +1,32 @@
+"""Prediction Stat model: per-key, per-day prediction counters."""
+
+from datetime import date
+
+from sqlalchemy import BigInteger, Date, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.core.database import Base
+
+
+class PredictionStat(Base):
+    """Count of prediction logs per API key and UTC day.
+
+    Bumped in the same transaction as every log insert, so /logs/stats never
+    counts prediction_logs. ``api_key_id`` 0 holds logs without a key; a
+    hard-deleted key's rows are folded into it. ``api_key_id`` -1 holds each
+    day's total over all keys.
+    """
+
+    __tablename__ = "prediction_stats"
+
+    api_key_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    prediction_count: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"), nullable=False, default=0
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<PredictionStat(api_key_id={self.api_key_id}, day={self.day}, "
+            f"count={self.prediction_count})>"
+        )
@@ -0,0 +1,183 @@
+"""Micro-batching dispatcher that coalesces concurrent single predictions."""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from src.config import settings
+from src.core.metrics import metrics
+from src.ml.inference import run_inference
+from src.ml.manager import ModelHandle
+
+logger = logging.getLogger(__name__)
+
+batch_size_hist = metrics.histogram(
+    "prediction_batch_size", "Rows scored per coalesced model call"
+)
+batch_fill_hist = metrics.histogram(
+    "prediction_batch_fill_ratio", "Coalesced batch size / MICRO_BATCH_MAX_SIZE"
+)
+queue_wait_hist = metrics.histogram(
+    "prediction_queue_wait_ms", "Time a single prediction waited to be scored"
+)
+
+
+class _Pending(NamedTuple):
+    row: np.ndarray
+    model: Any
+    future: asyncio.Future
+    enqueued_at: float
+
+
+class MicroBatcher:
+    """Gathers concurrent single-row predictions into one model call.
+
+    Rows already queued are always taken together. The dispatcher only holds a
+    batch open for up to ``max_wait_ms`` when the previous batch coalesced more
+    than one row, so a lone request under light load is scored immediately.
+    At most ``max_concurrency`` batches are scored at once; while they run, new
+    rows accumulate into the next batch. Each row carries the model it must
+    be scored with; rows for different models share a batch but not a call.
+    """
+
+    def __init__(
+        self,
+        predict_fn: Callable[[Any, np.ndarray], Awaitable[np.ndarray]],
+        max_batch_size: int,
+        max_wait_ms: float,
+        max_concurrency: int = 1,
+    ) -> None:
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_concurrency = max_concurrency
+        self._queue: asyncio.Queue[_Pending] | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._inflight: set[asyncio.Task] = set()
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._last_batch_size = 0
+
+    def _ensure_started(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+            self._inflight = set()
+            self._loop = loop
+            self._task = loop.create_task(self._run())
+        return self._queue
+
+    async def submit(self, row: np.ndarray, model: Any = None) -> float:
+        """Queue one encoded row and wait for its prediction from model."""
+        queue = self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        queue.put_nowait(_Pending(row, model, future, time.perf_counter()))
+        return await future
+
+    async def stop(self) -> None:
+        """Stop the dispatcher and fail any rows still waiting."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        if self._queue is not None:
+            while not self._queue.empty():
+                pending = self._queue.get_nowait()
+                if not pending.future.done():
+                    pending.future.set_exception(RuntimeError("Batcher stopped"))
+        self._task = None
+        self._queue = None
+        self._loop = None
+
+    async def _collect(self, queue: asyncio.Queue) -> list[_Pending]:
+        batch = [await queue.get()]
+        while len(batch) < self.max_batch_size and not queue.empty():
+            batch.append(queue.get_nowait())
+
+        if self._last_batch_size > 1 and len(batch) < self.max_batch_size:
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except TimeoutError:
+                    break
+        return batch
+
+    async def _run(self) -> None:
+        queue = self._queue
+        slots = self._slots
+        while True:
+            await slots.acquire()
+            try:
+                batch = await self._collect(queue)
+            except BaseException:
+                slots.release()
+                raise
+            self._last_batch_size = len(batch)
+
+            task = asyncio.get_running_loop().create_task(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+            task.add_done_callback(lambda _: slots.release())
+
+    async def _dispatch(self, batch: list[_Pending]) -> None:
+        dispatched_at = time.perf_counter()
+        batch_size_hist.observe(len(batch))
+        batch_fill_hist.observe(len(batch) / self.max_batch_size)
+        for pending in batch:
+            queue_wait_hist.observe((dispatched_at - pending.enqueued_at) * 1000)
+
+        by_model: dict[int, list[_Pending]] = {}
+        for pending in batch:
+            by_model.setdefault(id(pending.model), []).append(pending)
+        for group in by_model.values():
+            await self._score(group)
+
+    async def _score(self, group: list[_Pending]) -> None:
+        try:
+            X = np.vstack([p.row for p in group])
+            predictions = await self.predict_fn(group[0].model, X)
+        except Exception as e:
+            logger.error(f"Batched prediction failed: {e}")
+            for pending in group:
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+            return
+
+        for pending, prediction in zip(group, predictions, strict=True):
+            if not pending.future.done():
+                pending.future.set_result(float(prediction))
+
+
+async def _predict_on_backend(handle: ModelHandle, X: np.ndarray) -> np.ndarray:
+    return await run_inference(handle.engine, handle.version, X)
+
+
+_batcher: MicroBatcher | None = None
+
+
+def get_batcher() -> MicroBatcher | None:
+    """Return the process-wide batcher, or None when micro-batching is disabled."""
+    global _batcher
+    if not settings.MICRO_BATCH_ENABLED:
+        return None
+    if _batcher is None:
+        _batcher = MicroBatcher(
+            predict_fn=_predict_on_backend,
+            max_batch_size=settings.MICRO_BATCH_MAX_SIZE,
+            max_wait_ms=settings.MICRO_BATCH_MAX_WAIT_MS,
+            max_concurrency=settings.inference_concurrency,
+        )
+    return _batcher
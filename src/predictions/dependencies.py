@@ -1,15 +1,68 @@
 """Prediction dependencies for FastAPI."""
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Annotated
 
 from fastapi import Depends
 
+from src.auth.dependencies import CurrentUserDep
+from src.core.exceptions import QuotaExceededError
+from src.core.quotas import QuotaManager, get_quota_manager
 from src.logs.dependencies import PredictionLogRepoDep
+from src.logs.writer import get_log_writer
 from src.predictions.service import PredictionService
 
 
 def get_prediction_service(log_repo: PredictionLogRepoDep) -> PredictionService:
-    return PredictionService(log_repo)
+    return PredictionService(log_repo, get_log_writer())
 
 
 PredictionServiceDep = Annotated[PredictionService, Depends(get_prediction_service)]
+
+
+class KeyQuota:
+    """The calling API key's prediction quota for one request.
+
+    Does nothing when quotas are disabled. ``remaining`` is the balance after
+    the last charge (or rejection), for the X-Quota-* response headers.
+    """
+
+    def __init__(self, manager: QuotaManager | None, key_id: int) -> None:
+        self.manager = manager
+        self.key_id = key_id
+        self.remaining: float | None = None
+
+    @asynccontextmanager
+    async def admit(self, cost: int) -> AsyncIterator[None]:
+        """Hold a concurrency slot and charge ``cost`` up front.
+
+        Raises QuotaExceededError when no slot is free or the bucket is short.
+        """
+        if self.manager is None:
+            yield
+            return
+        async with self.manager.slot(self.key_id):
+            try:
+                self.remaining = await self.manager.take(self.key_id, cost)
+            except QuotaExceededError as e:
+                self.remaining = e.remaining
+                raise
+            yield
+
+    async def charge(self, cost: int) -> None:
+        """Charge ``cost`` more units, waiting for the bucket to refill."""
+        if self.manager is not None and cost > 0:
+            self.remaining = await self.manager.consume(self.key_id, cost)
+
+    def headers(self) -> dict[str, str]:
+        if self.manager is None:
+            return {}
+        return self.manager.headers(self.remaining)
+
+
+def get_key_quota(current_user: CurrentUserDep) -> KeyQuota:
+    return KeyQuota(get_quota_manager(), current_user["id"])
+
+
+KeyQuotaDep = Annotated[KeyQuota, Depends(get_key_quota)]
@@ -1,24 +1,69 @@
 """Prediction API routes."""
 
 import logging
+import math
 
-from fastapi import APIRouter, HTTPException, Request, status
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from starlette.requests import ClientDisconnect
 
 from src.auth.dependencies import CurrentUserDep
-from src.core.exceptions import PredictionError
+from src.config import settings
+from src.core.exceptions import (
+    ExecutorSaturatedError,
+    PredictionError,
+    QuotaExceededError,
+    StreamFormatError,
+)
 from src.core.rate_limiter import get_rate_limit_string, limiter
-from src.predictions.dependencies import PredictionServiceDep
+from src.predictions.dependencies import (
+    KeyQuota,
+    KeyQuotaDep,
+    PredictionServiceDep,
+)
 from src.predictions.schema import (
     BatchPredictionRequest,
     BatchPredictionResponse,
     HouseFeatures,
     PredictionResponse,
 )
+from src.predictions.service import PredictionService
+from src.predictions.streaming import (
+    StreamFormat,
+    detect_format,
+    iter_lines,
+    iter_spool,
+    make_row_parser,
+    meter_bytes,
+    spool_results,
+    stream_predictions,
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _overloaded(error: ExecutorSaturatedError) -> HTTPException:
+    logger.warning(f"Rejecting prediction: {error}")
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Prediction capacity exhausted, retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+def _quota_exceeded(error: QuotaExceededError, quota: KeyQuota) -> HTTPException:
+    logger.info(f"Rejecting prediction for API key {quota.key_id}: {error}")
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=str(error),
+        headers={
+            "Retry-After": str(max(1, math.ceil(error.retry_after))),
+            **quota.headers(),
+        },
+    )
+
+
 @router.post(
     "",
     response_model=PredictionResponse,
@@ -28,15 +73,23 @@ router = APIRouter()
 @limiter.limit(get_rate_limit_string())
 async def predict_price(
     request: Request,
+    response: Response,
     features: HouseFeatures,
     current_user: CurrentUserDep,
     service: PredictionServiceDep,
+    quota: KeyQuotaDep,
 ) -> PredictionResponse:
     logger.info(f"Prediction request from user: {current_user['name']}")
     try:
-        result = service.predict(features, api_key_id=current_user["id"])
+        async with quota.admit(1):
+            result = await service.predict(features, api_key_id=current_user["id"])
+        response.headers.update(quota.headers())
         logger.info(f"Prediction: ${result.predicted_price:,.2f}")
         return result
+    except QuotaExceededError as e:
+        raise _quota_exceeded(e, quota) from e
+    except ExecutorSaturatedError as e:
+        raise _overloaded(e) from e
     except PredictionError as e:
         logger.error(f"Prediction error: {e}")
         raise HTTPException(
@@ -53,21 +106,109 @@ async def predict_price(
 @limiter.limit(get_rate_limit_string())
 async def predict_batch(
     request: Request,
+    response: Response,
     batch_request: BatchPredictionRequest,
     current_user: CurrentUserDep,
     service: PredictionServiceDep,
+    quota: KeyQuotaDep,
 ) -> BatchPredictionResponse:
     logger.info(
         f"Batch prediction: {len(batch_request.houses)} houses from {current_user['name']}"
     )
     try:
-        result = service.predict_batch(
-            batch_request.houses, api_key_id=current_user["id"]
-        )
+        # One unit per house
+        async with quota.admit(len(batch_request.houses)):
+            result = await service.predict_batch(
+                batch_request.houses, api_key_id=current_user["id"]
+            )
+        response.headers.update(quota.headers())
         logger.info(f"Batch complete: {result.count} predictions")
         return result
+    except QuotaExceededError as e:
+        raise _quota_exceeded(e, quota) from e
+    except ExecutorSaturatedError as e:
+        raise _overloaded(e) from e
     except PredictionError as e:
         logger.error(f"Batch prediction error: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
         ) from e
+
+
+@router.post(
+    "/stream",
+    summary="Stream Bulk House Price Predictions",
+    description=(
+        "Score an NDJSON or CSV upload of any size. Rows are parsed and scored "
+        "in fixed-size chunks as the body arrives; results are streamed back "
+        "as NDJSON once the upload completes, with per-row errors inline."
+    ),
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+@limiter.limit(get_rate_limit_string())
+async def predict_stream(
+    request: Request,
+    current_user: CurrentUserDep,
+    service: PredictionServiceDep,
+    quota: KeyQuotaDep,
+    format: StreamFormat | None = Query(
+        None, description="Input format; defaults to the request Content-Type"
+    ),
+) -> Response:
+    stream_format = format or detect_format(request.headers.get("content-type"))
+    if stream_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send application/x-ndjson or text/csv, or pass ?format=",
+        )
+
+    logger.info(
+        f"Streaming {stream_format.value} predictions for {current_user['name']}"
+    )
+    # Admission costs one unit; rows and bytes are then charged as they are
+    # read, pausing the upload while the quota refills
+    try:
+        async with quota.admit(1):
+            return await _score_stream(request, stream_format, service, quota)
+    except QuotaExceededError as e:
+        raise _quota_exceeded(e, quota) from e
+    except ExecutorSaturatedError as e:
+        raise _overloaded(e) from e
+
+
+async def _score_stream(
+    request: Request,
+    stream_format: StreamFormat,
+    service: PredictionService,
+    quota: KeyQuota,
+) -> Response:
+    body = meter_bytes(
+        request.stream(), settings.QUOTA_STREAM_BYTES_PER_UNIT, quota.charge
+    )
+    lines = iter_lines(body, settings.STREAM_MAX_LINE_BYTES)
+    try:
+        parse_row = await make_row_parser(stream_format, lines)
+    except StreamFormatError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
+
+    results = stream_predictions(
+        lines,
+        parse_row,
+        service.score_features,
+        settings.STREAM_CHUNK_ROWS,
+        model_version=service.model_version,
+        charge=quota.charge,
+    )
+    try:
+        spool = await spool_results(results, settings.STREAM_SPOOL_MAX_BYTES)
+    except ClientDisconnect:
+        logger.info("Client disconnected during streamed upload")
+        return Response(status_code=status.HTTP_400_BAD_REQUEST)
+
+    # Returned directly, so headers must be set on the response itself
+    return StreamingResponse(
+        iter_spool(spool), media_type="application/x-ndjson", headers=quota.headers()
+    )
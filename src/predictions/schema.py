@@ -2,7 +2,7 @@
 
 from enum import Enum
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class OceanProximity(str, Enum):
@@ -28,8 +28,11 @@ class HouseFeatures(BaseModel):
 
 
 class PredictionResponse(BaseModel):
+    model_config = ConfigDict(protected_namespaces=())
+
     predicted_price: float = Field(..., examples=[320201.59])
     currency: str = Field(default="USD")
+    model_version: str | None = Field(default=None, examples=["3f1c2a9d7b10"])
 
 
 class BatchPredictionRequest(BaseModel):
@@ -2,11 +2,18 @@
 
 import logging
 import time
+import uuid
 from typing import TYPE_CHECKING
 
-from src.core.exceptions import PredictionError
-from src.ml.model import load_model
-from src.ml.preprocessing import prepare_batch_features, prepare_features
+import numpy as np
+
+from src.core.exceptions import ExecutorSaturatedError, PredictionError
+from src.logs.writer import log_row
+from src.ml.cache import get_prediction_cache
+from src.ml.inference import run_inference
+from src.ml.manager import get_model_manager
+from src.ml.preprocessing import encode_features, encode_one
+from src.predictions.batcher import get_batcher
 from src.predictions.schema import (
     BatchPredictionResponse,
     HouseFeatures,
@@ -14,74 +21,162 @@ from src.predictions.schema import (
 )
 
 if TYPE_CHECKING:
-    from src.logs.repository import PredictionLogRepository
+    from src.logs.repository import AsyncPredictionLogRepository
+    from src.logs.writer import LogWriter
 
 logger = logging.getLogger(__name__)
 
 
 class PredictionService:
-    """Service for making housing price predictions."""
-
-    def __init__(self, log_repo: "PredictionLogRepository | None" = None) -> None:
-        self.model = load_model()
+    """Service for making housing price predictions.
+
+    Model inference runs on the configured inference backend and audit logs
+    go through an async repository (native or backed by the database
+    executor), so neither blocks the event loop.
+    The model handle is captured once per request, so a hot reload never
+    changes the model halfway through a request. With a ``log_writer`` the
+    audit log rows are queued for a background bulk insert instead.
+    """
+
+    def __init__(
+        self,
+        log_repo: "AsyncPredictionLogRepository | None" = None,
+        log_writer: "LogWriter | None" = None,
+    ) -> None:
+        self.handle = get_model_manager().current
+        self.model = self.handle.engine
+        self.model_version = self.handle.version
+        self.cache = get_prediction_cache()
         self.log_repo = log_repo
-
-    def predict(
+        self.log_writer = log_writer
+
+    async def _score(self, X: np.ndarray) -> np.ndarray:
+        """Score rows, serving repeats from the cache and the rest in one call."""
+        if self.cache is None:
+            return await run_inference(self.model, self.model_version, X)
+
+        values, keys, miss_mask = self.cache.lookup(X, self.model_version)
+        if miss_mask.any():
+            misses = np.flatnonzero(miss_mask)
+            predictions = await run_inference(self.model, self.model_version, X[misses])
+            values[misses] = predictions
+            self.cache.store([keys[i] for i in misses], predictions, self.model_version)
+        return values
+
+    async def _score_one(self, X: np.ndarray) -> float:
+        """Score a single row, coalescing with concurrent requests if enabled."""
+        batcher = get_batcher()
+        if batcher is None:
+            return float((await self._score(X))[0])
+
+        if self.cache is None:
+            return await batcher.submit(X[0], self.handle)
+
+        values, keys, miss_mask = self.cache.lookup(X, self.model_version)
+        if not miss_mask[0]:
+            return float(values[0])
+        prediction = await batcher.submit(X[0], self.handle)
+        self.cache.store(keys, [prediction], self.model_version)
+        return prediction
+
+    async def score_features(self, X: np.ndarray) -> np.ndarray:
+        """Score an encoded matrix without audit logging (bulk streaming)."""
+        return await self._score(X)
+
+    async def predict(
         self, features: HouseFeatures, api_key_id: int | None = None
     ) -> PredictionResponse:
         """Predict the price for a single house."""
         start_time = time.time()
 
         try:
-            X = prepare_features(features)
-            prediction = self.model.predict(X)
-            predicted_price = round(float(prediction[0]), 8)
+            X = encode_one(features)
+            predicted_price = round(await self._score_one(X), 8)
             response_time_ms = int((time.time() - start_time) * 1000)
 
-            if self.log_repo and api_key_id:
-                self.log_repo.create(
+            if self.log_writer and api_key_id:
+                await self.log_writer.submit(
+                    [
+                        log_row(
+                            api_key_id=api_key_id,
+                            input_features=features.model_dump(),
+                            predicted_price=predicted_price,
+                            response_time_ms=response_time_ms,
+                            model_version=self.model_version,
+                        )
+                    ]
+                )
+            elif self.log_repo and api_key_id:
+                await self.log_repo.create(
                     api_key_id=api_key_id,
                     input_features=features.model_dump(),
                     predicted_price=predicted_price,
                     response_time_ms=response_time_ms,
-                    request_type="single",
+                    model_version=self.model_version,
                 )
 
-            return PredictionResponse(predicted_price=predicted_price)
+            return PredictionResponse(
+                predicted_price=predicted_price, model_version=self.model_version
+            )
 
+        except ExecutorSaturatedError:
+            raise
         except Exception as e:
             logger.error(f"Prediction failed: {e}")
             raise PredictionError(f"Prediction failed: {e}") from e
 
-    def predict_batch(
+    async def predict_batch(
         self, features_list: list[HouseFeatures], api_key_id: int | None = None
     ) -> BatchPredictionResponse:
         """Predict prices for multiple houses."""
         start_time = time.time()
 
         try:
-            X = prepare_batch_features(features_list)
-            predictions = self.model.predict(X)
+            X = encode_features(features_list)
+            predictions = await self._score(X)
             response_time_ms = int((time.time() - start_time) * 1000)
 
             results = [
-                PredictionResponse(predicted_price=round(float(p), 8))
+                PredictionResponse(
+                    predicted_price=round(float(p), 8), model_version=self.model_version
+                )
                 for p in predictions
             ]
 
-            if self.log_repo and api_key_id:
+            if self.log_writer and api_key_id:
+                batch_id = str(uuid.uuid4())
+                await self.log_writer.submit(
+                    [
+                        log_row(
+                            api_key_id=api_key_id,
+                            input_features=features.model_dump(),
+                            predicted_price=float(price),
+                            response_time_ms=response_time_ms,
+                            request_type="batch",
+                            batch_id=batch_id,
+                            model_version=self.model_version,
+                        )
+                        for features, price in zip(
+                            features_list, predictions, strict=True
+                        )
+                    ]
+                )
+            elif self.log_repo and api_key_id:
                 prediction_data = [
                     (features.model_dump(), float(price))
                     for features, price in zip(features_list, predictions, strict=False)
                 ]
-                self.log_repo.create_batch(
+                await self.log_repo.insert_batch(
                     api_key_id=api_key_id,
                     predictions=prediction_data,
                     response_time_ms=response_time_ms,
+                    model_version=self.model_version,
                 )
 
             return BatchPredictionResponse(predictions=results, count=len(results))
 
+        except ExecutorSaturatedError:
+            raise
         except Exception as e:
             logger.error(f"Batch prediction failed: {e}")
             raise PredictionError(f"Batch prediction failed: {e}") from e
@@ -0,0 +1,270 @@
+"""Incremental NDJSON/CSV parsing and chunked scoring for /predict/stream."""
+
+import asyncio
+import csv
+import json
+import logging
+import tempfile
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from enum import Enum
+from typing import IO
+
+import numpy as np
+from pydantic import ValidationError
+
+from src.core.exceptions import ExecutorSaturatedError, StreamFormatError
+from src.core.metrics import metrics
+from src.ml.preprocessing import encode_features
+from src.predictions.schema import HouseFeatures
+
+logger = logging.getLogger(__name__)
+
+stream_rows = metrics.counter("prediction_stream_rows", "Rows read by /predict/stream")
+stream_errors = metrics.counter(
+    "prediction_stream_errors", "Streamed rows reported back as errors"
+)
+
+FEATURE_FIELDS = list(HouseFeatures.model_fields)
+
+# Delay before retrying a chunk when the inference backend is saturated
+SATURATED_RETRY_SECONDS = 0.05
+
+RowParser = Callable[[bytes], HouseFeatures]
+Scorer = Callable[[np.ndarray], Awaitable[np.ndarray]]
+# Charges quota units, waiting while the caller's quota refills
+Charge = Callable[[int], Awaitable[None]]
+
+
+class StreamFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+def detect_format(content_type: str | None) -> StreamFormat | None:
+    """Map a request Content-Type to a stream format."""
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in ("application/x-ndjson", "application/jsonl", "application/json"):
+        return StreamFormat.NDJSON
+    if media_type in ("text/csv", "application/csv"):
+        return StreamFormat.CSV
+    return None
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int
+) -> AsyncIterator[bytes | None]:
+    """Split a byte stream into non-blank lines as the bytes arrive.
+
+    Lines longer than ``max_line_bytes`` are discarded and yielded as ``None``
+    so the caller can report them without buffering them.
+    """
+    buffer = bytearray()
+    skipping = False
+    async for chunk in chunks:
+        start = 0
+        while (end := chunk.find(b"\n", start)) != -1:
+            if skipping:
+                skipping = False
+            else:
+                buffer += chunk[start:end]
+                if len(buffer) > max_line_bytes:
+                    yield None
+                elif line := bytes(buffer).strip():
+                    yield line
+                buffer.clear()
+            start = end + 1
+        if not skipping:
+            buffer += chunk[start:]
+            if len(buffer) > max_line_bytes:
+                buffer.clear()
+                skipping = True
+                yield None
+    if not skipping and (line := bytes(buffer).strip()):
+        yield line
+
+
+async def meter_bytes(
+    chunks: AsyncIterator[bytes], bytes_per_unit: int, charge: Charge
+) -> AsyncIterator[bytes]:
+    """Pass a byte stream through, charging a unit per ``bytes_per_unit`` read.
+
+    The upload stops being read while ``charge`` waits, so a client over its
+    quota is slowed down by TCP backpressure rather than cut off.
+    """
+    pending = 0
+    async for chunk in chunks:
+        pending += len(chunk)
+        if pending >= bytes_per_unit:
+            units, pending = divmod(pending, bytes_per_unit)
+            await charge(units)
+        yield chunk
+
+
+def parse_ndjson_row(line: bytes) -> HouseFeatures:
+    return HouseFeatures.model_validate_json(line)
+
+
+class CsvRowParser:
+    """Parses CSV data rows against the column order given by the header."""
+
+    def __init__(self, header: bytes) -> None:
+        self.columns = [c.strip() for c in _csv_fields(header.decode("utf-8-sig"))]
+        missing = [f for f in FEATURE_FIELDS if f not in self.columns]
+        if missing:
+            raise StreamFormatError(f"CSV header missing columns: {', '.join(missing)}")
+
+    def __call__(self, line: bytes) -> HouseFeatures:
+        values = _csv_fields(line.decode("utf-8"))
+        if len(values) != len(self.columns):
+            raise ValueError(f"Expected {len(self.columns)} fields, got {len(values)}")
+        return HouseFeatures.model_validate(
+            {col: val.strip() for col, val in zip(self.columns, values, strict=True)}
+        )
+
+
+def _csv_fields(line: str) -> list[str]:
+    return next(csv.reader([line]), [])
+
+
+async def make_row_parser(
+    stream_format: StreamFormat, lines: AsyncIterator[bytes | None]
+) -> RowParser:
+    """Build the row parser, consuming the header line for CSV."""
+    if stream_format is StreamFormat.NDJSON:
+        return parse_ndjson_row
+    header = await anext(lines, None)
+    if header is None:
+        raise StreamFormatError("CSV body has no header row")
+    return CsvRowParser(header)
+
+
+def _describe(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(
+            f"{'.'.join(map(str, e['loc'])) or 'row'}: {e['msg']}"
+            for e in error.errors(include_url=False)
+        )
+    return str(error)
+
+
+async def _score_with_retry(score: Scorer, X: np.ndarray) -> np.ndarray:
+    # A bulk stream waits for capacity instead of failing the whole chunk
+    while True:
+        try:
+            return await score(X)
+        except ExecutorSaturatedError:
+            await asyncio.sleep(SATURATED_RETRY_SECONDS)
+
+
+async def _score_chunk(
+    rows: list[tuple[int, HouseFeatures | str]], score: Scorer
+) -> tuple[bytes, int]:
+    """Score the valid rows of a chunk and render every row in input order."""
+    valid = [features for _, features in rows if isinstance(features, HouseFeatures)]
+    predictions: list[float | str] = []
+    if valid:
+        try:
+            predictions = (
+                await _score_with_retry(score, encode_features(valid))
+            ).tolist()
+        except Exception as e:
+            logger.error(f"Streamed chunk prediction failed: {e}")
+            predictions = [f"Prediction failed: {e}"] * len(valid)
+
+    out = []
+    errors = 0
+    prediction_iter = iter(predictions)
+    for index, item in rows:
+        result = next(prediction_iter) if isinstance(item, HouseFeatures) else item
+        if isinstance(result, str):
+            errors += 1
+            out.append(
+                json.dumps({"row": index, "error": result}, separators=(",", ":"))
+            )
+        else:
+            out.append(f'{{"row":{index},"predicted_price":{round(result, 8)!r}}}')
+    out.append("")
+    stream_rows.inc(len(rows))
+    stream_errors.inc(errors)
+    return "\n".join(out).encode(), errors
+
+
+async def stream_predictions(
+    lines: AsyncIterator[bytes | None],
+    parse_row: RowParser,
+    score: Scorer,
+    chunk_rows: int,
+    model_version: str | None = None,
+    charge: Charge | None = None,
+) -> AsyncIterator[bytes]:
+    """Yield NDJSON results chunk by chunk, ending with a summary line.
+
+    Each data row produces ``{"row": i, "predicted_price": p}`` or
+    ``{"row": i, "error": msg}``; ``row`` is the zero-based index of the data
+    row (blank lines and the CSV header are not counted). At most
+    ``chunk_rows`` parsed rows are held in memory at a time. ``charge`` is
+    awaited with each chunk's row count before it is scored.
+    """
+    n_rows = n_errors = 0
+    chunk: list[tuple[int, HouseFeatures | str]] = []
+
+    async for line in lines:
+        if line is None:
+            chunk.append((n_rows, "Line exceeds STREAM_MAX_LINE_BYTES"))
+        else:
+            try:
+                chunk.append((n_rows, parse_row(line)))
+            except ValueError as e:
+                chunk.append((n_rows, _describe(e)))
+        n_rows += 1
+
+        if len(chunk) >= chunk_rows:
+            if charge is not None:
+                await charge(len(chunk))
+            body, errors = await _score_chunk(chunk, score)
+            n_errors += errors
+            chunk = []
+            yield body
+
+    if chunk:
+        if charge is not None:
+            await charge(len(chunk))
+        body, errors = await _score_chunk(chunk, score)
+        n_errors += errors
+        yield body
+
+    summary = {
+        "rows": n_rows,
+        "predicted": n_rows - n_errors,
+        "errors": n_errors,
+        "model_version": model_version,
+    }
+    yield (json.dumps({"summary": summary}, separators=(",", ":")) + "\n").encode()
+
+
+async def spool_results(
+    results: AsyncIterator[bytes], max_memory_bytes: int
+) -> IO[bytes]:
+    """Drain results into a temp file that rolls over to disk past max_memory_bytes.
+
+    Plain HTTP/1.1 clients finish uploading before they read the response, so
+    replying while the body is still arriving would stall both sides once the
+    socket buffers fill. Results are therefore scored as the upload arrives
+    but sent once it completes.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=max_memory_bytes)
+    try:
+        async for body in results:
+            spool.write(body)
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
+
+
+def iter_spool(spool: IO[bytes], block_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Read a spool back in blocks, closing it when done."""
+    with spool:
+        while block := spool.read(block_size):
+            yield block
@@ -0,0 +1,108 @@
+"""Synthetic traffic that warms the prediction path before the app is ready."""
+
+import json
+import logging
+import uuid
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+
+from src.core.database import ThreadedRepository
+from src.logs.repository import AsyncPredictionLogRepository, PredictionLogRepository
+from src.models import APIKey
+from src.predictions.schema import BatchPredictionRequest, HouseFeatures
+from src.predictions.service import PredictionService
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_HOUSE = {
+    "longitude": -122.64,
+    "latitude": 38.01,
+    "housing_median_age": 36.0,
+    "total_rooms": 1336.0,
+    "total_bedrooms": 258.0,
+    "population": 678.0,
+    "households": 249.0,
+    "median_income": 5.5789,
+    "ocean_proximity": "NEAR OCEAN",
+}
+
+
+def _sample_body(round_: int, count: int) -> list[dict]:
+    # Vary the income so every round misses the prediction cache
+    return [
+        {**SAMPLE_HOUSE, "median_income": 1.0 + round_ + i / 100} for i in range(count)
+    ]
+
+
+def _warmup_api_key() -> APIKey:
+    return APIKey(
+        name="startup-warmup",
+        key_hash=f"warmup-{uuid.uuid4().hex}",
+        key_prefix="warmup",
+    )
+
+
+async def _send_requests(
+    service: PredictionService, api_key_id: int, rounds: int
+) -> None:
+    for round_ in range(rounds):
+        single, *batch = _sample_body(round_, 4)
+        features = HouseFeatures.model_validate_json(json.dumps(single))
+        response = await service.predict(features, api_key_id=api_key_id)
+        jsonable_encoder(response)
+
+        request = BatchPredictionRequest.model_validate_json(
+            json.dumps({"houses": batch})
+        )
+        batch_response = await service.predict_batch(
+            request.houses, api_key_id=api_key_id
+        )
+        jsonable_encoder(batch_response)
+
+
+async def warm_up(rounds: int, bind: Engine | AsyncEngine) -> None:
+    """Send ``rounds`` single and batch requests through the prediction path.
+
+    Each request is parsed from JSON, validated, encoded, scored, serialized
+    and logged exactly as a real one, through ``bind`` (an AsyncEngine uses
+    the async repository). Log writes go to a throwaway API key inside a transaction
+    that is rolled back, so nothing is persisted but the first database
+    connection and insert are paid for here.
+    """
+    if isinstance(bind, AsyncEngine):
+        async with bind.connect() as conn:
+            transaction = await conn.begin()
+            # Repository commits stay inside the outer transaction
+            session = AsyncSession(bind=conn, join_transaction_mode="rollback_only")
+            try:
+                api_key = _warmup_api_key()
+                session.add(api_key)
+                await session.flush()
+                service = PredictionService(AsyncPredictionLogRepository(session))
+                await _send_requests(service, api_key.id, rounds)
+            finally:
+                await session.close()
+                # A failed flush already rolled the outer transaction back
+                if transaction.is_active:
+                    await transaction.rollback()
+    else:
+        with bind.connect() as conn:
+            transaction = conn.begin()
+            session = Session(bind=conn, join_transaction_mode="rollback_only")
+            try:
+                api_key = _warmup_api_key()
+                session.add(api_key)
+                session.flush()
+                service = PredictionService(
+                    ThreadedRepository(PredictionLogRepository(session))
+                )
+                await _send_requests(service, api_key.id, rounds)
+            finally:
+                session.close()
+                if transaction.is_active:
+                    transaction.rollback()
+
+    logger.info(f"Warm-up sent {rounds} single and batch requests")
@@ -19,7 +19,10 @@ sys.path.insert(
     0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 )
 
+from src.auth.cache import get_principal_cache  # noqa: E402
+from src.auth.key_filter import get_key_filter  # noqa: E402
 from src.core.database import Base, get_db  # noqa: E402
+from src.core.quotas import get_quota_manager  # noqa: E402
 from src.core.rate_limiter import limiter  # noqa: E402
 from src.main import app  # noqa: E402
 
@@ -41,6 +44,33 @@ def reset_rate_limiter():
     yield
 
 
+@pytest.fixture(autouse=True)
+def reset_principal_cache():
+    """Forget cached principals; each test starts with a fresh database."""
+    cache = get_principal_cache()
+    if cache is not None:
+        cache.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_key_filter():
+    """Drop filter entries of earlier tests' keys; startup reloads it."""
+    key_filter = get_key_filter()
+    if key_filter is not None:
+        key_filter.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def reset_quotas():
+    """Refill every key's quota; key ids restart with each fresh database."""
+    manager = get_quota_manager()
+    if manager is not None:
+        manager.reset()
+    yield
+
+
 @pytest.fixture(scope="function")
 def db_session() -> Generator[Session, None, None]:
     """Create a fresh database session for each test with automatic cleanup."""
@@ -65,11 +95,14 @@ def client(db_session: Session) -> Generator[TestClient, None, None]:
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    # Startup work (warm-up, API key filter) runs on the test database too
+    app.state.session_factory = TestSessionLocal
 
     with TestClient(app) as test_client:
         yield test_client
 
     app.dependency_overrides.clear()
+    del app.state.session_factory
 
 
 @pytest.fixture
@@ -0,0 +1,87 @@
+"""Integration tests for admin API endpoints.
+
+These tests require the full application stack including:
+- ML model loaded
+- FastAPI application
+"""
+
+import shutil
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.config import settings
+
+ADMIN_HEADERS = {"X-Admin-Token": "test-admin-token"}
+
+
+@pytest.fixture
+def admin_enabled(monkeypatch):
+    """Enable the admin API for the duration of a test."""
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", ADMIN_HEADERS["X-Admin-Token"])
+
+
+@pytest.fixture
+def model_copy(tmp_path, monkeypatch) -> str:
+    """Point MODEL_PATH at a writable copy of the serving artifact."""
+    path = tmp_path / "model.joblib"
+    shutil.copyfile(settings.MODEL_PATH, path)
+    monkeypatch.setattr(settings, "MODEL_PATH", str(path))
+    return str(path)
+
+
+class TestAdminModelAPI:
+    """Integration tests for model inspection and hot reload."""
+
+    def test_admin_disabled_without_token(self, client: TestClient, monkeypatch):
+        """Test admin endpoints are refused when ADMIN_TOKEN is unset."""
+        monkeypatch.setattr(settings, "ADMIN_TOKEN", "")
+        response = client.get("/admin/model", headers=ADMIN_HEADERS)
+
+        assert response.status_code == 403
+
+    def test_wrong_admin_token(self, client: TestClient, admin_enabled):
+        """Test a wrong admin token is rejected."""
+        response = client.get("/admin/model", headers={"X-Admin-Token": "nope"})
+
+        assert response.status_code == 401
+
+    def test_model_info_matches_predictions(
+        self,
+        client: TestClient,
+        admin_enabled,
+        auth_headers: dict,
+        sample_house_features: dict,
+    ):
+        """Test predictions report the version the admin API says is serving."""
+        info = client.get("/admin/model", headers=ADMIN_HEADERS).json()
+        prediction = client.post(
+            "/predict", json=sample_house_features, headers=auth_headers
+        ).json()
+
+        assert prediction["model_version"] == info["model_version"]
+
+    def test_reload_unchanged_artifact(
+        self, client: TestClient, admin_enabled, model_copy
+    ):
+        """Test reloading identical content keeps the serving version."""
+        response = client.post("/admin/model/reload", headers=ADMIN_HEADERS)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["reloaded"] is False
+        assert data["model_version"] == data["previous_version"]
+
+    def test_reload_rejects_invalid_artifact(
+        self, client: TestClient, admin_enabled, model_copy
+    ):
+        """Test a corrupt artifact is rejected and the old model keeps serving."""
+        before = client.get("/admin/model", headers=ADMIN_HEADERS).json()
+        with open(model_copy, "wb") as f:
+            f.write(b"not a model")
+
+        response = client.post("/admin/model/reload", headers=ADMIN_HEADERS)
+
+        assert response.status_code == 422
+        after = client.get("/admin/model", headers=ADMIN_HEADERS).json()
+        assert after["model_version"] == before["model_version"]
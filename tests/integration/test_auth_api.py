@@ -7,6 +7,11 @@ These tests require the full application stack including:
 """
 
 from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from src.auth.key_filter import filter_entry, get_key_filter, remember_key
+from src.core.security import api_key_digest, generate_api_key, hash_password
+from src.models import APIKey
 
 
 class TestAPIKeyCreationAPI:
@@ -70,6 +75,28 @@ class TestTokenGenerationAPI:
         response = client.post("/auth/token", json={"api_key": ""})
         assert response.status_code == 422
 
+    def test_get_token_upgrades_legacy_key(
+        self, client: TestClient, db_session: Session
+    ):
+        """Test a bcrypt-hashed key issues tokens and is stored as a digest."""
+        plain_key = generate_api_key()
+        legacy = APIKey(
+            name="legacy", key_hash=hash_password(plain_key), key_prefix=plain_key[:8]
+        )
+        db_session.add(legacy)
+        db_session.commit()
+        key_id = legacy.id
+        # Written behind the repository's back, as a pre-digest row would be
+        remember_key(filter_entry(legacy))
+
+        for _ in range(2):
+            response = client.post("/auth/token", json={"api_key": plain_key})
+            assert response.status_code == 200
+
+        legacy = db_session.get(APIKey, key_id)
+        assert legacy.key_digest == api_key_digest(plain_key)
+        assert legacy.key_hash is None
+
 
 class TestAPIKeyManagementAPI:
     """Integration tests for API key management endpoints."""
@@ -148,3 +175,75 @@ class TestFullAuthFlow:
         # Step 4: Verify our key is in the list
         keys = protected_response.json()
         assert any(k["name"] == "Flow Test Key" for k in keys)
+
+
+class TestPrincipalCacheAPI:
+    """Integration tests for cached principals."""
+
+    def test_deactivated_key_rejected_immediately(
+        self, client: TestClient, auth_headers: dict
+    ):
+        """Test a cached key stops authenticating as soon as it is deactivated."""
+        keys = client.get("/auth/keys", headers=auth_headers).json()
+        key_id = next(k["id"] for k in keys if k["name"] == "Test API Key")
+        assert client.get("/auth/keys", headers=auth_headers).status_code == 200
+
+        response = client.delete(f"/auth/keys/{key_id}", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert client.get("/auth/keys", headers=auth_headers).status_code == 401
+
+
+class TestAPIKeyFilterAPI:
+    """Integration tests for rejecting unknown keys before the lookup."""
+
+    def test_unknown_key_rejected_by_filter(self, client: TestClient, api_key: str):
+        """Test a key that cannot exist is rejected and counted."""
+        before = client.get("/health/metrics").json()
+        rejected = before.get("api_key_filter_rejections", {}).get("value", 0)
+
+        response = client.post("/auth/token", json={"api_key": generate_api_key()})
+
+        assert response.status_code == 401
+        metrics = client.get("/health/metrics").json()
+        assert metrics["api_key_filter_rejections"]["value"] == rejected + 1
+        assert metrics["api_key_filter_entries"]["value"] >= 1
+        assert "api_key_filter_estimated_fpr" in metrics
+
+    def test_deactivated_key_rejected_by_filter(
+        self, client: TestClient, api_key: str, auth_headers: dict
+    ):
+        """Test deactivating a key removes it from the filter."""
+        keys = client.get("/auth/keys", headers=auth_headers).json()
+        key_id = next(k["id"] for k in keys if k["name"] == "Test API Key")
+        client.delete(f"/auth/keys/{key_id}", headers=auth_headers)
+        before = client.get("/health/metrics").json()
+        rejected = before["api_key_filter_rejections"]["value"]
+
+        response = client.post("/auth/token", json={"api_key": api_key})
+
+        assert response.status_code == 401
+        metrics = client.get("/health/metrics").json()
+        assert metrics["api_key_filter_rejections"]["value"] == rejected + 1
+
+    def test_key_created_by_other_worker_accepted(
+        self, client: TestClient, api_key: str, db_session: Session, monkeypatch
+    ):
+        """Test a key this worker's filter never saw is still accepted."""
+        monkeypatch.setattr(get_key_filter(), "stale_check_seconds", 0)
+        plain_key = generate_api_key()
+        # Written straight to the table, as another worker would
+        db_session.add(
+            APIKey(
+                name="Other Worker Key",
+                key_digest=api_key_digest(plain_key),
+                key_prefix=plain_key[:8],
+            )
+        )
+        db_session.commit()
+
+        response = client.post("/auth/token", json={"api_key": plain_key})
+
+        assert response.status_code == 200
+        metrics = client.get("/health/metrics").json()
+        assert metrics["api_key_filter_stale_rebuilds"]["value"] >= 1
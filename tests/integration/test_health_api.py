@@ -9,6 +9,8 @@ These tests require the full application stack including:
 
 from fastapi.testclient import TestClient
 
+from src.core.startup import startup_report
+
 
 class TestHealthEndpointsAPI:
     """Integration tests for health check endpoints."""
@@ -42,6 +44,44 @@ class TestHealthEndpointsAPI:
         assert "database" in data["components"]
         assert "model" in data["components"]
 
+    def test_metrics_endpoint(
+        self, client: TestClient, auth_headers: dict, sample_house_features: dict
+    ):
+        """Test metrics endpoint reports micro-batching metrics via API."""
+        client.post("/predict", json=sample_house_features, headers=auth_headers)
+        response = client.get("/health/metrics")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["prediction_batch_size"]["count"] >= 1
+        assert "prediction_queue_wait_ms" in data
+
+    def test_ready_after_warmup(self, client: TestClient):
+        """Test readiness reports ready once startup warm-up has run."""
+        response = client.get("/health/ready")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+
+    def test_not_ready_returns_503(self, client: TestClient, monkeypatch):
+        """Test readiness returns 503 while the app is still starting."""
+        monkeypatch.setattr(startup_report, "ready", False)
+        response = client.get("/health/ready")
+
+        assert response.status_code == 503
+        assert response.json()["status"] == "starting"
+
+    def test_startup_breakdown(self, client: TestClient):
+        """Test startup timing breakdown lists each lifespan phase."""
+        response = client.get("/health/startup")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["ready"] is True
+        assert data["warmup_error"] is None
+        assert {"model_load", "warmup"} <= set(data["phases_ms"])
+        assert data["total_ms"] >= data["phases_ms"]["warmup"]
+
     def test_root_endpoint(self, client: TestClient):
         """Test root endpoint returns welcome message via API."""
         response = client.get("/")
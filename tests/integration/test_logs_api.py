@@ -0,0 +1,205 @@
+"""
+Integration tests for the prediction logs API.
+
+Tests pagination, search, stats and archived logs through the full stack.
+"""
+
+import json
+from datetime import UTC, datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.config import settings
+from src.logs.retention import archive_expired_logs
+
+
+class TestLogsPaginationAPI:
+    """Test GET /logs paging."""
+
+    def test_cursor_pages(
+        self, client: TestClient, auth_headers: dict, sample_house_features: dict
+    ):
+        """Test next_cursor walks every log once, newest first."""
+        houses = [{**sample_house_features, "median_income": 1.0 + i} for i in range(5)]
+        response = client.post(
+            "/predict/batch", json={"houses": houses}, headers=auth_headers
+        )
+        assert response.status_code == 200
+
+        ids, cursor = [], None
+        while True:
+            params = {"limit": 2} | ({"cursor": cursor} if cursor else {})
+            page = client.get("/logs", params=params, headers=auth_headers).json()
+            ids += [log["id"] for log in page["logs"]]
+            assert page["total"] is None
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert len(ids) == 5
+        assert ids == sorted(ids, reverse=True)
+
+    def test_include_total(
+        self, client: TestClient, auth_headers: dict, sample_house_features: dict
+    ):
+        """Test the exact total is counted only on request."""
+        client.post("/predict", json=sample_house_features, headers=auth_headers)
+
+        response = client.get(
+            "/logs", params={"include_total": True}, headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        assert response.json()["total"] == 1
+        assert response.json()["next_cursor"] is None
+
+    def test_invalid_cursor_returns_400(self, client: TestClient, auth_headers: dict):
+        """Test a malformed cursor is rejected."""
+        response = client.get(
+            "/logs", params={"cursor": "not-a-cursor"}, headers=auth_headers
+        )
+
+        assert response.status_code == 400
+
+
+class TestLogsStatsAPI:
+    """Test GET /logs/stats."""
+
+    def test_stats_count_single_and_batch(
+        self, client: TestClient, auth_headers: dict, sample_house_features: dict
+    ):
+        """Test counters include single and batch predictions."""
+        client.post("/predict", json=sample_house_features, headers=auth_headers)
+        client.post(
+            "/predict/batch",
+            json={"houses": [sample_house_features] * 2},
+            headers=auth_headers,
+        )
+
+        response = client.get("/logs/stats", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.json() == {"total_predictions": 3, "predictions_by_user": 3}
+
+
+class TestLogsArchiveAPI:
+    """Test the read-only view of archived logs."""
+
+    def test_archived_logs_readable(
+        self,
+        client: TestClient,
+        auth_headers: dict,
+        sample_house_features: dict,
+        db_session: Session,
+        tmp_path,
+        monkeypatch,
+    ):
+        """Test logs moved out by retention are listed and served per key."""
+        monkeypatch.setattr(settings, "LOG_ARCHIVE_DIR", str(tmp_path))
+        client.post("/predict", json=sample_house_features, headers=auth_headers)
+        today = datetime.now(UTC)
+        archive_expired_logs(
+            sessionmaker(bind=db_session.get_bind()),
+            tmp_path,
+            retention_days=1,
+            now=today + timedelta(days=2),
+        )
+
+        days = client.get("/logs/archive", headers=auth_headers).json()["days"]
+        response = client.get(f"/logs/archive/{days[0]}", headers=auth_headers)
+
+        assert days == [today.date().isoformat()]
+        assert response.status_code == 200
+        assert len(response.json()["logs"]) == 1
+        assert client.get("/logs", headers=auth_headers).json()["logs"] == []
+        missing = client.get("/logs/archive/2000-01-01", headers=auth_headers)
+        assert missing.status_code == 404
+
+
+class TestLogsSearchAPI:
+    """Test GET /logs/search."""
+
+    def test_search_filters(
+        self,
+        client: TestClient,
+        auth_headers: dict,
+        sample_house_features: dict,
+        sample_house_features_2: dict,
+    ):
+        """Test ocean proximity and bounding-box filters select matching logs."""
+        client.post(
+            "/predict/batch",
+            json={"houses": [sample_house_features, sample_house_features_2]},
+            headers=auth_headers,
+        )
+
+        inland = client.get(
+            "/logs/search", params={"ocean_proximity": "INLAND"}, headers=auth_headers
+        )
+        bay_area = client.get(
+            "/logs/search",
+            params={"min_latitude": 37, "max_latitude": 39, "max_longitude": -120},
+            headers=auth_headers,
+        )
+
+        assert inland.status_code == 200
+        assert [
+            log["input_features"]["ocean_proximity"] for log in inland.json()["logs"]
+        ] == ["INLAND"]
+        assert [
+            log["input_features"]["latitude"] for log in bay_area.json()["logs"]
+        ] == [38.01]
+
+    def test_invalid_filter_returns_422(self, client: TestClient, auth_headers: dict):
+        """Test unknown ocean proximity values are rejected."""
+        response = client.get(
+            "/logs/search", params={"ocean_proximity": "MOON"}, headers=auth_headers
+        )
+
+        assert response.status_code == 422
+
+
+class TestLogsExportAPI:
+    """Test GET /logs/export."""
+
+    def test_export_ndjson(
+        self, client: TestClient, auth_headers: dict, sample_house_features: dict
+    ):
+        """Test every log of the caller is streamed as NDJSON."""
+        houses = [{**sample_house_features, "median_income": 1.0 + i} for i in range(3)]
+        client.post("/predict/batch", json={"houses": houses}, headers=auth_headers)
+
+        response = client.get("/logs/export", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert len(rows) == 3
+        assert [row["id"] for row in rows] == sorted(row["id"] for row in rows)
+        assert rows[0]["input_features"]["median_income"] == 1.0
+
+    def test_export_csv_with_time_range(
+        self, client: TestClient, auth_headers: dict, sample_house_features: dict
+    ):
+        """Test CSV output and that the time range filters rows."""
+        client.post("/predict", json=sample_house_features, headers=auth_headers)
+
+        response = client.get(
+            "/logs/export", params={"format": "csv"}, headers=auth_headers
+        )
+        future = client.get(
+            "/logs/export",
+            params={"format": "csv", "created_from": "2999-01-01T00:00:00Z"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert "prediction_logs.csv" in response.headers["content-disposition"]
+        assert len(response.text.splitlines()) == 2
+        assert future.text == ""
+
+    def test_export_requires_auth(self, client: TestClient):
+        """Test export is not public."""
+        assert client.get("/logs/export").status_code in (401, 403)
@@ -7,9 +7,13 @@ These tests require the full application stack including:
 - All middleware
 """
 
+import json
+
 import pytest
 from fastapi.testclient import TestClient
 
+from src.core.quotas import get_quota_manager
+
 
 class TestSinglePredictionAPI:
     """Integration tests for single prediction endpoint."""
@@ -226,3 +230,163 @@ class TestOceanProximityValuesAPI:
 
         assert response.status_code == 200
         assert response.json()["predicted_price"] > 0
+
+
+class TestStreamPredictionAPI:
+    """Integration tests for the streaming bulk endpoint."""
+
+    def test_stream_ndjson(
+        self, client: TestClient, auth_headers: dict, sample_house_features: dict
+    ):
+        """Test NDJSON upload beyond MAX_BATCH_SIZE streams every row back."""
+        body = "\n".join([json.dumps(sample_house_features)] * 150 + ["{bad"])
+        response = client.post(
+            "/predict/stream",
+            content=body,
+            headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        records = [json.loads(line) for line in response.text.splitlines()]
+        assert len(records) == 152
+        assert records[0]["predicted_price"] > 0
+        assert "error" in records[150]
+        summary = records[-1]["summary"]
+        counts = (summary["rows"], summary["predicted"], summary["errors"])
+        assert counts == (151, 150, 1)
+        assert summary["model_version"]
+
+    def test_stream_csv(
+        self, client: TestClient, auth_headers: dict, sample_house_features: dict
+    ):
+        """Test CSV upload with a header row."""
+        header = ",".join(sample_house_features)
+        row = ",".join(str(v) for v in sample_house_features.values())
+        response = client.post(
+            "/predict/stream",
+            content=f"{header}\n{row}\n{row}\n",
+            headers={**auth_headers, "Content-Type": "text/csv"},
+        )
+
+        assert response.status_code == 200
+        records = [json.loads(line) for line in response.text.splitlines()]
+        assert records[-1]["summary"]["predicted"] == 2
+
+    def test_stream_csv_bad_header(self, client: TestClient, auth_headers: dict):
+        """Test a CSV header missing features is rejected up front."""
+        response = client.post(
+            "/predict/stream?format=csv", content="a,b\n1,2\n", headers=auth_headers
+        )
+
+        assert response.status_code == 400
+
+    def test_stream_unsupported_media_type(
+        self, client: TestClient, auth_headers: dict
+    ):
+        """Test unknown content types are rejected."""
+        response = client.post(
+            "/predict/stream",
+            content="x",
+            headers={**auth_headers, "Content-Type": "text/plain"},
+        )
+
+        assert response.status_code == 415
+
+    def test_stream_without_auth(self, client: TestClient):
+        """Test streaming requires authentication."""
+        response = client.post(
+            "/predict/stream",
+            content="{}",
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+
+        assert response.status_code == 403
+
+
+class TestPredictionQuotaAPI:
+    """Integration tests for per-API-key prediction quotas."""
+
+    @pytest.fixture
+    def small_quota(self, monkeypatch):
+        """A 5-unit bucket that barely refills."""
+        manager = get_quota_manager()
+        monkeypatch.setattr(manager, "capacity", 5)
+        monkeypatch.setattr(manager, "refill_per_second", 0.5)
+        return manager
+
+    def test_batch_charged_per_house(
+        self, client: TestClient, auth_headers: dict, sample_house_features: dict
+    ):
+        """Test a batch costs one unit per house."""
+        first = client.post(
+            "/predict", json=sample_house_features, headers=auth_headers
+        )
+        batch = client.post(
+            "/predict/batch",
+            json={"houses": [sample_house_features] * 10},
+            headers=auth_headers,
+        )
+
+        assert batch.status_code == 200
+        limit = int(first.headers["X-Quota-Limit"])
+        assert int(first.headers["X-Quota-Remaining"]) == limit - 1
+        assert int(batch.headers["X-Quota-Remaining"]) in (limit - 11, limit - 10)
+
+    def test_exhausted_quota_returns_429(
+        self,
+        client: TestClient,
+        auth_headers: dict,
+        sample_house_features: dict,
+        small_quota,
+    ):
+        """Test a batch the bucket cannot cover is rejected with Retry-After."""
+        client.post(
+            "/predict/batch",
+            json={"houses": [sample_house_features] * 4},
+            headers=auth_headers,
+        )
+        response = client.post(
+            "/predict/batch",
+            json={"houses": [sample_house_features] * 3},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
+        assert response.headers["X-Quota-Limit"] == "5"
+        assert int(response.headers["X-Quota-Remaining"]) <= 1
+
+    def test_concurrency_limit_returns_429(
+        self, client: TestClient, auth_headers: dict, sample_house_features: dict
+    ):
+        """Test requests beyond the key's concurrent slots are rejected."""
+        manager = get_quota_manager()
+        key = "api_key:1"  # the only key in the fresh database
+        leases = [
+            manager.store.acquire_slot(key, manager.max_concurrent, 60)
+            for _ in range(manager.max_concurrent)
+        ]
+        response = client.post(
+            "/predict", json=sample_house_features, headers=auth_headers
+        )
+        for lease in leases:
+            manager.store.release_slot(key, lease)
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "1"
+
+    def test_stream_charged_per_row(
+        self, client: TestClient, auth_headers: dict, sample_house_features: dict
+    ):
+        """Test a stream costs one unit to start plus one per row."""
+        body = "\n".join([json.dumps(sample_house_features)] * 20)
+        response = client.post(
+            "/predict/stream",
+            content=body,
+            headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+        )
+
+        assert response.status_code == 200
+        limit = int(response.headers["X-Quota-Limit"])
+        assert int(response.headers["X-Quota-Remaining"]) in (limit - 21, limit - 20)
@@ -0,0 +1,103 @@
+"""Unit tests for the async repositories - in-memory aiosqlite only."""
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.auth.repository import AsyncAuthRepository
+from src.core.database import Base, ThreadedRepository
+from src.core.security import generate_api_key, hash_password
+from src.logs.repository import AsyncPredictionLogRepository, PredictionLogRepository
+from src.models import APIKey
+
+
+@pytest.fixture
+async def async_session_factory():
+    """Async session factory over a fresh in-memory database."""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+class TestAsyncAuthRepository:
+    """Test API key operations on an AsyncSession."""
+
+    async def test_create_and_validate_key(self, async_session_factory):
+        """Test a created key validates and stops validating once deactivated."""
+        async with async_session_factory() as session:
+            repo = AsyncAuthRepository(session)
+            api_key, plain_key = await repo.create_api_key("test", "desc")
+
+            assert (await repo.validate_key(plain_key)).id == api_key.id
+            assert await repo.validate_key("wrong" + plain_key) is None
+            assert await repo.deactivate(api_key.id)
+            assert await repo.validate_key(plain_key) is None
+            assert not await repo.deactivate(999)
+
+    async def test_legacy_key_upgraded_on_use(self, async_session_factory):
+        """Test a bcrypt-only key validates once and is then found by digest."""
+        plain_key = generate_api_key()
+        async with async_session_factory() as session:
+            session.add(
+                APIKey(
+                    name="legacy",
+                    key_hash=hash_password(plain_key),
+                    key_prefix=plain_key[:8],
+                )
+            )
+            await session.commit()
+
+            repo = AsyncAuthRepository(session)
+            api_key = await repo.validate_key(plain_key)
+
+            assert api_key.key_digest is not None
+            assert api_key.key_hash is None
+            assert (await repo.validate_key(plain_key)).id == api_key.id
+
+    async def test_soft_delete_hidden_from_listing(self, async_session_factory):
+        """Test soft-deleted keys are excluded unless requested."""
+        async with async_session_factory() as session:
+            repo = AsyncAuthRepository(session)
+            api_key, _ = await repo.create_api_key("gone")
+            await repo.create_api_key("kept")
+            await repo.delete(api_key.id)
+
+            assert [k.name for k in await repo.get_all()] == ["kept"]
+            assert len(await repo.get_all(include_deleted=True)) == 2
+
+
+class TestAsyncPredictionLogRepository:
+    """Test prediction log operations on an AsyncSession."""
+
+    async def test_create_and_query(self, async_session_factory):
+        """Test single and batch logs are stored and counted per key."""
+        async with async_session_factory() as session:
+            repo = AsyncPredictionLogRepository(session)
+            log = await repo.create(1, {"a": 1}, 100.0, model_version="v1")
+            result = await repo.insert_batch(2, [({"b": 1}, 1.0), ({"b": 2}, 2.0)])
+
+            assert (await repo.get_by_id(log.id)).model_version == "v1"
+            assert [x.id for x in await repo.get_by_batch_id(result.batch_id)] == (
+                result.ids
+            )
+            assert len(await repo.get_by_api_key(2)) == 2
+            assert await repo.count_by_api_key(1) == 1
+            assert await repo.count_all() == 3
+            assert await repo.stats_count_by_api_key(2) == 2
+            assert await repo.stats_count_all() == 3
+
+
+class TestThreadedRepository:
+    """Test the async facade over sync repositories."""
+
+    async def test_methods_run_on_db_executor(self, session_factory):
+        """Test sync repository methods are awaitable through the facade."""
+        with session_factory() as session:
+            repo = ThreadedRepository(PredictionLogRepository(session))
+            result = await repo.insert_batch(1, [({"a": 1}, 1.0)])
+
+            assert await repo.count_all() == 1
+            assert (await repo.get_by_id(result.ids[0])).batch_id == result.batch_id
+            assert repo.session is session
@@ -0,0 +1,64 @@
+"""Unit tests for API key validation - in-memory SQLite only."""
+
+from src.auth.repository import AuthRepository
+from src.core.security import api_key_digest, generate_api_key, hash_password
+from src.models import APIKey
+
+
+def _legacy_key(session_factory, plain_key: str, **fields) -> int:
+    with session_factory() as session:
+        api_key = APIKey(
+            name="legacy",
+            key_hash=hash_password(plain_key),
+            key_prefix=plain_key[:8],
+            **fields,
+        )
+        session.add(api_key)
+        session.commit()
+        return api_key.id
+
+
+class TestValidateKey:
+    """Test digest lookups and the lazy upgrade of bcrypt keys."""
+
+    def test_new_keys_store_only_a_digest(self, session_factory):
+        """Test created keys have a digest and no bcrypt hash."""
+        with session_factory() as session:
+            api_key, plain_key = AuthRepository(session).create_api_key("new")
+
+            assert api_key.key_digest == api_key_digest(plain_key)
+            assert api_key.key_hash is None
+            assert AuthRepository(session).validate_key(plain_key).id == api_key.id
+
+    def test_legacy_key_upgraded_on_first_use(self, session_factory):
+        """Test a matching bcrypt key gets its digest and loses its hash."""
+        plain_key = generate_api_key()
+        key_id = _legacy_key(session_factory, plain_key)
+
+        with session_factory() as session:
+            assert AuthRepository(session).validate_key(plain_key).id == key_id
+
+        with session_factory() as session:
+            api_key = session.get(APIKey, key_id)
+            assert api_key.key_digest == api_key_digest(plain_key)
+            assert api_key.key_hash is None
+            assert AuthRepository(session).validate_key(plain_key).id == key_id
+
+    def test_wrong_key_leaves_legacy_row(self, session_factory):
+        """Test a failed match with the same prefix does not upgrade the row."""
+        plain_key = generate_api_key()
+        key_id = _legacy_key(session_factory, plain_key)
+        wrong_key = plain_key[:8] + generate_api_key()[8:]
+
+        with session_factory() as session:
+            assert AuthRepository(session).validate_key(wrong_key) is None
+            assert session.get(APIKey, key_id).key_digest is None
+
+    def test_inactive_legacy_key_rejected(self, session_factory):
+        """Test deactivated bcrypt keys neither validate nor upgrade."""
+        plain_key = generate_api_key()
+        key_id = _legacy_key(session_factory, plain_key, is_active=False)
+
+        with session_factory() as session:
+            assert AuthRepository(session).validate_key(plain_key) is None
+            assert session.get(APIKey, key_id).key_digest is None
@@ -0,0 +1,83 @@
+"""Unit tests for the micro-batching dispatcher - no external dependencies."""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from src.predictions.batcher import MicroBatcher
+
+
+class RecordingModel:
+    """Fake model that sums each row and records batch sizes."""
+
+    def __init__(self) -> None:
+        self.batch_sizes: list[int] = []
+
+    async def predict(self, model: object, X: np.ndarray) -> np.ndarray:
+        self.batch_sizes.append(len(X))
+        return X.sum(axis=1) * (model or 1)
+
+
+class TestMicroBatcher:
+    """Test coalescing and result fan-out."""
+
+    async def test_single_submit(self):
+        """Test a lone row is scored and returned."""
+        model = RecordingModel()
+        batcher = MicroBatcher(model.predict, max_batch_size=8, max_wait_ms=2)
+
+        assert await batcher.submit(np.array([1.0, 2.0])) == 3.0
+        assert model.batch_sizes == [1]
+        await batcher.stop()
+
+    async def test_concurrent_submits_are_coalesced(self):
+        """Test concurrent rows share one model call and get their own results."""
+        model = RecordingModel()
+        batcher = MicroBatcher(model.predict, max_batch_size=8, max_wait_ms=2)
+
+        results = await asyncio.gather(
+            *(batcher.submit(np.array([float(i), 1.0])) for i in range(5))
+        )
+
+        assert results == [float(i) + 1.0 for i in range(5)]
+        assert model.batch_sizes == [5]
+        await batcher.stop()
+
+    async def test_max_batch_size_respected(self):
+        """Test batches never exceed max_batch_size."""
+        model = RecordingModel()
+        batcher = MicroBatcher(model.predict, max_batch_size=4, max_wait_ms=2)
+
+        await asyncio.gather(*(batcher.submit(np.ones(2)) for _ in range(10)))
+
+        assert max(model.batch_sizes) <= 4
+        assert sum(model.batch_sizes) == 10
+        await batcher.stop()
+
+    async def test_model_error_propagates(self):
+        """Test a failing model call fails every waiting request."""
+
+        async def failing_predict(model: object, X: np.ndarray) -> np.ndarray:
+            raise ValueError("boom")
+
+        batcher = MicroBatcher(failing_predict, max_batch_size=4, max_wait_ms=2)
+
+        with pytest.raises(ValueError, match="boom"):
+            await batcher.submit(np.ones(2))
+        await batcher.stop()
+
+    async def test_rows_scored_with_their_own_model(self):
+        """Test rows pinned to different models never share a model call."""
+        model = RecordingModel()
+        batcher = MicroBatcher(model.predict, max_batch_size=8, max_wait_ms=2)
+
+        results = await asyncio.gather(
+            batcher.submit(np.ones(2), 1),
+            batcher.submit(np.ones(2), 10),
+            batcher.submit(np.ones(2), 1),
+        )
+
+        assert results == [2.0, 20.0, 2.0]
+        assert sorted(model.batch_sizes) == [1, 2]
+        await batcher.stop()
@@ -0,0 +1,87 @@
+"""Unit tests for the prediction cache - no external dependencies."""
+
+import numpy as np
+
+from src.ml.cache import ENTRY_BYTES, PredictionCache, row_keys
+
+
+class TestRowKeys:
+    """Test feature vector canonicalization."""
+
+    def test_equal_rows_share_key(self):
+        """Test identical rows hash to the same key."""
+        X = np.array([[1.0, 2.0], [1.0, 2.0], [2.0, 1.0]])
+        keys = row_keys(X)
+        assert keys[0] == keys[1]
+        assert keys[0] != keys[2]
+        assert len(keys[0]) == 16
+
+    def test_negative_zero_folded(self):
+        """Test -0.0 and 0.0 are treated as the same input."""
+        assert row_keys(np.array([[-0.0, 1.0]])) == row_keys(np.array([[0.0, 1.0]]))
+
+
+class TestPredictionCache:
+    """Test lookup, eviction and model scoping."""
+
+    def test_miss_then_hit(self):
+        """Test stored predictions are returned on the next lookup."""
+        cache = PredictionCache(max_bytes=10 * ENTRY_BYTES, ttl_seconds=60)
+        X = np.array([[1.0, 2.0], [3.0, 4.0]])
+
+        values, keys, miss_mask = cache.lookup(X, "v1")
+        assert miss_mask.all()
+        cache.store(keys, np.array([10.0, 20.0]), "v1")
+
+        values, _, miss_mask = cache.lookup(X, "v1")
+        assert not miss_mask.any()
+        np.testing.assert_array_equal(values, [10.0, 20.0])
+
+    def test_partial_hits(self):
+        """Test only uncached rows are reported as misses."""
+        cache = PredictionCache(max_bytes=10 * ENTRY_BYTES, ttl_seconds=60)
+        _, keys, _ = cache.lookup(np.array([[1.0]]), "v1")
+        cache.store(keys, np.array([5.0]), "v1")
+
+        values, _, miss_mask = cache.lookup(np.array([[1.0], [2.0]]), "v1")
+        assert miss_mask.tolist() == [False, True]
+        assert values[0] == 5.0
+
+    def test_lru_eviction(self):
+        """Test least recently used entries are evicted at the size ceiling."""
+        cache = PredictionCache(max_bytes=2 * ENTRY_BYTES, ttl_seconds=60)
+        rows = [np.array([[float(i)]]) for i in range(3)]
+        for i, row in enumerate(rows):
+            _, keys, _ = cache.lookup(row, "v1")
+            cache.store(keys, np.array([float(i)]), "v1")
+
+        assert len(cache) == 2
+        assert cache.lookup(rows[0], "v1")[2][0]
+        assert not cache.lookup(rows[2], "v1")[2][0]
+
+    def test_ttl_expiry(self):
+        """Test expired entries are not served."""
+        cache = PredictionCache(max_bytes=10 * ENTRY_BYTES, ttl_seconds=0)
+        _, keys, _ = cache.lookup(np.array([[1.0]]), "v1")
+        cache.store(keys, np.array([5.0]), "v1")
+
+        assert cache.lookup(np.array([[1.0]]), "v1")[2][0]
+
+    def test_model_change_invalidates(self):
+        """Test a different model version never sees old predictions."""
+        cache = PredictionCache(max_bytes=10 * ENTRY_BYTES, ttl_seconds=60)
+        _, keys, _ = cache.lookup(np.array([[1.0]]), "v1")
+        cache.store(keys, np.array([5.0]), "v1")
+
+        assert cache.lookup(np.array([[1.0]]), "v2")[2][0]
+        assert len(cache) == 0
+
+    def test_store_from_replaced_model_dropped(self):
+        """Test results finishing on a swapped-out model are not cached."""
+        cache = PredictionCache(max_bytes=10 * ENTRY_BYTES, ttl_seconds=60)
+        _, keys, _ = cache.lookup(np.array([[1.0]]), "v1")
+        cache.lookup(np.array([[2.0]]), "v2")
+        cache.store(keys, np.array([5.0]), "v1")
+
+        assert len(cache) == 0
+        assert cache.lookup(np.array([[1.0]]), "v2")[2][0]
@@ -1,6 +1,6 @@
 """Unit tests for configuration - no external dependencies."""
 
-from src.config import settings
+from src.config import Config, settings
 from src.constants import (
     ALL_FEATURE_COLUMNS,
     DEFAULT_MODEL_PATH,
@@ -40,6 +40,20 @@ class TestSettings:
         """Test is_production property works."""
         assert isinstance(settings.is_production, bool)
 
+    def test_async_database_url_selects_async_driver(self):
+        """Test an async driver scheme enables async I/O with a sync twin URL."""
+        config = Config(DATABASE_URL="postgresql+asyncpg://u:p@db/app")
+
+        assert config.database_is_async
+        assert config.sync_database_url == "postgresql://u:p@db/app"
+
+    def test_sync_database_url_unchanged(self):
+        """Test plain sync URLs are used as-is."""
+        config = Config(DATABASE_URL="sqlite:///./app.db")
+
+        assert not config.database_is_async
+        assert config.sync_database_url == "sqlite:///./app.db"
+
     def test_project_name(self):
         """Test project name is set."""
         assert "Housing" in settings.PROJECT_NAME
@@ -0,0 +1,103 @@
+"""Unit tests for engine profiles - temporary SQLite files only."""
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import SingletonThreadPool
+
+from src.config import Config
+from src.core.engine_profiles import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    apply_profile,
+    engine_options,
+    sqlite_pragmas,
+)
+from src.core.metrics import metrics
+
+
+@pytest.fixture
+def profiled_engine(tmp_path):
+    """Engine over a SQLite file with a small instrumented pool."""
+    config = Config(
+        SQLITE_MMAP_SIZE=1024 * 1024,
+        SQLITE_CACHE_SIZE=-2048,
+        DB_POOL_SIZE=1,
+        DB_MAX_OVERFLOW=0,
+        DB_POOL_TIMEOUT_SECONDS=0.05,
+    )
+    url = f"sqlite:///{tmp_path / 'app.db'}"
+    engine = create_engine(url, **engine_options(url, config=config))
+    apply_profile(engine, config)
+    yield engine
+    engine.dispose()
+
+
+class TestEngineOptions:
+    """Test per-dialect engine keyword arguments."""
+
+    def test_memory_sqlite_keeps_default_pool(self):
+        """Test in-memory SQLite is not given a queue pool."""
+        options = engine_options("sqlite:///:memory:")
+
+        assert options == {"connect_args": {"check_same_thread": False}}
+        assert isinstance(
+            create_engine("sqlite://", **options).pool, SingletonThreadPool
+        )
+
+    def test_file_sqlite_gets_sized_pool(self):
+        """Test file SQLite uses the pool settings but not pre-ping/recycle."""
+        config = Config(DB_POOL_SIZE=3, DB_MAX_OVERFLOW=4)
+        options = engine_options("sqlite+aiosqlite:///./app.db", True, config)
+
+        assert options["poolclass"] is InstrumentedAsyncQueuePool
+        assert (options["pool_size"], options["max_overflow"]) == (3, 4)
+        assert "pool_pre_ping" not in options
+
+    def test_server_database_options(self):
+        """Test server databases get pre-ping and recycling."""
+        config = Config(DB_POOL_PRE_PING=True, DB_POOL_RECYCLE_SECONDS=600)
+        options = engine_options("postgresql://u:p@db/app", config=config)
+
+        assert options["poolclass"] is InstrumentedQueuePool
+        assert options["pool_pre_ping"] is True
+        assert options["pool_recycle"] == 600
+        assert "connect_args" not in options
+
+
+class TestApplyProfile:
+    """Test connect hooks and pool metrics."""
+
+    def test_sqlite_pragmas_applied(self, profiled_engine):
+        """Test every connection runs the configured pragmas."""
+        with profiled_engine.connect() as conn:
+            values = {
+                name: conn.execute(text(f"PRAGMA {name}")).scalar()
+                for name in sqlite_pragmas()
+            }
+
+        assert values == {
+            "journal_mode": "wal",
+            "synchronous": 1,  # NORMAL
+            "mmap_size": 1024 * 1024,
+            "cache_size": -2048,
+            "busy_timeout": 5000,
+        }
+
+    def test_pool_metrics(self, profiled_engine):
+        """Test checkouts are tracked and exhausted pools time out."""
+        in_use = metrics.gauge("db_pool_in_use")
+        wait_ms = metrics.histogram("db_pool_checkout_wait_ms")
+        timeouts = metrics.counter("db_pool_checkout_timeouts")
+        in_use_before, waits_before = in_use.value, wait_ms.count
+        timeouts_before = timeouts.value
+
+        with profiled_engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            assert in_use.value == in_use_before + 1
+            with pytest.raises(PoolTimeoutError):
+                profiled_engine.connect()
+
+        assert in_use.value == in_use_before
+        assert wait_ms.count == waits_before + 2
+        assert timeouts.value == timeouts_before + 1
@@ -0,0 +1,153 @@
+"""Unit tests for streaming log export - in-memory SQLite and tmp files."""
+
+import csv
+import io
+import json
+from datetime import UTC, datetime
+
+from sqlalchemy import insert
+
+from src.logs.export import (
+    EXPORT_COLUMNS,
+    export_stmt,
+    export_to_file,
+    iter_partitions,
+    make_encoder,
+    stream_export,
+)
+from src.models import PredictionLog
+
+
+def _seed(session_factory, n_rows: int, api_key_id: int = 1) -> None:
+    with session_factory() as session:
+        session.execute(
+            insert(PredictionLog),
+            [
+                {
+                    "api_key_id": api_key_id,
+                    "median_income": float(i),
+                    "ocean_proximity": "INLAND",
+                    "predicted_price": float(i),
+                    "created_at": datetime(2026, 3, 1, i % 24),
+                    "updated_at": datetime(2026, 3, 1, i % 24),
+                }
+                for i in range(n_rows)
+            ],
+        )
+        session.commit()
+
+
+class TestExportStmt:
+    """Test export filters."""
+
+    def test_filters_key_and_inclusive_range(self, session_factory):
+        """Test the API key and both time bounds are applied."""
+        _seed(session_factory, 24)
+        _seed(session_factory, 5, api_key_id=2)
+        stmt = export_stmt(
+            api_key_id=1,
+            created_from=datetime(2026, 3, 1, 10, tzinfo=UTC),
+            created_to=datetime(2026, 3, 1, 12),
+        )
+
+        with session_factory() as session:
+            rows = session.execute(stmt).mappings().all()
+
+        assert [row["predicted_price"] for row in rows] == [10.0, 11.0, 12.0]
+
+
+class TestIterPartitions:
+    """Test chunked reads from the streaming cursor."""
+
+    def test_chunks_of_chunk_rows(self, session_factory):
+        """Test rows arrive in id order, ``chunk_rows`` at a time."""
+        _seed(session_factory, 25)
+
+        with session_factory() as session:
+            chunks = list(iter_partitions(session, export_stmt(), chunk_rows=10))
+
+        assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+        ids = [row["id"] for chunk in chunks for row in chunk]
+        assert ids == sorted(ids)
+
+
+class TestEncoders:
+    """Test per-chunk serialization."""
+
+    def test_ndjson(self, session_factory):
+        """Test one JSON object per row with ISO timestamps."""
+        _seed(session_factory, 2)
+        with session_factory() as session:
+            rows = session.execute(export_stmt()).mappings().all()
+
+        lines = make_encoder("ndjson")(rows).splitlines()
+
+        assert len(lines) == 2
+        first = json.loads(lines[0])
+        assert list(first) == EXPORT_COLUMNS
+        assert first["created_at"] == "2026-03-01T00:00:00"
+        assert first["input_features"]["ocean_proximity"] == "INLAND"
+
+    def test_csv_header_once(self, session_factory):
+        """Test the header is written with the first chunk only."""
+        _seed(session_factory, 3)
+        encode = make_encoder("csv")
+
+        with session_factory() as session:
+            text = "".join(
+                encode(chunk)
+                for chunk in iter_partitions(session, export_stmt(), chunk_rows=2)
+            )
+
+        records = list(csv.DictReader(io.StringIO(text)))
+        assert len(records) == 3
+        assert json.loads(records[2]["input_features"])["median_income"] == 2.0
+
+
+class TestStreamExport:
+    """Test the async generator behind /logs/export."""
+
+    async def test_sync_session_streams_all_rows(self, session_factory):
+        """Test a sync session is drained chunk by chunk on the db executor."""
+        _seed(session_factory, 7)
+
+        chunks = [
+            chunk
+            async for chunk in stream_export(
+                session_factory, export_stmt(), "ndjson", chunk_rows=3
+            )
+        ]
+
+        assert len(chunks) == 3
+        assert sum(chunk.count("\n") for chunk in chunks) == 7
+
+    async def test_session_lives_as_long_as_the_body(self, session_factory):
+        """Test the session opens on the first chunk and closes after the last."""
+        _seed(session_factory, 2)
+        sessions = []
+
+        def tracking_factory():
+            sessions.append(session_factory())
+            return sessions[-1]
+
+        body = stream_export(tracking_factory, export_stmt(), "ndjson", chunk_rows=1)
+        assert sessions == []
+
+        await anext(body)
+        assert sessions[0].in_transaction()
+        assert [chunk async for chunk in body]
+        assert not sessions[0].in_transaction()
+
+
+class TestExportToFile:
+    """Test the CLI writer."""
+
+    def test_writes_csv(self, session_factory, tmp_path):
+        """Test the file holds every row and the count is returned."""
+        _seed(session_factory, 5)
+        output = tmp_path / "logs.csv"
+
+        total = export_to_file(output, "csv", export_stmt(), 2, session_factory)
+
+        assert total == 5
+        assert len(output.read_text().splitlines()) == 6
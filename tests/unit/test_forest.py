@@ -0,0 +1,76 @@
+"""Unit tests for the compiled forest engine - no external dependencies."""
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from src.core.exceptions import ModelLoadError
+from src.ml.forest import CompiledForest
+
+
+@pytest.fixture(scope="module")
+def fitted_forest() -> RandomForestRegressor:
+    """Small forest fitted on synthetic data."""
+    rng = np.random.default_rng(42)
+    X = rng.normal(size=(500, 6))
+    y = X[:, 0] * 3 + np.sin(X[:, 1]) * 10 + rng.normal(size=500)
+    return RandomForestRegressor(n_estimators=20, max_depth=8, random_state=0).fit(X, y)
+
+
+class TestCompiledForest:
+    """Test compiled forest against sklearn predictions."""
+
+    def test_matches_sklearn_exactly(self, fitted_forest):
+        """Test batch predictions are bit-identical to model.predict."""
+        X = np.random.default_rng(1).normal(size=(250, 6))
+        compiled = CompiledForest.from_estimator(fitted_forest)
+
+        np.testing.assert_array_equal(compiled.predict(X), fitted_forest.predict(X))
+
+    def test_single_row(self, fitted_forest):
+        """Test single-row prediction matches sklearn."""
+        X = np.random.default_rng(2).normal(size=(1, 6))
+        compiled = CompiledForest.from_estimator(fitted_forest)
+
+        assert compiled.predict(X)[0] == fitted_forest.predict(X)[0]
+
+    def test_threshold_ties_match(self, fitted_forest):
+        """Test inputs lying exactly on split thresholds follow sklearn."""
+        compiled = CompiledForest.from_estimator(fitted_forest)
+        tree = fitted_forest.estimators_[0].tree_
+        split_nodes = tree.children_left != -1
+        X = np.zeros((int(split_nodes.sum()), 6))
+        X[np.arange(len(X)), tree.feature[split_nodes]] = tree.threshold[split_nodes]
+
+        np.testing.assert_array_equal(compiled.predict(X), fitted_forest.predict(X))
+
+    def test_node_arrays_are_contiguous(self, fitted_forest):
+        """Test node arrays are flat and contiguous."""
+        compiled = CompiledForest.from_estimator(fitted_forest)
+
+        for array in (compiled.feature, compiled.left):
+            assert array.flags["C_CONTIGUOUS"]
+            assert array.dtype == np.int32
+        assert compiled.n_trees == 20
+
+    def test_wrong_feature_count_fails(self, fitted_forest):
+        """Test input with wrong number of features is rejected."""
+        compiled = CompiledForest.from_estimator(fitted_forest)
+        with pytest.raises(ValueError):
+            compiled.predict(np.zeros((1, 3)))
+
+    def test_unfitted_model_fails(self):
+        """Test compiling an unfitted model raises ModelLoadError."""
+        with pytest.raises(ModelLoadError):
+            CompiledForest.from_estimator(RandomForestRegressor())
+
+    def test_save_load_mmap_roundtrip(self, fitted_forest, tmp_path):
+        """Test a saved forest reloads memory-mapped with identical predictions."""
+        X = np.random.default_rng(3).normal(size=(50, 6))
+        compiled = CompiledForest.from_estimator(fitted_forest)
+        compiled.save(tmp_path)
+
+        loaded = CompiledForest.load(tmp_path, mmap_mode="r")
+
+        assert isinstance(loaded.threshold, np.memmap)
+        np.testing.assert_array_equal(loaded.predict(X), compiled.predict(X))
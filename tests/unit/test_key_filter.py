@@ -0,0 +1,200 @@
+"""Unit tests for the API key filter - in-memory SQLite only."""
+
+from src.auth import key_filter as key_filter_module
+from src.auth.key_filter import (
+    APIKeyFilter,
+    CountingBloomFilter,
+    filter_entry,
+    filter_stale_rebuilds,
+)
+from src.auth.repository import AuthRepository
+from src.core.security import api_key_digest, generate_api_key, hash_password
+from src.models import APIKey
+
+
+def _key_filter(session_factory, stale_check_seconds: float = 0) -> APIKeyFilter:
+    return APIKeyFilter(
+        session_factory,
+        capacity=1000,
+        error_rate=0.01,
+        stale_check_seconds=stale_check_seconds,
+    )
+
+
+class TestCountingBloomFilter:
+    """Test membership, removal and sizing."""
+
+    def test_add_remove(self):
+        """Test an added item is found until it is removed."""
+        bloom = CountingBloomFilter(capacity=100, error_rate=0.01)
+        bloom.add("a")
+        bloom.add("b")
+
+        assert "a" in bloom
+        assert bloom.remove("a")
+        assert "a" not in bloom
+        assert "b" in bloom
+        assert bloom.count == 1
+
+    def test_remove_missing_is_noop(self):
+        """Test removing an absent item leaves other items intact."""
+        bloom = CountingBloomFilter(capacity=100, error_rate=0.01)
+        bloom.add("a")
+
+        assert not bloom.remove("missing")
+        assert "a" in bloom
+
+    def test_false_positive_rate_near_target(self):
+        """Test the observed rate at capacity stays close to the target."""
+        bloom = CountingBloomFilter(capacity=2000, error_rate=0.01)
+        for _ in range(2000):
+            bloom.add(generate_api_key())
+
+        hits = sum(generate_api_key() in bloom for _ in range(20000))
+
+        assert hits / 20000 < 0.02
+        assert 0.005 < bloom.estimated_fpr() < 0.015
+
+
+class TestAPIKeyFilter:
+    """Test loading from api_keys and repository updates."""
+
+    def test_unloaded_filter_passes_everything(self, session_factory):
+        """Test keys are not rejected before the first refresh."""
+        assert _key_filter(session_factory).might_exist(generate_api_key())
+
+    def test_refresh_loads_usable_keys(self, session_factory):
+        """Test active keys pass, and unknown or deactivated keys are rejected."""
+        with session_factory() as session:
+            repo = AuthRepository(session)
+            _, kept = repo.create_api_key("kept")
+            gone_key, gone = repo.create_api_key("gone")
+            repo.deactivate(gone_key.id)
+        key_filter = _key_filter(session_factory)
+
+        assert key_filter.refresh() == 1
+        assert key_filter.might_exist(kept)
+        assert not key_filter.might_exist(gone)
+        assert not key_filter.might_exist(generate_api_key())
+
+    def test_legacy_keys_pass_by_prefix(self, session_factory):
+        """Test bcrypt-only rows are matched on their prefix."""
+        plain_key = generate_api_key()
+        with session_factory() as session:
+            session.add(
+                APIKey(
+                    name="legacy",
+                    key_hash=hash_password(plain_key),
+                    key_prefix=plain_key[:8],
+                )
+            )
+            session.commit()
+        key_filter = _key_filter(session_factory)
+        key_filter.refresh()
+
+        assert key_filter.might_exist(plain_key)
+        assert not key_filter.might_exist(generate_api_key())
+
+    def test_add_and_remove_entries(self, session_factory):
+        """Test entries added and removed after loading take effect at once."""
+        key_filter = _key_filter(session_factory)
+        key_filter.refresh()
+        with session_factory() as session:
+            api_key, plain_key = AuthRepository(session).create_api_key("new")
+            entry = filter_entry(api_key)
+
+        key_filter.add(entry)
+        assert key_filter.might_exist(plain_key)
+        key_filter.remove(entry)
+        assert not key_filter.might_exist(plain_key)
+
+    def test_add_during_refresh_survives(self, session_factory):
+        """Test a key added while a refresh reads the table is kept."""
+        key_filter = _key_filter(session_factory)
+        plain_key = generate_api_key()
+        entry = api_key_digest(plain_key)
+
+        def factory():
+            # The key is created after the refresh started reading
+            key_filter.add(entry)
+            return session_factory()
+
+        key_filter.session_factory = factory
+        key_filter.refresh()
+
+        assert key_filter.might_exist(plain_key)
+
+
+class TestStaleMisses:
+    """Test misses are confirmed against changes made by other workers."""
+
+    async def test_key_created_elsewhere_accepted(self, session_factory):
+        """Test a key created after loading (by another worker) is not rejected."""
+        key_filter = _key_filter(session_factory)
+        key_filter.refresh()
+        with session_factory() as session:
+            # Another worker: this filter is never told about the key
+            _, plain_key = AuthRepository(session).create_api_key("elsewhere")
+        rebuilds = filter_stale_rebuilds.value
+
+        assert not key_filter.might_exist(plain_key)
+        assert not await key_filter.rejects(plain_key)
+        assert key_filter.might_exist(plain_key)
+        assert filter_stale_rebuilds.value == rebuilds + 1
+
+    async def test_key_restored_elsewhere_accepted(self, session_factory):
+        """Test a key restored by another worker passes once more."""
+        with session_factory() as session:
+            repo = AuthRepository(session)
+            api_key, plain_key = repo.create_api_key("restored")
+            key_id = api_key.id
+            repo.delete(key_id)
+        key_filter = _key_filter(session_factory)
+        key_filter.refresh()
+        assert await key_filter.rejects(plain_key)
+
+        with session_factory() as session:
+            AuthRepository(session).restore(key_id)
+
+        assert not await key_filter.rejects(plain_key)
+
+    async def test_unchanged_table_rejects_without_rebuild(self, session_factory):
+        """Test an unknown key is rejected by one version check alone."""
+        with session_factory() as session:
+            AuthRepository(session).create_api_key("existing")
+        key_filter = _key_filter(session_factory)
+        key_filter.refresh()
+        rebuilds = filter_stale_rebuilds.value
+
+        for _ in range(3):
+            assert await key_filter.rejects(generate_api_key())
+        assert filter_stale_rebuilds.value == rebuilds
+
+    async def test_one_version_query_per_window(self, session_factory, monkeypatch):
+        """Test a burst of misses reads the table version at most once."""
+        key_filter = _key_filter(session_factory, stale_check_seconds=60)
+        key_filter.refresh()
+        key_filter._version_checked_at = float("-inf")  # window just expired
+        reads = []
+        table_version = key_filter_module._table_version
+
+        def counting_version(session):
+            reads.append(1)
+            return table_version(session)
+
+        monkeypatch.setattr(key_filter_module, "_table_version", counting_version)
+
+        for _ in range(20):
+            assert await key_filter.rejects(generate_api_key())
+        assert len(reads) == 1
+
+    async def test_key_created_elsewhere_waits_for_window(self, session_factory):
+        """Test inside the window a miss is answered without the database."""
+        key_filter = _key_filter(session_factory, stale_check_seconds=60)
+        key_filter.refresh()
+        with session_factory() as session:
+            _, plain_key = AuthRepository(session).create_api_key("elsewhere")
+
+        assert await key_filter.rejects(plain_key)
+        key_filter.stale_check_seconds = 0
+        assert not await key_filter.rejects(plain_key)
@@ -0,0 +1,330 @@
+"""Unit tests for the prediction log repository - in-memory SQLite only."""
+
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import insert, select
+
+from src.auth.repository import AuthRepository
+from src.logs import stats
+from src.logs.pagination import decode_cursor, encode_cursor
+from src.logs.repository import (
+    LogSearchFilters,
+    PredictionLogRepository,
+    _search_stmt,
+    prediction_logs,
+)
+from src.logs.stats import rebuild_stats
+from src.logs.writer import log_row
+from src.models import PredictionBatch, PredictionLog, PredictionStat
+
+
+def _predictions(n: int) -> list[tuple[dict, float]]:
+    return [({"median_income": float(i)}, float(i)) for i in range(n)]
+
+
+class TestInsertBatch:
+    """Test the Core bulk insert path for batch predictions."""
+
+    def test_returns_ids_in_input_order(self, session_factory):
+        """Test ids map back to the input rows and share one batch_id."""
+        with session_factory() as session:
+            result = PredictionLogRepository(session).insert_batch(
+                api_key_id=1, predictions=_predictions(5), model_version="v1"
+            )
+
+            assert len(result.ids) == 5
+            assert len(session.identity_map) == 0
+            rows = session.execute(
+                select(PredictionLog.id, PredictionLog.predicted_price)
+                .where(PredictionLog.batch_id == result.batch_id)
+                .order_by(PredictionLog.id)
+            ).all()
+        assert [price for _, price in rows] == [0.0, 1.0, 2.0, 3.0, 4.0]
+        assert [log_id for log_id, _ in rows] == result.ids
+
+    def test_without_executemany_returning(self, session_factory, monkeypatch):
+        """Test dialects without RETURNING fall back to a batch_id lookup."""
+        with session_factory() as session:
+            dialect = session.get_bind().dialect
+            monkeypatch.setattr(
+                dialect, "insert_executemany_returning_sort_by_parameter_order", False
+            )
+            repo = PredictionLogRepository(session)
+            first = repo.insert_batch(api_key_id=1, predictions=_predictions(3))
+            second = repo.insert_batch(api_key_id=1, predictions=_predictions(2))
+
+            assert len(first.ids) == 3 and len(second.ids) == 2
+            assert max(first.ids) < min(second.ids)
+            log = repo.get_by_id(second.ids[0])
+            assert log.batch_id == second.batch_id
+            assert log.request_type == "batch" and log.created_at is not None
+
+    def test_empty_batch(self, session_factory):
+        """Test an empty batch inserts nothing."""
+        with session_factory() as session:
+            repo = PredictionLogRepository(session)
+            result = repo.insert_batch(api_key_id=1, predictions=[])
+
+            assert result.ids == [] and repo.count_all() == 0
+
+
+class TestBatchStorage:
+    """Test batches stored as one header plus compact rows."""
+
+    HOUSE = {
+        "longitude": -122.64,
+        "latitude": 38.01,
+        "housing_median_age": 36.0,
+        "total_rooms": 1336.0,
+        "total_bedrooms": 258.0,
+        "population": 678.0,
+        "households": 249.0,
+        "median_income": 5.5789,
+        "ocean_proximity": "NEAR OCEAN",
+    }
+
+    def test_shared_fields_on_header(self, session_factory):
+        """Test rows keep no batch fields yet read them from their header."""
+        with session_factory() as session:
+            repo = PredictionLogRepository(session)
+            result = repo.insert_batch(
+                1, [(self.HOUSE, 1.0), (self.HOUSE, 2.0)], 12, model_version="v1"
+            )
+            stored = session.execute(
+                select(
+                    prediction_logs.c.response_time_ms, prediction_logs.c.model_version
+                )
+            ).all()
+            log = repo.get_by_id(result.ids[1])
+
+            assert len(session.execute(select(PredictionBatch)).all()) == 1
+            assert stored == [(None, None), (None, None)]
+            assert log.input_features == self.HOUSE
+            assert (log.request_type, log.batch_id) == ("batch", result.batch_id)
+            assert (log.response_time_ms, log.model_version) == (12, "v1")
+
+    def test_every_batch_path_matches(self, session_factory):
+        """Test ORM, Core and write-behind batches read back the same."""
+        rows = [log_row(1, self.HOUSE, 1.0, 12, "batch", "b-1", "v1") for _ in range(2)]
+        with session_factory() as session:
+            repo = PredictionLogRepository(session)
+            orm = repo.create_batch(1, [(self.HOUSE, 1.0)] * 2, 12, "v1")
+            core = repo.insert_batch(1, [(self.HOUSE, 1.0)] * 2, 12, "v1")
+            # One write-behind batch split across two flushes
+            repo.bulk_create(rows[:1])
+            repo.bulk_create(rows[1:])
+
+            batches = [orm[0].batch_id, core.batch_id, "b-1"]
+            for batch_id in batches:
+                logs = repo.get_by_batch_id(batch_id)
+                assert len(logs) == 2
+                assert {
+                    (log.input_features == self.HOUSE, log.response_time_ms)
+                    for log in logs
+                } == {(True, 12)}
+            assert len(session.execute(select(PredictionBatch)).all()) == 3
+
+    def test_single_keeps_own_fields(self, session_factory):
+        """Test single predictions store their fields without a header."""
+        with session_factory() as session:
+            repo = PredictionLogRepository(session)
+            log = repo.create(1, self.HOUSE, 1.0, 7, model_version="v2")
+            batched = repo.bulk_create([log_row(1, self.HOUSE, 2.0, 8, "single")])
+
+            assert batched == 1
+            assert (log.request_type, log.batch_id) == ("single", None)
+            assert (log.response_time_ms, log.model_version) == (7, "v2")
+            stmt = select(PredictionLog.id).where(
+                PredictionLog.request_type == "single"
+            )
+            assert len(session.execute(stmt).all()) == 2
+
+
+class TestKeysetPagination:
+    """Test paging a key's logs by (created_at, id) cursor."""
+
+    def test_pages_cover_every_log_once(self, session_factory):
+        """Test pages are newest first and ties on created_at split by id."""
+        created_at = [datetime(2026, 1, 1, 12, minute) for minute in (0, 1, 1, 1, 2)]
+        with session_factory() as session:
+            session.execute(
+                insert(PredictionLog),
+                [
+                    {
+                        "api_key_id": api_key_id,
+                        "predicted_price": float(i),
+                        "created_at": ts,
+                        "updated_at": ts,
+                    }
+                    for api_key_id in (1, 2)
+                    for i, ts in enumerate(created_at)
+                ],
+            )
+            repo = PredictionLogRepository(session)
+
+            pages, after = [], None
+            while page := repo.get_by_api_key(1, limit=2, after=after):
+                pages.append([log.predicted_price for log in page])
+                after = decode_cursor(encode_cursor(page[-1].created_at, page[-1].id))
+
+        assert pages == [[4.0, 3.0], [2.0, 1.0], [0.0]]
+
+
+class TestPredictionStats:
+    """Test the per-key, per-day counters kept alongside inserts."""
+
+    def _insert_all_kinds(self, repo: PredictionLogRepository) -> None:
+        repo.create(api_key_id=1, input_features={}, predicted_price=1.0)
+        repo.create_batch(api_key_id=1, predictions=_predictions(2))
+        repo.insert_batch(api_key_id=2, predictions=_predictions(3))
+        repo.bulk_create([log_row(2, {}, 1.0) for _ in range(4)])
+
+    def test_every_insert_path_counts(self, session_factory):
+        """Test single, ORM batch, Core batch and bulk inserts bump counters."""
+        with session_factory() as session:
+            repo = PredictionLogRepository(session)
+            self._insert_all_kinds(repo)
+
+            assert repo.stats_count_by_api_key(1) == 3
+            assert repo.stats_count_by_api_key(2) == 7
+            assert repo.stats_count_all() == repo.count_all() == 10
+            assert repo.stats_count_by_api_key(3) == 0
+
+    def test_without_upsert(self, session_factory, monkeypatch):
+        """Test dialects without ON CONFLICT update, then insert, counters."""
+        monkeypatch.setattr(stats, "_UPSERT_INSERTS", {})
+        with session_factory() as session:
+            repo = PredictionLogRepository(session)
+            self._insert_all_kinds(repo)
+
+            assert repo.stats_count_all() == 10
+            # One row per key and the day's total
+            assert len(session.execute(select(PredictionStat)).all()) == 3
+
+    def test_rebuild_reconciles(self, session_factory):
+        """Test a rebuild recounts the days that still have logs."""
+        with session_factory() as session:
+            repo = PredictionLogRepository(session)
+            self._insert_all_kinds(repo)
+            stale = {"api_key_id": 9, "day": datetime.now(UTC).date()}
+            archived = {"api_key_id": 9, "day": datetime(2020, 1, 1).date()}
+            archived_total = {**archived, "api_key_id": stats.TOTAL_API_KEY_ID}
+            session.execute(
+                insert(PredictionStat),
+                [
+                    {**stale, "prediction_count": 5},
+                    {**archived, "prediction_count": 7},
+                    {**archived_total, "prediction_count": 7},
+                ],
+            )
+            session.execute(
+                insert(PredictionLog).values(
+                    api_key_id=None,
+                    predicted_price=1.0,
+                    created_at=datetime(2026, 1, 1, 23, 59),
+                    updated_at=datetime(2026, 1, 1, 23, 59),
+                )
+            )
+            session.commit()
+
+            # Keys 1 and 2, key 0 and two day totals, plus the archived day
+            assert rebuild_stats(session) == 7
+            assert session.get(PredictionStat, tuple(stale.values())) is None
+            assert session.get(PredictionStat, tuple(archived.values())) is not None
+            assert repo.stats_count_all() == 11 + 7
+            orphaned = session.get(PredictionStat, (0, datetime(2026, 1, 1).date()))
+            assert orphaned.prediction_count == 1
+
+    def test_hard_deleted_key_folded_into_unkeyed(self, session_factory):
+        """Test deleting a key moves its counters to api_key_id 0."""
+        today = datetime.now(UTC).date()
+        archived = datetime(2020, 1, 1).date()
+        with session_factory() as session:
+            api_key, _ = AuthRepository(session).create_api_key("gone")
+            repo = PredictionLogRepository(session)
+            repo.bulk_create([log_row(api_key.id, {}, 1.0) for _ in range(3)])
+            repo.bulk_create([log_row(None, {}, 1.0)])
+            session.execute(
+                insert(PredictionStat).values(
+                    api_key_id=api_key.id, day=archived, prediction_count=2
+                )
+            )
+            session.commit()
+
+            AuthRepository(session).delete(api_key.id, hard_delete=True)
+
+            assert repo.stats_count_by_api_key(api_key.id) == 0
+            assert session.get(PredictionStat, (0, today)).prediction_count == 4
+            assert session.get(PredictionStat, (0, archived)).prediction_count == 2
+            assert repo.stats_count_all() == 4
+
+
+class TestSearch:
+    """Test /logs/search filtering on the typed columns."""
+
+    HOUSES = [
+        ({"latitude": 38.0, "longitude": -122.6, "ocean_proximity": "NEAR BAY"}, 1e5),
+        ({"latitude": 34.0, "longitude": -118.2, "ocean_proximity": "INLAND"}, 2e5),
+        ({"latitude": 37.8, "longitude": -122.4, "ocean_proximity": "INLAND"}, 3e5),
+    ]
+
+    @staticmethod
+    def _prices(repo: PredictionLogRepository, **filters) -> list[float]:
+        logs = repo.search(1, LogSearchFilters(**filters))
+        return sorted(log.predicted_price for log in logs)
+
+    def test_every_insert_path_fills_columns(self, session_factory):
+        """Test typed columns are copied from input_features on insert."""
+        with session_factory() as session:
+            repo = PredictionLogRepository(session)
+            repo.create(1, *self.HOUSES[0])
+            repo.create_batch(1, self.HOUSES[:1])
+            repo.insert_batch(1, self.HOUSES[:1])
+            repo.bulk_create([log_row(1, *self.HOUSES[0])])
+            rows = session.execute(
+                select(
+                    PredictionLog.ocean_proximity,
+                    PredictionLog.latitude,
+                    PredictionLog.longitude,
+                )
+            ).all()
+
+        assert rows == [("NEAR BAY", 38.0, -122.6)] * 4
+
+    def test_filters(self, session_factory):
+        """Test each filter alone and combined, scoped to the caller's key."""
+        bay_area = {
+            "min_latitude": 37.0,
+            "max_latitude": 39.0,
+            "min_longitude": -123.0,
+            "max_longitude": -122.0,
+        }
+        later = datetime.now(UTC) + timedelta(hours=1)
+        with session_factory() as session:
+            repo = PredictionLogRepository(session)
+            repo.insert_batch(api_key_id=1, predictions=self.HOUSES)
+            repo.create(2, *self.HOUSES[1])
+
+            assert self._prices(repo, min_price=1.5e5) == [2e5, 3e5]
+            assert self._prices(repo, ocean_proximity="INLAND") == [2e5, 3e5]
+            assert self._prices(repo, **bay_area) == [1e5, 3e5]
+            assert self._prices(repo, ocean_proximity="INLAND", max_price=2.5e5) == [
+                2e5
+            ]
+            assert self._prices(repo, created_from=later) == []
+
+    def test_filters_use_indexes(self, session_factory):
+        """Test SQLite plans an index search rather than a table scan."""
+        filters = [
+            LogSearchFilters(min_price=1.0, max_price=2.0),
+            LogSearchFilters(ocean_proximity="INLAND"),
+            LogSearchFilters(min_latitude=37.0, max_latitude=39.0),
+        ]
+        with session_factory() as session:
+            engine = session.get_bind()
+            for search in filters:
+                sql = _search_stmt(1, search, 100, None).compile(
+                    engine, compile_kwargs={"literal_binds": True}
+                )
+                plan = session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+                assert "USING INDEX" in plan.all()[0][3]
@@ -0,0 +1,183 @@
+"""Unit tests for the write-behind audit log writer - in-memory SQLite only."""
+
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import select
+
+from src.core.exceptions import ExecutorSaturatedError
+from src.logs.writer import LogWriter, log_row
+from src.models import PredictionLog
+
+
+def _rows(n: int, start: int = 0) -> list[dict]:
+    return [
+        log_row(1, {"median_income": float(i)}, float(i), model_version="v1")
+        for i in range(start, start + n)
+    ]
+
+
+def _stored(session_factory) -> list[float]:
+    with session_factory() as session:
+        stmt = select(PredictionLog.predicted_price).order_by(PredictionLog.id)
+        return list(session.execute(stmt).scalars())
+
+
+class TestLogWriter:
+    """Test queueing, flush triggers and overflow policies."""
+
+    async def test_flushes_when_batch_full(self, session_factory):
+        """Test a full batch is written without waiting for the interval."""
+        writer = LogWriter(
+            session_factory, max_queue=10, flush_rows=3, flush_interval_ms=60_000
+        )
+        await writer.submit(_rows(3))
+        for _ in range(100):
+            if _stored(session_factory):
+                break
+            await asyncio.sleep(0.01)
+
+        assert _stored(session_factory) == [0.0, 1.0, 2.0]
+        await writer.stop()
+
+    async def test_flushes_after_interval(self, session_factory):
+        """Test a partial batch is written once the interval elapses."""
+        writer = LogWriter(
+            session_factory, max_queue=10, flush_rows=100, flush_interval_ms=20
+        )
+        await writer.submit(_rows(1))
+        await asyncio.sleep(0.3)
+
+        assert _stored(session_factory) == [0.0]
+        await writer.stop()
+
+    async def test_stop_flushes_queue(self, session_factory):
+        """Test rows still queued at shutdown are written."""
+        writer = LogWriter(
+            session_factory, max_queue=10, flush_rows=100, flush_interval_ms=60_000
+        )
+        await writer.submit(_rows(5))
+        await asyncio.sleep(0)
+        await writer.stop()
+
+        assert _stored(session_factory) == [0.0, 1.0, 2.0, 3.0, 4.0]
+        with session_factory() as session:
+            log = session.execute(select(PredictionLog)).scalars().first()
+            assert log.model_version == "v1"
+            assert log.input_features["median_income"] == 0.0
+
+    async def test_drop_policy(self, session_factory):
+        """Test rows beyond the queue bound are discarded."""
+        writer = LogWriter(
+            session_factory,
+            max_queue=2,
+            flush_rows=100,
+            flush_interval_ms=60_000,
+            policy="drop",
+        )
+        await writer.submit(_rows(5))
+        await writer.stop()
+
+        assert _stored(session_factory) == [0.0, 1.0]
+
+    async def test_spill_policy_replays(self, session_factory, tmp_path):
+        """Test overflow is spilled to disk and replayed after draining."""
+        spill_path = tmp_path / "logs.spill.ndjson"
+        writer = LogWriter(
+            session_factory,
+            max_queue=2,
+            flush_rows=100,
+            flush_interval_ms=60_000,
+            policy="spill",
+            spill_path=spill_path,
+        )
+        await writer.submit(_rows(5))
+
+        assert len(spill_path.read_text().splitlines()) == 3
+        await writer.stop()
+
+        assert sorted(_stored(session_factory)) == [0.0, 1.0, 2.0, 3.0, 4.0]
+        assert not spill_path.exists()
+
+    async def test_failed_flush_spilled(self, tmp_path):
+        """Test rows from a failed bulk insert are kept in the spill file."""
+
+        def broken_session():
+            raise RuntimeError("database is locked")
+
+        spill_path = tmp_path / "logs.spill.ndjson"
+        writer = LogWriter(
+            broken_session,
+            max_queue=10,
+            flush_rows=100,
+            flush_interval_ms=60_000,
+            spill_path=spill_path,
+        )
+        await writer.submit(_rows(2))
+        await writer.stop()
+
+        # The shutdown replay failed too, so the rows wait in the replay file
+        replay_path = spill_path.with_name(spill_path.name + ".replaying")
+        assert len(replay_path.read_text().splitlines()) == 2
+
+    def test_shared_spill_replayed_once(self, session_factory, tmp_path):
+        """Test two workers sharing a spill file never replay the same rows."""
+        entered, release = threading.Event(), threading.Event()
+
+        def slow_session():
+            entered.set()
+            release.wait(5)
+            return session_factory()
+
+        spill_path = tmp_path / "logs.spill.ndjson"
+        options = {
+            "max_queue": 10,
+            "flush_rows": 100,
+            "flush_interval_ms": 60_000,
+            "policy": "spill",
+            "spill_path": spill_path,
+        }
+        first = LogWriter(slow_session, **options)
+        second = LogWriter(session_factory, **options)
+        first._spill(_rows(3))
+        replay = threading.Thread(target=first._replay_spill)
+        replay.start()
+        assert entered.wait(5)
+
+        # Mid-replay the second worker skips, and its new rows wait for the next
+        assert second._replay_spill() == 0
+        second._spill(_rows(2, start=10))
+        release.set()
+        replay.join(5)
+
+        assert second._replay_spill() == 2
+        assert sorted(_stored(session_factory)) == [0.0, 1.0, 2.0, 10.0, 11.0]
+        assert not spill_path.exists()
+
+    async def test_block_policy_rejects_after_timeout(self, session_factory):
+        """Test a full queue applies backpressure, then rejects the request."""
+        release = threading.Event()
+
+        def slow_session():
+            release.wait(5)
+            return session_factory()
+
+        writer = LogWriter(
+            slow_session,
+            max_queue=1,
+            flush_rows=1,
+            flush_interval_ms=60_000,
+            policy="block",
+            block_timeout_ms=50,
+        )
+        await writer.submit(_rows(1))
+        await asyncio.sleep(0.05)  # first row is now stuck in a flush
+
+        await writer.submit(_rows(1))
+        with pytest.raises(ExecutorSaturatedError):
+            await writer.submit(_rows(1))
+
+        release.set()
+        await writer.stop()
+        assert len(_stored(session_factory)) == 2
@@ -0,0 +1,90 @@
+"""Unit tests for versioned model handles and hot reload - no external dependencies."""
+
+import asyncio
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from src.config import settings
+from src.core.exceptions import ModelLoadError
+from src.ml.manager import ModelManager
+from src.ml.preprocessing import N_FEATURES
+
+
+def write_model(path, n_features: int = N_FEATURES, seed: int = 0) -> None:
+    rng = np.random.default_rng(seed)
+    X = rng.uniform(0, 10, size=(200, n_features))
+    model = RandomForestRegressor(n_estimators=3, max_depth=4, random_state=seed)
+    joblib.dump(model.fit(X, X[:, 0] * 100), path)
+
+
+@pytest.fixture
+def model_path(tmp_path, monkeypatch) -> str:
+    path = tmp_path / "model.joblib"
+    write_model(path)
+    monkeypatch.setattr(settings, "MODEL_PATH", str(path))
+    return str(path)
+
+
+class TestModelManager:
+    """Test loading, validation and atomic swaps."""
+
+    def test_loads_on_first_use(self, model_path):
+        """Test the current handle is loaded lazily and reused."""
+        manager = ModelManager()
+
+        handle = manager.current
+
+        assert manager.current is handle
+        assert len(handle.version) == 12
+        assert handle.path == model_path
+
+    async def test_reload_swaps_and_keeps_old_handle(self, model_path):
+        """Test a new artifact is swapped in while old holders keep theirs."""
+        manager = ModelManager()
+        old = manager.current
+        write_model(model_path, seed=1)
+
+        new, swapped = await manager.reload()
+
+        assert swapped and new.version != old.version
+        assert manager.current is new
+        X = np.ones((1, N_FEATURES))
+        assert old.engine.predict(X)[0] != new.engine.predict(X)[0]
+
+    async def test_unchanged_artifact_not_swapped(self, model_path):
+        """Test reloading identical content keeps the serving handle."""
+        manager = ModelManager()
+        old = manager.current
+
+        handle, swapped = await manager.reload()
+
+        assert not swapped and handle is old
+
+    async def test_invalid_artifact_rejected(self, model_path):
+        """Test a model with the wrong feature count never takes traffic."""
+        manager = ModelManager()
+        old = manager.current
+        write_model(model_path, n_features=5)
+
+        with pytest.raises(ModelLoadError, match="features"):
+            await manager.reload()
+        assert manager.current is old
+
+    async def test_watcher_reloads_on_change(self, model_path):
+        """Test the MODEL_PATH watcher picks up a rewritten artifact."""
+        manager = ModelManager()
+        old = manager.current
+        manager.start_watching(0.01)
+        try:
+            write_model(model_path, seed=2)
+            for _ in range(200):
+                if manager.current is not old:
+                    break
+                await asyncio.sleep(0.02)
+        finally:
+            await manager.stop_watching()
+
+        assert manager.current.version != old.version
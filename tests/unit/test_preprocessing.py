@@ -0,0 +1,65 @@
+"""Unit tests for feature encoding - no external dependencies."""
+
+import numpy as np
+import pytest
+
+from src.constants import ALL_FEATURE_COLUMNS
+from src.ml.preprocessing import (
+    encode_features,
+    encode_one,
+    prepare_batch_features,
+    prepare_features,
+)
+from src.predictions.schema import HouseFeatures, OceanProximity
+
+
+@pytest.fixture
+def houses() -> list[HouseFeatures]:
+    """One house per ocean proximity category."""
+    return [
+        HouseFeatures(
+            longitude=-122.64 + i,
+            latitude=38.01 - i,
+            housing_median_age=36.0,
+            total_rooms=1336.0 + i,
+            total_bedrooms=258.0,
+            population=678.0,
+            households=249.0,
+            median_income=5.5789,
+            ocean_proximity=category,
+        )
+        for i, category in enumerate(OceanProximity)
+    ]
+
+
+class TestEncodeFeatures:
+    """Test NumPy encoder against the DataFrame preprocessing."""
+
+    def test_matches_dataframe_encoding(self, houses):
+        """Test matrix equals the DataFrame built by prepare_batch_features."""
+        expected = prepare_batch_features(houses).to_numpy(dtype=np.float64)
+        np.testing.assert_array_equal(encode_features(houses), expected)
+
+    def test_layout(self, houses):
+        """Test matrix shape, dtype and memory layout."""
+        X = encode_features(houses)
+        assert X.shape == (len(houses), len(ALL_FEATURE_COLUMNS))
+        assert X.dtype == np.float64
+        assert X.flags["C_CONTIGUOUS"]
+
+    def test_single_house(self, houses):
+        """Test encode_one matches prepare_features."""
+        expected = prepare_features(houses[0]).to_numpy(dtype=np.float64)
+        np.testing.assert_array_equal(encode_one(houses[0]), expected)
+
+    def test_reuses_out_buffer(self, houses):
+        """Test a dirty preallocated buffer is fully overwritten."""
+        out = np.full((len(houses), len(ALL_FEATURE_COLUMNS)), 7.0)
+        X = encode_features(houses, out=out)
+        assert X is out
+        np.testing.assert_array_equal(X, encode_features(houses))
+
+    def test_wrong_out_shape_fails(self, houses):
+        """Test mismatched output buffer is rejected."""
+        with pytest.raises(ValueError):
+            encode_features(houses, out=np.zeros((1, 3)))
@@ -0,0 +1,73 @@
+"""Unit tests for the authenticated-principal cache - no external dependencies."""
+
+import time
+
+from src.auth.cache import PrincipalCache, principal_hits, principal_misses
+
+PRINCIPAL = {"id": 1, "name": "key"}
+
+
+class TestPrincipalCache:
+    """Test lookups, expiry, bounds and invalidation."""
+
+    def test_miss_then_hit(self):
+        """Test a stored principal is found by key id and counted."""
+        cache = PrincipalCache(max_entries=10, ttl_seconds=60)
+        hits, misses = principal_hits.value, principal_misses.value
+
+        assert cache.get(1) is None
+        cache.put(PRINCIPAL)
+
+        assert cache.get(1) == PRINCIPAL
+        assert principal_hits.value - hits == 1
+        assert principal_misses.value - misses == 1
+
+    def test_token_hit(self):
+        """Test a cached token resolves without decoding, until it expires."""
+        cache = PrincipalCache(max_entries=10, ttl_seconds=60)
+        cache.put(PRINCIPAL, "token-a", time.time() + 60)
+        cache.put(PRINCIPAL, "token-b", time.time() - 1)
+
+        assert cache.get_by_token("token-a") == PRINCIPAL
+        assert cache.get_by_token("token-b") is None
+        assert cache.get_by_token("unknown") is None
+
+    def test_token_key_id_not_counted(self):
+        """Test the rate limiter's token lookup leaves hit/miss counts alone."""
+        cache = PrincipalCache(max_entries=10, ttl_seconds=60)
+        cache.put(PRINCIPAL, "token", time.time() + 60)
+        hits, misses = principal_hits.value, principal_misses.value
+
+        assert cache.token_key_id("token") == 1
+        assert cache.token_key_id("unknown") is None
+        assert (principal_hits.value, principal_misses.value) == (hits, misses)
+
+    def test_ttl_expiry(self):
+        """Test principals are reloaded once the TTL has passed."""
+        cache = PrincipalCache(max_entries=10, ttl_seconds=0)
+        cache.put(PRINCIPAL, "token", time.time() + 60)
+
+        assert cache.get(1) is None
+        assert cache.get_by_token("token") is None
+
+    def test_invalidate_drops_token_entries(self):
+        """Test invalidating a key also stops its tokens from hitting."""
+        cache = PrincipalCache(max_entries=10, ttl_seconds=60)
+        cache.put(PRINCIPAL, "token", time.time() + 60)
+
+        cache.invalidate(1)
+
+        assert cache.get(1) is None
+        assert cache.get_by_token("token") is None
+
+    def test_lru_bound(self):
+        """Test least recently used principals are evicted at the bound."""
+        cache = PrincipalCache(max_entries=2, ttl_seconds=60)
+        for key_id in (1, 2):
+            cache.put({"id": key_id, "name": str(key_id)})
+        cache.get(1)
+        cache.put({"id": 3, "name": "3"})
+
+        assert len(cache) == 2
+        assert cache.get(2) is None
+        assert cache.get(1) is not None
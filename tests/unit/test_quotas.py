@@ -0,0 +1,295 @@
+"""Unit tests for prediction quota stores and the quota manager - tmp SQLite only."""
+
+import asyncio
+import threading
+import types
+
+import pytest
+
+from src.core import quota_storage, quotas
+from src.core.exceptions import ExecutorSaturatedError, QuotaExceededError
+from src.core.quota_storage import (
+    MemoryQuotaStore,
+    SQLiteQuotaStore,
+    quota_store_from_uri,
+)
+from src.core.quotas import QuotaManager
+from src.predictions.streaming import meter_bytes
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.time() for the store module."""
+    now = [1_000_000.0]
+    monkeypatch.setattr(
+        quota_storage, "time", types.SimpleNamespace(time=lambda: now[0])
+    )
+    return now
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryQuotaStore()
+    return SQLiteQuotaStore(f"sqlite:///{tmp_path}/quotas.db")
+
+
+def _manager(store, capacity: float = 10, rate: float = 2) -> QuotaManager:
+    return QuotaManager(
+        store, capacity, refill_per_second=rate, max_concurrent=2, lease_seconds=30
+    )
+
+
+class TestQuotaStore:
+    """Test both stores' token buckets and leases."""
+
+    def test_take_until_empty(self, store, clock):
+        """Test a full bucket is charged down and then refuses."""
+        results = [store.take("k", 4, 4, 10, 1) for _ in range(3)]
+
+        assert results == [(True, 6), (True, 2), (False, 2)]
+
+    def test_refill_capped_at_capacity(self, store, clock):
+        """Test tokens refill at the rate, never above capacity."""
+        store.take("k", 10, 10, 10, 2)
+        clock[0] += 3
+        assert store.take("k", 6, 6, 10, 2) == (True, 0)
+
+        clock[0] += 100
+        assert store.take("k", 1, 1, 10, 2) == (True, 9)
+
+    def test_cost_above_need_leaves_debt(self, store, clock):
+        """Test a cost larger than the bucket is admitted when full."""
+        assert store.take("k", 25, 10, 10, 5) == (True, -15)
+        clock[0] += 2
+        assert store.take("k", 1, 1, 10, 5) == (False, -5)
+
+        clock[0] += 2
+        assert store.take("k", 1, 1, 10, 5) == (True, 4)
+
+    def test_keys_independent(self, store, clock):
+        """Test each key has its own bucket."""
+        store.take("a", 10, 10, 10, 1)
+
+        assert store.take("b", 10, 10, 10, 1) == (True, 0)
+
+    def test_slots_limited_and_released(self, store, clock):
+        """Test leases are capped per key and freed on release."""
+        first = store.acquire_slot("k", 2, 30)
+        second = store.acquire_slot("k", 2, 30)
+
+        assert first and second and first != second
+        assert store.acquire_slot("k", 2, 30) is None
+        assert store.acquire_slot("other", 2, 30) is not None
+
+        store.release_slot("k", first)
+        assert store.acquire_slot("k", 2, 30) is not None
+
+    def test_renew_extends_live_lease(self, store, clock):
+        """Test a renewed lease outlives its first expiry; an expired one is lost."""
+        lease = store.acquire_slot("k", 1, 30)
+        clock[0] += 20
+        assert store.renew_slot("k", lease, 30)
+
+        clock[0] += 20
+        assert store.acquire_slot("k", 1, 30) is None
+        clock[0] += 11
+        assert not store.renew_slot("k", lease, 30)
+
+    def test_lease_expires(self, store, clock):
+        """Test a lease never released (crashed worker) expires."""
+        store.acquire_slot("k", 1, 30)
+        assert store.acquire_slot("k", 1, 30) is None
+
+        clock[0] += 31
+        assert store.acquire_slot("k", 1, 30) is not None
+
+    def test_reset(self, store, clock):
+        """Test reset refills buckets and drops leases."""
+        store.take("k", 10, 10, 10, 1)
+        store.acquire_slot("k", 1, 30)
+        store.reset()
+
+        assert store.take("k", 10, 10, 10, 1) == (True, 0)
+        assert store.acquire_slot("k", 1, 30) is not None
+
+
+class TestSQLiteQuotaStore:
+    """Test state shared through one file."""
+
+    def test_shared_between_instances(self, tmp_path, clock):
+        """Test two stores on one file (two workers) share buckets and slots."""
+        uri = f"sqlite:///{tmp_path}/quotas.db"
+        workers = [SQLiteQuotaStore(uri) for _ in range(2)]
+
+        taken = [workers[i % 2].take("k", 3, 3, 10, 1)[0] for i in range(4)]
+        slots = [workers[i % 2].acquire_slot("k", 3, 30) for i in range(4)]
+
+        assert taken == [True, True, True, False]
+        assert [s is not None for s in slots] == [True, True, True, False]
+
+    def test_store_from_uri(self, tmp_path):
+        """Test memory:// and sqlite:/// URIs; others are rejected."""
+        assert isinstance(quota_store_from_uri("memory://"), MemoryQuotaStore)
+        assert isinstance(
+            quota_store_from_uri(f"sqlite:///{tmp_path}/q.db"), SQLiteQuotaStore
+        )
+        with pytest.raises(ValueError):
+            quota_store_from_uri("redis://localhost")
+
+
+class TestQuotaManager:
+    """Test charging, rejection and concurrency slots."""
+
+    async def test_take_returns_remaining(self, clock):
+        """Test a charge returns the units left."""
+        assert await _manager(MemoryQuotaStore()).take(1, 3) == 7
+
+    async def test_rejection_carries_retry_after(self, clock):
+        """Test Retry-After is the time to refill what the request needs."""
+        manager = _manager(MemoryQuotaStore())
+        await manager.take(1, 9)
+
+        with pytest.raises(QuotaExceededError) as exc:
+            await manager.take(1, 5)
+
+        assert exc.value.retry_after == pytest.approx(2.0)
+        assert exc.value.remaining == 1
+
+    async def test_oversized_cost_waits_for_full_bucket(self, clock):
+        """Test a cost above capacity only needs a full bucket."""
+        manager = _manager(MemoryQuotaStore())
+        await manager.take(1, 4)
+
+        with pytest.raises(QuotaExceededError) as exc:
+            await manager.take(1, 50)
+
+        assert exc.value.retry_after == pytest.approx(2.0)
+        clock[0] += 2
+        assert await manager.take(1, 50) == -40
+
+    def test_rejects_zero_refill(self):
+        """Test a bucket that never refills is a configuration error."""
+        with pytest.raises(ValueError):
+            _manager(MemoryQuotaStore(), rate=0)
+
+    async def test_slot_limits_concurrency(self, clock):
+        """Test the slot context manager caps requests in flight."""
+        manager = _manager(MemoryQuotaStore())
+
+        async with manager.slot(1), manager.slot(1):
+            with pytest.raises(QuotaExceededError) as exc:
+                async with manager.slot(1):
+                    pass
+            assert exc.value.retry_after == 1
+        async with manager.slot(1):
+            pass
+
+    async def test_slot_released_on_error(self, clock):
+        """Test a failing request gives its slot back."""
+        manager = _manager(MemoryQuotaStore())
+
+        for _ in range(3):
+            with pytest.raises(RuntimeError):
+                async with manager.slot(1):
+                    raise RuntimeError
+
+    async def test_sqlite_calls_run_on_db_executor(self, tmp_path, monkeypatch):
+        """Test a blocking store is never called on the event loop thread."""
+        manager = _manager(SQLiteQuotaStore(f"sqlite:///{tmp_path}/quotas.db"))
+        loop_thread = threading.get_ident()
+        threads = []
+        take = manager.store.take
+
+        def recording_take(*args):
+            threads.append(threading.get_ident())
+            return take(*args)
+
+        monkeypatch.setattr(manager.store, "take", recording_take)
+
+        async with manager.slot(1):
+            assert await manager.take(1, 3) == pytest.approx(7, abs=0.1)
+
+        assert threads and loop_thread not in threads
+
+    async def test_heartbeat_keeps_long_request_slot(self):
+        """Test a request outliving lease_seconds still holds its slot."""
+        manager = QuotaManager(
+            MemoryQuotaStore(),
+            10,
+            refill_per_second=1,
+            max_concurrent=1,
+            lease_seconds=0.15,
+        )
+
+        async with manager.slot(1):
+            await asyncio.sleep(0.4)
+            assert manager.store.acquire_slot("api_key:1", 1, 0.15) is None
+        assert manager.store.acquire_slot("api_key:1", 1, 0.15) is not None
+
+    async def test_release_waits_out_saturated_executor(self, tmp_path, monkeypatch):
+        """Test a busy executor delays the release instead of running it inline."""
+        manager = _manager(SQLiteQuotaStore(f"sqlite:///{tmp_path}/quotas.db"))
+        monkeypatch.setattr(quotas, "SATURATED_RETRY_SECONDS", 0)
+        real_call = manager._call
+        attempts = []
+
+        async def flaky_call(fn, *args):
+            if fn == manager.store.release_slot and not attempts:
+                attempts.append(fn)
+                raise ExecutorSaturatedError("db executor is saturated")
+            return await real_call(fn, *args)
+
+        monkeypatch.setattr(manager, "_call", flaky_call)
+
+        async with manager.slot(1):
+            pass
+
+        assert attempts
+        assert manager.store.acquire_slot("api_key:1", 1, 30) is not None
+
+    async def test_consume_waits_for_refill(self, monkeypatch, clock):
+        """Test consume sleeps until the bucket can cover the cost."""
+        manager = _manager(MemoryQuotaStore())
+        await manager.take(1, 10)
+        slept = []
+
+        async def fake_sleep(seconds):
+            slept.append(seconds)
+            clock[0] += seconds
+
+        monkeypatch.setattr("src.core.quotas.asyncio.sleep", fake_sleep)
+
+        assert await manager.consume(1, 4) == pytest.approx(0)
+        assert slept == [pytest.approx(2.0)]
+
+    def test_headers(self):
+        """Test quota headers floor the balance and clamp debt at zero."""
+        manager = _manager(MemoryQuotaStore())
+
+        assert manager.headers(3.7) == {
+            "X-Quota-Limit": "10",
+            "X-Quota-Remaining": "3",
+        }
+        assert manager.headers(-5)["X-Quota-Remaining"] == "0"
+        assert manager.headers(None) == {"X-Quota-Limit": "10"}
+
+
+class TestMeterBytes:
+    """Test byte-metered upload streams."""
+
+    async def test_charges_per_unit_of_bytes(self):
+        """Test units are charged as whole blocks of bytes are read."""
+        charged = []
+
+        async def charge(units):
+            charged.append(units)
+
+        async def chunks():
+            for size in (30, 30, 50, 5):
+                yield b"x" * size
+
+        body = [c async for c in meter_bytes(chunks(), 25, charge)]
+
+        assert sum(map(len, body)) == 115
+        assert charged == [1, 1, 2]
@@ -0,0 +1,133 @@
+"""Unit tests for rate limit storage and keys - tmp SQLite files only."""
+
+import time
+import types
+
+import pytest
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter, SlidingWindowCounterRateLimiter
+from starlette.requests import Request
+
+from src.auth.cache import PrincipalCache
+from src.config import settings
+from src.core import rate_limit_storage, rate_limiter
+from src.core.rate_limit_storage import SQLiteStorage
+from src.core.rate_limiter import rate_limit_key
+from src.core.security import create_access_token
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.time() for the storage module."""
+    now = [1_000_040.0]  # 20 s into a 60 s window
+    monkeypatch.setattr(
+        rate_limit_storage, "time", types.SimpleNamespace(time=lambda: now[0])
+    )
+    return now
+
+
+def _storage(tmp_path) -> SQLiteStorage:
+    return storage_from_string(f"sqlite:///{tmp_path}/limits.db")
+
+
+def _request(headers: dict[str, str] | None = None) -> Request:
+    raw = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "headers": raw, "client": ("10.0.0.1", 1234)})
+
+
+class TestSQLiteStorage:
+    """Test the sliding window counter shared through one file."""
+
+    def test_registered_scheme(self, tmp_path):
+        """Test sqlite:// URIs resolve to the storage."""
+        assert isinstance(_storage(tmp_path), SQLiteStorage)
+
+    def test_limit_shared_between_instances(self, tmp_path, clock):
+        """Test two storages on one file (two workers) share the count."""
+        item = parse("5/minute")
+        workers = [
+            SlidingWindowCounterRateLimiter(_storage(tmp_path)) for _ in range(2)
+        ]
+
+        allowed = [workers[i % 2].hit(item, "client") for i in range(8)]
+
+        assert allowed == [True] * 5 + [False] * 3
+        assert workers[0].get_window_stats(item, "client").remaining == 0
+
+    def test_previous_window_weighted(self, tmp_path, clock):
+        """Test hits of the last window count in proportion to their overlap."""
+        item = parse("10/minute")
+        limiter = SlidingWindowCounterRateLimiter(_storage(tmp_path))
+        for _ in range(10):
+            assert limiter.hit(item, "client")
+
+        clock[0] += 60  # previous window still covers 2/3 of the sliding window
+        allowed = sum(limiter.hit(item, "client") for _ in range(10))
+
+        assert allowed == 3
+        clock[0] += 120  # both windows have passed
+        assert limiter.get_window_stats(item, "client").remaining == 10
+
+    def test_expired_rows_purged(self, tmp_path, clock):
+        """Test idle keys are deleted, so storage stays bounded."""
+        storage = _storage(tmp_path)
+        limiter = SlidingWindowCounterRateLimiter(storage)
+        limiter.hit(parse("5/minute"), "idle")
+
+        clock[0] += 180
+        storage._next_purge = 0
+        limiter.hit(parse("5/minute"), "active")
+
+        keys = storage._conn.execute("SELECT key FROM rate_limits").fetchall()
+        assert len(keys) == 1
+
+    def test_fixed_window_and_reset(self, tmp_path, clock):
+        """Test the fixed window strategy and limiter.reset() support."""
+        storage = _storage(tmp_path)
+        limiter = FixedWindowRateLimiter(storage)
+        item = parse("2/minute")
+
+        assert [limiter.hit(item, "c") for _ in range(3)] == [True, True, False]
+        clock[0] += 61
+        assert limiter.hit(item, "c")
+        assert storage.reset() == 1
+        assert storage.get(item.key_for("c")) == 0
+
+
+class TestRateLimitKey:
+    """Test which identity requests are limited by."""
+
+    def test_bearer_token_keys_by_api_key(self):
+        """Test a valid token is limited by its API key id."""
+        token = create_access_token({"sub": "42"})
+
+        key = rate_limit_key(_request({"Authorization": f"Bearer {token}"}))
+
+        assert key == "key:42"
+
+    def test_cached_token_skips_decoding(self, monkeypatch):
+        """Test a token the principal cache knows is keyed by its key id."""
+        cache = PrincipalCache(max_entries=10, ttl_seconds=60)
+        cache.put({"id": 7}, "opaque-token", time.time() + 60)
+        monkeypatch.setattr(rate_limiter, "get_principal_cache", lambda: cache)
+
+        key = rate_limit_key(_request({"Authorization": "Bearer opaque-token"}))
+
+        assert key == "key:7"
+
+    def test_invalid_token_keys_by_ip(self):
+        """Test a forged token cannot pick its own bucket."""
+        assert rate_limit_key(_request({"Authorization": "Bearer forged"})) == (
+            "10.0.0.1"
+        )
+        assert rate_limit_key(_request()) == "10.0.0.1"
+
+    def test_ip_mode(self, monkeypatch):
+        """Test RATE_LIMIT_KEY=ip ignores the token."""
+        monkeypatch.setattr(settings, "RATE_LIMIT_KEY", "ip")
+        token = create_access_token({"sub": "42"})
+
+        assert rate_limit_key(_request({"Authorization": f"Bearer {token}"})) == (
+            "10.0.0.1"
+        )
@@ -0,0 +1,137 @@
+"""Unit tests for prediction log retention - in-memory SQLite and tmp files."""
+
+import fcntl
+from datetime import UTC, date, datetime
+
+from sqlalchemy import insert, select
+
+from src.logs.repository import PredictionLogRepository
+from src.logs.retention import (
+    LOCK_NAME,
+    archive_expired_logs,
+    archive_path,
+    archived_days,
+    read_archive,
+    retention_cutoff,
+)
+from src.logs.writer import log_row
+from src.models import PredictionBatch, PredictionLog
+
+NOW = datetime(2026, 3, 10, 8, 0, tzinfo=UTC)
+
+
+def _seed(session_factory, timestamps: list[datetime], api_key_id: int = 1) -> None:
+    with session_factory() as session:
+        session.execute(
+            insert(PredictionLog),
+            [
+                {
+                    "api_key_id": api_key_id,
+                    "median_income": float(i),
+                    "predicted_price": float(i),
+                    "created_at": ts,
+                    "updated_at": ts,
+                }
+                for i, ts in enumerate(timestamps)
+            ],
+        )
+        session.commit()
+
+
+def _remaining(session_factory) -> list[datetime]:
+    with session_factory() as session:
+        stmt = select(PredictionLog.created_at).order_by(PredictionLog.id)
+        return list(session.execute(stmt).scalars())
+
+
+class TestArchiveExpiredLogs:
+    """Test archiving whole expired days in chunks."""
+
+    def test_cutoff_is_start_of_day(self):
+        """Test the window keeps whole UTC days."""
+        assert retention_cutoff(2, NOW) == datetime(2026, 3, 8)
+
+    def test_moves_expired_days(self, session_factory, tmp_path):
+        """Test expired rows land in per-day archives and leave the table."""
+        timestamps = [
+            datetime(2026, 3, 6, 23, 0),
+            datetime(2026, 3, 7, 1, 0),
+            datetime(2026, 3, 8, 0, 0),  # first kept instant
+            datetime(2026, 3, 7, 2, 0),
+            datetime(2026, 3, 9, 12, 0),
+        ]
+        _seed(session_factory, timestamps)
+
+        result = archive_expired_logs(
+            session_factory, tmp_path, retention_days=2, chunk_rows=2, now=NOW
+        )
+
+        assert result.archived_rows == 3
+        assert result.days == [date(2026, 3, 6), date(2026, 3, 7)]
+        assert _remaining(session_factory) == [timestamps[2], timestamps[4]]
+        assert archived_days(tmp_path) == result.days
+        archived = read_archive(tmp_path, date(2026, 3, 7), api_key_id=1)
+        assert [row["predicted_price"] for row in archived] == [1.0, 3.0]
+        assert archived[0]["input_features"]["median_income"] == 1.0
+        assert archived[0]["created_at"] == "2026-03-07T01:00:00"
+
+    def test_nothing_expired(self, session_factory, tmp_path):
+        """Test a run with no expired logs writes no archive."""
+        _seed(session_factory, [datetime(2026, 3, 9)])
+
+        result = archive_expired_logs(session_factory, tmp_path, 2, now=NOW)
+
+        assert result.archived_rows == 0 and archived_days(tmp_path) == []
+
+    def test_batches_archived_with_header_fields(self, session_factory, tmp_path):
+        """Test batch fields are archived and emptied headers are removed."""
+        expired, kept = datetime(2026, 3, 1), datetime(2026, 3, 9)
+        rows = [
+            {**log_row(1, {}, 1.0, 5, "batch", "old", "v1"), "created_at": expired},
+            {**log_row(1, {}, 2.0, 5, "batch", "new", "v1"), "created_at": kept},
+        ]
+        with session_factory() as session:
+            PredictionLogRepository(session).bulk_create(rows)
+
+        archive_expired_logs(session_factory, tmp_path, 2, now=NOW)
+
+        (archived,) = read_archive(tmp_path, date(2026, 3, 1), api_key_id=1)
+        assert archived["batch_id"] == "old"
+        assert (archived["request_type"], archived["response_time_ms"]) == ("batch", 5)
+        with session_factory() as session:
+            headers = session.execute(select(PredictionBatch.batch_id)).scalars()
+            assert list(headers) == ["new"]
+
+    def test_skips_while_another_pass_holds_lock(self, session_factory, tmp_path):
+        """Test a concurrent pass (another worker) archives nothing."""
+        _seed(session_factory, [datetime(2026, 3, 1)])
+
+        with open(tmp_path / LOCK_NAME, "a") as other:
+            fcntl.flock(other, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            skipped = archive_expired_logs(session_factory, tmp_path, 2, now=NOW)
+            fcntl.flock(other, fcntl.LOCK_UN)
+        result = archive_expired_logs(session_factory, tmp_path, 2, now=NOW)
+
+        assert skipped.skipped and skipped.archived_rows == 0
+        assert not result.skipped and result.archived_rows == 1
+        assert archived_days(tmp_path) == [date(2026, 3, 1)]
+
+
+class TestReadArchive:
+    """Test reading archived days."""
+
+    def test_filters_pages_and_deduplicates(self, session_factory, tmp_path):
+        """Test rows are per key, paged, and re-archived rows appear once."""
+        _seed(session_factory, [datetime(2026, 3, 1)] * 3, api_key_id=1)
+        _seed(session_factory, [datetime(2026, 3, 1)], api_key_id=2)
+        archive_expired_logs(session_factory, tmp_path, 2, now=NOW)
+        # Simulate a run interrupted after archiving, before its delete
+        path = archive_path(tmp_path, date(2026, 3, 1))
+        path.write_bytes(path.read_bytes() * 2)
+
+        rows = read_archive(tmp_path, date(2026, 3, 1), api_key_id=1)
+        page = read_archive(tmp_path, date(2026, 3, 1), 1, skip=1, limit=1)
+
+        assert [row["predicted_price"] for row in rows] == [0.0, 1.0, 2.0]
+        assert [row["predicted_price"] for row in page] == [1.0]
+        assert read_archive(tmp_path, date(2026, 3, 2), api_key_id=1) is None
@@ -0,0 +1,94 @@
+"""Unit tests for the offline batch scoring CLI - no external dependencies."""
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from src.constants import NUMERIC_FEATURES, OCEAN_PROXIMITY_VALUES
+from src.ml.preprocessing import N_FEATURES, encode_frame, valid_rows
+from src.ml.scoring import PREDICTION_COLUMN, _part_path, _prepare_parts, score_file
+
+
+@pytest.fixture(scope="module")
+def model_path(tmp_path_factory) -> str:
+    """Small forest over the 13 model columns, saved like model.joblib."""
+    rng = np.random.default_rng(0)
+    X = rng.uniform(0, 10, size=(300, N_FEATURES))
+    y = X[:, 7] * 1000 + rng.normal(size=300)
+    model = RandomForestRegressor(n_estimators=5, max_depth=6, random_state=0)
+    path = tmp_path_factory.mktemp("model") / "model.joblib"
+    joblib.dump(model.fit(X, y), path)
+    return str(path)
+
+
+@pytest.fixture
+def housing_csv(tmp_path) -> tuple[str, pd.DataFrame]:
+    """Raw housing.csv-shaped file with one row missing a feature."""
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame(rng.uniform(1, 10, size=(25, 8)), columns=NUMERIC_FEATURES)
+    df["ocean_proximity"] = [OCEAN_PROXIMITY_VALUES[i % 5] for i in range(25)]
+    df.loc[3, "total_bedrooms"] = np.nan
+    path = tmp_path / "houses.csv"
+    df.to_csv(path, index=False)
+    return path, df
+
+
+class TestEncodeFrame:
+    """Test DataFrame encoding used by batch scoring."""
+
+    def test_invalid_rows_masked(self, housing_csv):
+        """Test missing values and unknown categories are flagged invalid."""
+        _, df = housing_csv
+        df.loc[5, "ocean_proximity"] = "MOON"
+
+        valid = valid_rows(encode_frame(df))
+
+        assert not valid[3] and not valid[5]
+        assert valid.sum() == 23
+
+
+class TestScoreFile:
+    """Test chunked parallel scoring end to end."""
+
+    def test_predictions_in_input_order(self, housing_csv, model_path, tmp_path):
+        """Test output rows follow input order across chunks."""
+        input_path, df = housing_csv
+        output_path = tmp_path / "scored.csv"
+
+        stats = score_file(
+            input_path, output_path, chunk_rows=7, workers=2, model_path=model_path
+        )
+
+        scored = pd.read_csv(output_path)
+        X = encode_frame(df)
+        mask = valid_rows(X)
+        expected = joblib.load(model_path).predict(X[mask]).round(8)
+        assert stats["rows"] == 25 and stats["chunks"] == 4
+        assert list(scored.columns) == [*df.columns, PREDICTION_COLUMN]
+        assert np.isnan(scored[PREDICTION_COLUMN][3])
+        np.testing.assert_allclose(scored[PREDICTION_COLUMN][mask], expected)
+        assert not (tmp_path / "scored.csv.parts").exists()
+
+    def test_resume_skips_completed_chunks(self, housing_csv, model_path, tmp_path):
+        """Test chunks already written by an earlier run are reused."""
+        input_path, df = housing_csv
+        output_path = tmp_path / "scored.csv"
+        parts_dir = _prepare_parts(input_path, output_path, 10, resume=False)
+        sentinel = df.head(10).assign(**{PREDICTION_COLUMN: -1.0})
+        sentinel.to_csv(_part_path(parts_dir, 0, "csv"), index=False, header=False)
+
+        stats = score_file(
+            input_path,
+            output_path,
+            chunk_rows=10,
+            workers=1,
+            resume=True,
+            model_path=model_path,
+        )
+
+        scored = pd.read_csv(output_path)
+        assert stats["resumed_chunks"] == 1 and stats["rows"] == 15
+        assert (scored[PREDICTION_COLUMN][:10] == -1.0).all()
+        assert (scored[PREDICTION_COLUMN][10:].dropna() > 0).all()
@@ -6,6 +6,7 @@ from jose import jwt
 
 from src.config import settings
 from src.core.security import (
+    api_key_digest,
     create_access_token,
     decode_access_token,
     generate_api_key,
@@ -131,3 +132,23 @@ class TestAPIKeyGeneration:
         """Test generated API key is lowercase hex."""
         key = generate_api_key()
         assert key == key.lower()
+
+
+class TestAPIKeyDigest:
+    """Test the HMAC digest API keys are looked up by."""
+
+    def test_digest_is_deterministic_hex(self):
+        """Test the same key always maps to the same 64-character digest."""
+        key = generate_api_key()
+        assert api_key_digest(key) == api_key_digest(key)
+        assert len(api_key_digest(key)) == 64
+        assert api_key_digest(key) != api_key_digest(generate_api_key())
+
+    def test_digest_is_keyed(self, monkeypatch):
+        """Test changing the HMAC secret changes the digest."""
+        key = generate_api_key()
+        default = api_key_digest(key)
+
+        monkeypatch.setattr(settings, "API_KEY_HMAC_SECRET", "another-secret")
+
+        assert api_key_digest(key) != default
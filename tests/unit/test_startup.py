@@ -0,0 +1,48 @@
+"""Unit tests for the startup timing report - no external dependencies."""
+
+import time
+
+from src.core.startup import StartupReport
+
+
+class TestStartupReport:
+    """Test startup phase timing and readiness state."""
+
+    def test_imports_recorded_once(self):
+        """Test only the first startup in a process reports import time."""
+        report = StartupReport(import_started=time.perf_counter() - 0.5)
+
+        report.begin()
+        first = report.phases["imports"]
+        report.begin()
+
+        assert first >= 500
+        assert "imports" not in report.phases
+
+    def test_phase_records_duration(self):
+        """Test a timed block is recorded even when it raises."""
+        report = StartupReport()
+        report.begin()
+
+        try:
+            with report.phase("warmup"):
+                time.sleep(0.01)
+                raise RuntimeError("boom")
+        except RuntimeError:
+            pass
+
+        assert report.phases["warmup"] >= 10
+        assert report.total_ms == report.phases["warmup"]
+
+    def test_begin_resets_readiness(self):
+        """Test a restart is not ready until its own warm-up finishes."""
+        report = StartupReport()
+        report.ready = True
+        report.warmup_error = "database is locked"
+
+        report.begin()
+
+        snapshot = report.snapshot()
+        assert snapshot["ready"] is False
+        assert snapshot["warmup_error"] is None
+        assert snapshot["phases_ms"] == {}
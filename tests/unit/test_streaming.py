@@ -0,0 +1,183 @@
+"""Unit tests for streamed NDJSON/CSV scoring - no external dependencies."""
+
+import json
+
+import numpy as np
+import pytest
+
+from src.core.exceptions import StreamFormatError
+from src.predictions.streaming import (
+    CsvRowParser,
+    StreamFormat,
+    detect_format,
+    iter_lines,
+    iter_spool,
+    parse_ndjson_row,
+    spool_results,
+    stream_predictions,
+)
+
+HOUSE = {
+    "longitude": -122.64,
+    "latitude": 38.01,
+    "housing_median_age": 36.0,
+    "total_rooms": 1336.0,
+    "total_bedrooms": 258.0,
+    "population": 678.0,
+    "households": 249.0,
+    "median_income": 5.5789,
+    "ocean_proximity": "NEAR OCEAN",
+}
+
+
+async def chunks_of(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+async def collect(agen) -> list:
+    return [item async for item in agen]
+
+
+async def income_scorer(X: np.ndarray) -> np.ndarray:
+    return X[:, 7] * 1000
+
+
+class TestIterLines:
+    """Test incremental line splitting."""
+
+    async def test_lines_split_across_chunks(self):
+        """Test lines are reassembled regardless of chunk boundaries."""
+        data = b"alpha\nbeta\r\n\n  \ngamma"
+
+        assert await collect(iter_lines(chunks_of(data, 3), 100)) == [
+            b"alpha",
+            b"beta",
+            b"gamma",
+        ]
+
+    async def test_oversized_line_reported_once(self):
+        """Test an over-long line becomes a single None and parsing resumes."""
+        data = b"ok\n" + b"x" * 50 + b"\nnext\n"
+
+        assert await collect(iter_lines(chunks_of(data, 7), 10)) == [
+            b"ok",
+            None,
+            b"next",
+        ]
+
+
+class TestParsers:
+    """Test format detection and row parsing."""
+
+    def test_detect_format(self):
+        """Test content types map to formats."""
+        assert detect_format("application/x-ndjson") is StreamFormat.NDJSON
+        assert detect_format("text/csv; charset=utf-8") is StreamFormat.CSV
+        assert detect_format("text/plain") is None
+
+    def test_csv_header_missing_column(self):
+        """Test a header without every feature is rejected."""
+        with pytest.raises(StreamFormatError, match="median_income"):
+            CsvRowParser(b"longitude,latitude")
+
+    def test_csv_row_uses_header_order(self):
+        """Test CSV columns may appear in any order."""
+        columns = list(reversed(HOUSE))
+        parser = CsvRowParser(",".join(columns).encode())
+        row = ",".join(str(HOUSE[c]) for c in columns).encode()
+
+        assert parser(row).model_dump(mode="json") == HOUSE
+
+    def test_ndjson_row(self):
+        """Test an NDJSON line parses to features."""
+        assert parse_ndjson_row(json.dumps(HOUSE).encode()).median_income == 5.5789
+
+
+class TestStreamPredictions:
+    """Test chunked scoring and inline errors."""
+
+    async def test_results_in_order_with_inline_errors(self):
+        """Test invalid rows are reported inline without aborting the stream."""
+        bad = dict(HOUSE, median_income=-1)
+        rows = [HOUSE, bad, HOUSE, "not json", HOUSE]
+        lines = [
+            r.encode() if isinstance(r, str) else json.dumps(r).encode() for r in rows
+        ]
+
+        async def line_source():
+            for line in lines:
+                yield line
+
+        output = b"".join(
+            await collect(
+                stream_predictions(line_source(), parse_ndjson_row, income_scorer, 2)
+            )
+        )
+        records = [json.loads(line) for line in output.splitlines()]
+
+        assert [r.get("row") for r in records[:-1]] == [0, 1, 2, 3, 4]
+        assert records[0]["predicted_price"] == pytest.approx(5578.9)
+        assert "median_income" in records[1]["error"]
+        assert "error" in records[3]
+        assert records[-1]["summary"] == {
+            "rows": 5,
+            "predicted": 3,
+            "errors": 2,
+            "model_version": None,
+        }
+
+    async def test_chunks_bounded(self):
+        """Test the scorer never sees more than chunk_rows rows."""
+        sizes = []
+
+        async def recording_scorer(X: np.ndarray) -> np.ndarray:
+            sizes.append(len(X))
+            return np.zeros(len(X))
+
+        async def line_source():
+            for _ in range(25):
+                yield json.dumps(HOUSE).encode()
+
+        await collect(
+            stream_predictions(line_source(), parse_ndjson_row, recording_scorer, 10)
+        )
+
+        assert sizes == [10, 10, 5]
+
+    async def test_scoring_failure_marks_chunk_rows(self):
+        """Test a failed model call reports errors and the stream continues."""
+
+        async def failing_scorer(X: np.ndarray) -> np.ndarray:
+            raise RuntimeError("boom")
+
+        async def line_source():
+            yield json.dumps(HOUSE).encode()
+
+        output = b"".join(
+            await collect(
+                stream_predictions(line_source(), parse_ndjson_row, failing_scorer, 10)
+            )
+        )
+        records = [json.loads(line) for line in output.splitlines()]
+
+        assert "boom" in records[0]["error"]
+        assert records[-1]["summary"]["errors"] == 1
+
+
+class TestSpool:
+    """Test result spooling."""
+
+    async def test_spool_round_trip_past_memory_limit(self):
+        """Test spooled results read back intact after rolling over to disk."""
+
+        async def results():
+            for i in range(100):
+                yield f"{i}\n".encode()
+
+        spool = await spool_results(results(), max_memory_bytes=16)
+
+        assert b"".join(iter_spool(spool)) == b"".join(
+            f"{i}\n".encode() for i in range(100)
+        )
+        assert spool.closed